@@ -0,0 +1,523 @@
+"""
+NER-Aegis AI - Headless API Server
+
+This service exposes the logic package over HTTP/JSON, without Streamlit:
+- POST /v1/risk/score              batch risk scoring (category, alert level, contributions)
+- POST /v1/households/priorities   household priorities, evacuation phases, top-k
+- POST /v1/evacuation/stats        evacuation statistics for a household list
+- POST /v1/alerts/render           alert messages and SMS encoding per village
+- GET  /health
+
+Concurrent risk-score requests are coalesced into one vectorized call
+(micro-batching), identical requests are answered from an LRU response
+cache, and connections are kept alive between requests.
+
+Run: python api_server.py --host 0.0.0.0 --port 8080
+
+Engineering Principle: Same intelligence, any interface
+"""
+
+from typing import Dict, List, Any, Optional, Tuple, Callable, Awaitable
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit, parse_qs
+import argparse
+import asyncio
+import hashlib
+import json
+
+import numpy as np
+
+import logic
+from logic.risk_engine import RISK_FACTORS, RISK_CATEGORIES, compute_risk_scores
+from logic.alert_engine import ALERT_LEVELS, determine_alert_level_codes, render_alert_messages, format_sms_alert
+from logic.evacuation_planner import (
+    EVACUATION_PHASES,
+    HouseholdArrays,
+    calculate_household_priorities,
+    encode_drainage_quality,
+    encode_road_access,
+    assign_evacuation_phases,
+    top_priority_indices,
+    calculate_evacuation_statistics
+)
+from logic.sms_encoding import analyze_sms
+
+
+MAX_BODY_BYTES = 8 * 1024 * 1024
+KEEPALIVE_TIMEOUT_S = 15.0
+RESPONSE_CACHE_SIZE = 1024
+BATCH_MAX_ROWS = 8192
+BATCH_MAX_DELAY_S = 0.002  # how long a score request may wait for others to join its batch
+
+_REASONS = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    408: "Request Timeout", 413: "Payload Too Large", 500: "Internal Server Error",
+    501: "Not Implemented"
+}
+
+
+class HttpError(Exception):
+    """Request failure reported to the client as a JSON error body"""
+    
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass
+class HttpRequest:
+    method: str
+    path: str
+    query: Dict[str, List[str]]
+    version: str
+    headers: Dict[str, str] = field(default_factory=dict)
+    body: bytes = b""
+    
+    @property
+    def keep_alive(self) -> bool:
+        connection = self.headers.get("connection", "").lower()
+        if self.version == "HTTP/1.0":
+            return connection == "keep-alive"
+        return connection != "close"
+    
+    def json(self) -> Dict[str, Any]:
+        try:
+            payload = json.loads(self.body or b"{}")
+        except ValueError as e:
+            raise HttpError(400, f"Invalid JSON body: {e}")
+        if not isinstance(payload, dict):
+            raise HttpError(400, "JSON body must be an object")
+        return payload
+
+
+async def read_request(reader: asyncio.StreamReader) -> Optional[HttpRequest]:
+    """
+    Read one HTTP/1.x request from a stream.
+    
+    Returns:
+        HttpRequest, or None when the client closed the connection
+    
+    Raises:
+        HttpError: On malformed or oversized requests
+    """
+    try:
+        line = await reader.readline()
+        if not line:
+            return None
+        try:
+            method, target, version = line.decode("latin-1").rstrip("\r\n").split(" ")
+        except ValueError:
+            raise HttpError(400, "Malformed request line")
+        
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+    except (asyncio.LimitOverrunError, ValueError):
+        raise HttpError(400, "Request line or header too long")
+    
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        raise HttpError(501, "Chunked request bodies are not supported; send Content-Length")
+    try:
+        length = int(headers.get("content-length", "0"))
+    except ValueError:
+        raise HttpError(400, "Invalid Content-Length")
+    if length < 0:
+        raise HttpError(400, "Invalid Content-Length")
+    if length > MAX_BODY_BYTES:
+        raise HttpError(413, f"Request body exceeds {MAX_BODY_BYTES} bytes")
+    body = await reader.readexactly(length) if length else b""
+    
+    url = urlsplit(target)
+    return HttpRequest(
+        method=method.upper(),
+        path=url.path,
+        query=parse_qs(url.query),
+        version=version,
+        headers=headers,
+        body=body
+    )
+
+
+def _encode_response(status: int, body: bytes, keep_alive: bool, extra_headers: Optional[Dict[str, str]] = None) -> bytes:
+    headers = {
+        "Content-Type": "application/json",
+        "Content-Length": str(len(body)),
+        "Connection": "keep-alive" if keep_alive else "close",
+        **(extra_headers or {})
+    }
+    head = f"HTTP/1.1 {status} {_REASONS.get(status, 'Unknown')}\r\n"
+    head += "".join(f"{name}: {value}\r\n" for name, value in headers.items())
+    return head.encode("latin-1") + b"\r\n" + body
+
+
+def _dumps(payload: Any) -> bytes:
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+class ResponseCache:
+    """LRU cache of encoded response bodies keyed by route and request body"""
+    
+    def __init__(self, max_entries: int = RESPONSE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, bytes], bytes]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def key(path: str, body: bytes) -> Tuple[str, bytes]:
+        return path, hashlib.blake2b(body, digest_size=16).digest()
+    
+    def get(self, key: Tuple[str, bytes]) -> Optional[bytes]:
+        body = self._entries.get(key)
+        if body is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return body
+    
+    def put(self, key: Tuple[str, bytes], body: bytes) -> None:
+        self._entries[key] = body
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent requests into one vectorized call.
+    
+    Each submit() adds rows to the pending batch; the batch runs when it
+    reaches max_rows or max_delay_s after its first row arrived, and every
+    caller gets back its own slice of the results.
+    """
+    
+    def __init__(
+        self,
+        fn: Callable[[np.ndarray], Dict[str, np.ndarray]],
+        max_rows: int = BATCH_MAX_ROWS,
+        max_delay_s: float = BATCH_MAX_DELAY_S
+    ):
+        """
+        Args:
+            fn: Vectorized function of an (n, k) array returning per-row arrays
+            max_rows: Run the batch once this many rows are pending
+            max_delay_s: Longest a request waits for others to join
+        """
+        self.fn = fn
+        self.max_rows = max_rows
+        self.max_delay_s = max_delay_s
+        self.batches = 0
+        self._pending: List[Tuple[np.ndarray, asyncio.Future]] = []
+        self._rows = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+    
+    async def submit(self, rows: np.ndarray) -> Dict[str, np.ndarray]:
+        """Queue rows and wait for their results"""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((rows, future))
+        self._rows += len(rows)
+        if self._rows >= self.max_rows:
+            self._run()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.max_delay_s, self._run)
+        return await future
+    
+    def _run(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending, self._rows = self._pending, [], 0
+        if not pending:
+            return
+        self.batches += 1
+        try:
+            results = self.fn(np.concatenate([rows for rows, _ in pending]))
+        except Exception as e:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        start = 0
+        for rows, future in pending:
+            end = start + len(rows)
+            if not future.done():
+                future.set_result({name: values[start:end] for name, values in results.items()})
+            start = end
+
+
+def _score_rows(factors: np.ndarray) -> Dict[str, np.ndarray]:
+    """Vectorized scoring used by the risk-score batcher"""
+    batch = compute_risk_scores(factors)
+    return {
+        "risk_score": batch.scores,
+        "category_code": batch.category_codes,
+        "alert_code": determine_alert_level_codes(batch.scores),
+        **{f"contribution:{name}": values for name, values in batch.contributions.items()}
+    }
+
+
+def _factor_rows(payload: Dict[str, Any]) -> Tuple[np.ndarray, List[Any]]:
+    """(n, 5) factor array and optional names from {"villages": [{...}]} or {"factors": [[...]]}"""
+    try:
+        if "factors" in payload:
+            rows = np.asarray(payload["factors"], dtype=np.float64)
+            names = list(payload.get("names", [None] * len(rows)))
+        elif "villages" in payload:
+            villages = payload["villages"]
+            if not isinstance(villages, list) or not all(isinstance(village, dict) for village in villages):
+                raise HttpError(400, "Expected 'villages' (list of objects)")
+            missing = sorted({name for village in villages for name in RISK_FACTORS if name not in village})
+            if missing:
+                raise HttpError(400, f"Missing risk factors: {', '.join(missing)}")
+            rows = np.array([[village[name] for name in RISK_FACTORS] for village in villages], dtype=np.float64)
+            names = [village.get("name") for village in villages]
+        else:
+            raise HttpError(400, "Expected 'villages' (list of objects) or 'factors' (list of 5-value rows)")
+    except (TypeError, ValueError) as e:
+        raise HttpError(400, f"Invalid risk factors: {e}")
+    if rows.ndim != 2 or rows.shape[1] != len(RISK_FACTORS) or not np.isfinite(rows).all():
+        raise HttpError(400, f"Each factor row needs {len(RISK_FACTORS)} finite numbers: {', '.join(RISK_FACTORS)}")
+    if len(names) != len(rows):
+        raise HttpError(400, f"'names' has {len(names)} entries for {len(rows)} factor rows")
+    return rows, names
+
+
+def _household_arrays(payload: Dict[str, Any]) -> HouseholdArrays:
+    """HouseholdArrays (priorities computed) from {"village_risk_score": x, "households": [{...}]}"""
+    households = payload.get("households")
+    if not isinstance(households, list):
+        raise HttpError(400, "Expected 'households' (list of objects)")
+    try:
+        risk = float(payload["village_risk_score"])
+        distance = np.array([hh["distance_to_slope"] for hh in households], dtype=np.float64)
+        drainage = encode_drainage_quality([hh.get("drainage_quality", "") for hh in households])
+        access = encode_road_access([hh.get("road_access", "") for hh in households])
+        occupants = np.array([hh.get("occupants", 1) for hh in households], dtype=np.int64)
+    except (KeyError, TypeError, ValueError) as e:
+        raise HttpError(400, f"Invalid household data: {e}")
+    
+    n = len(households)
+    return HouseholdArrays(
+        id=np.array([str(hh.get("id", i)) for i, hh in enumerate(households)], dtype=str),
+        latitude=np.zeros(n),
+        longitude=np.zeros(n),
+        distance_to_slope=distance,
+        drainage_code=drainage,
+        access_code=access,
+        occupants=occupants,
+        priority_score=calculate_household_priorities(distance, drainage, access, risk)
+    )
+
+
+Handler = Callable[[HttpRequest], Awaitable[Any]]
+
+
+class ApiServer:
+    """
+    asyncio HTTP/1.1 JSON server for the logic package.
+    
+    Usage:
+        async with ApiServer("0.0.0.0", 8080) as server:
+            ...
+    """
+    
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        cache_size: int = RESPONSE_CACHE_SIZE,
+        batch_max_rows: int = BATCH_MAX_ROWS,
+        batch_max_delay_s: float = BATCH_MAX_DELAY_S,
+        keepalive_timeout_s: float = KEEPALIVE_TIMEOUT_S
+    ):
+        """
+        Args:
+            host, port: Listen address (port 0 picks a free port)
+            cache_size: Responses kept in the LRU cache
+            batch_max_rows, batch_max_delay_s: Risk-score micro-batching limits
+            keepalive_timeout_s: Idle time before a kept-alive connection is closed
+        """
+        self.host = host
+        self.port = port
+        self.cache = ResponseCache(cache_size)
+        self.score_batcher = MicroBatcher(_score_rows, batch_max_rows, batch_max_delay_s)
+        self.keepalive_timeout_s = keepalive_timeout_s
+        self.requests = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        # (method, path) -> (handler, cacheable)
+        self.routes: Dict[Tuple[str, str], Tuple[Handler, bool]] = {
+            ("GET", "/health"): (self.health, False),
+            ("POST", "/v1/risk/score"): (self.risk_score, True),
+            ("POST", "/v1/households/priorities"): (self.household_priorities, True),
+            ("POST", "/v1/evacuation/stats"): (self.evacuation_stats, True),
+            ("POST", "/v1/alerts/render"): (self.render_alerts, True)
+        }
+    
+    async def start(self) -> Tuple[str, int]:
+        """Start listening; returns the bound (host, port)"""
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.host, self.port = self._server.sockets[0].getsockname()[:2]
+        return self.host, self.port
+    
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+    
+    async def __aenter__(self) -> "ApiServer":
+        await self.start()
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
+    
+    async def serve_forever(self) -> None:
+        await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+    
+    def stats(self) -> Dict[str, int]:
+        return {
+            "requests": self.requests,
+            "cache_hits": self.cache.hits,
+            "cache_misses": self.cache.misses,
+            "score_batches": self.score_batcher.batches
+        }
+    
+    # Endpoints
+    
+    async def health(self, request: HttpRequest) -> Dict[str, Any]:
+        return {"status": "ok", "version": logic.__version__, **self.stats()}
+    
+    async def risk_score(self, request: HttpRequest) -> Dict[str, Any]:
+        rows, names = _factor_rows(request.json())
+        results = await self.score_batcher.submit(rows)
+        contributions = {name.split(":", 1)[1]: values for name, values in results.items() if name.startswith("contribution:")}
+        return {"results": [
+            {
+                "name": names[i],
+                "risk_score": float(results["risk_score"][i]),
+                "category": RISK_CATEGORIES[results["category_code"][i]],
+                "alert_level": ALERT_LEVELS[results["alert_code"][i]],
+                "contributions": {name: float(values[i]) for name, values in contributions.items()}
+            }
+            for i in range(len(rows))
+        ]}
+    
+    async def household_priorities(self, request: HttpRequest) -> Dict[str, Any]:
+        payload = request.json()
+        households = _household_arrays(payload)
+        phases = assign_evacuation_phases(households.priority_score)
+        top_k = payload.get("top_k", 10)
+        if not isinstance(top_k, int) or isinstance(top_k, bool) or top_k < 0:
+            raise HttpError(400, "'top_k' must be a non-negative integer")
+        top = top_priority_indices(households.priority_score, top_k)
+        return {
+            "priorities": households.priority_score.tolist(),
+            "phases": [EVACUATION_PHASES[code] for code in phases],
+            "top": [
+                {"id": str(households.id[i]), "priority_score": float(households.priority_score[i])}
+                for i in top
+            ]
+        }
+    
+    async def evacuation_stats(self, request: HttpRequest) -> Dict[str, Any]:
+        return calculate_evacuation_statistics(_household_arrays(request.json()))
+    
+    async def render_alerts(self, request: HttpRequest) -> Dict[str, Any]:
+        payload = request.json()
+        try:
+            villages = [str(name) for name in payload["villages"]]
+            scores = [float(score) for score in payload["risk_scores"]]
+        except (KeyError, TypeError, ValueError):
+            raise HttpError(400, "Expected 'villages' and 'risk_scores' lists")
+        if len(villages) != len(scores):
+            raise HttpError(400, "'villages' and 'risk_scores' must have the same length")
+        language = payload.get("language", "English")
+        
+        messages = render_alert_messages(villages, scores, language=language)
+        levels = determine_alert_level_codes(scores)
+        alerts = []
+        for village, score, level, message in zip(villages, scores, levels, messages):
+            sms = format_sms_alert(village, score, language)
+            info = analyze_sms(sms)
+            alerts.append({
+                "village": village,
+                "alert_level": ALERT_LEVELS[level],
+                "message": message,
+                "sms": {"text": sms, "encoding": info.encoding, "segments": info.segments}
+            })
+        return {"language": language, "alerts": alerts}
+    
+    # Connection handling
+    
+    async def _dispatch(self, request: HttpRequest) -> Tuple[int, bytes, Dict[str, str]]:
+        route = self.routes.get((request.method, request.path))
+        if route is None:
+            allowed = [method for method, path in self.routes if path == request.path]
+            if allowed:
+                return 405, _dumps({"error": f"Use {', '.join(allowed)}"}), {"Allow": ", ".join(allowed)}
+            return 404, _dumps({"error": f"No route for {request.path}"}), {}
+        
+        handler, cacheable = route
+        key = ResponseCache.key(request.path, request.body) if cacheable else None
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return 200, cached, {"X-Cache": "hit"}
+        
+        body = _dumps(await handler(request))
+        if key is not None:
+            self.cache.put(key, body)
+        return 200, body, {"X-Cache": "miss"} if cacheable else {}
+    
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                keep_alive = False
+                try:
+                    request = await asyncio.wait_for(read_request(reader), self.keepalive_timeout_s)
+                    if request is None:
+                        break
+                    self.requests += 1
+                    keep_alive = request.keep_alive
+                    status, body, headers = await self._dispatch(request)
+                except HttpError as e:
+                    status, body, headers = e.status, _dumps({"error": str(e)}), {}
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except Exception as e:
+                    status, body, headers = 500, _dumps({"error": f"{type(e).__name__}: {e}"}), {}
+                
+                writer.write(_encode_response(status, body, keep_alive, headers))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="NER-Aegis AI headless JSON API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args()
+    
+    print(f"NER-Aegis API listening on http://{args.host}:{args.port}")
+    try:
+        asyncio.run(ApiServer(args.host, args.port).serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
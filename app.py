@@ -5,11 +5,24 @@ import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import json
+import os
 from dataclasses import dataclass
 from typing import List, Dict, Tuple
 import folium
-from streamlit_folium import folium_static
-import random
+import streamlit.components.v1 as components
+import time
+
+from logic.village_table import VillageTable
+from logic.evacuation_planner import Household, summarize_evacuation_phases, select_priority_households
+from logic.household_generator import generate_household_arrays
+from logic.alert_engine import AlertLevel, create_alert_escalation_matrix, generate_alert_metadata
+from logic.alert_scheduler import AlertScheduler
+from logic.alert_history import AlertHistoryStore, AlertRecord
+from logic.risk_engine import RISK_FACTORS
+from logic.timeseries_store import RiskTimeSeriesStore, backfill_history
+from logic.uncertainty import RiskUncertainty, simulate_risk_uncertainty
+from logic.scenarios import ScenarioEngine, Scenario, scenario_grid
+from logic.map_layers import MapLayerCache, VILLAGE_LAYER_JS
 
 # Page configuration
 st.set_page_config(
@@ -393,16 +406,6 @@ class Village:
     soil_moisture: float
     deforestation: float
     road_cuts: float
-    
-@dataclass
-class Household:
-    id: str
-    location: Tuple[float, float]
-    distance_to_slope: float
-    drainage_quality: str
-    road_access: str
-    occupants: int
-    priority_score: float
 
 @dataclass
 class Alert:
@@ -419,33 +422,40 @@ if 'selected_village' not in st.session_state:
 if 'alerts_history' not in st.session_state:
     st.session_state.alerts_history = []
 
-# Simulated data generation functions
-def compute_risk_score(rainfall: float, slope: float, soil_moisture: float, 
-                       deforestation: float, road_cuts: float) -> float:
-    """
-    Compute risk score from multiple factors using weighted algorithm.
-    This is a functional intelligence system, not just simulation.
-    
-    Weights based on landslide research:
-    - Rainfall: 35% (most critical trigger)
-    - Slope: 30% (geological predisposition)
-    - Soil moisture: 20% (saturation indicator)
-    - Deforestation: 10% (stability loss)
-    - Road cuts: 5% (additional destabilization)
-    """
-    # Normalize each factor to 0-100 scale and apply weights
-    rainfall_score = min((rainfall / 400) * 100, 100) * 0.35
-    slope_score = min((slope / 50) * 100, 100) * 0.30
-    moisture_score = min((soil_moisture / 100) * 100, 100) * 0.20
-    deforest_score = min((deforestation / 30) * 100, 100) * 0.10
-    roadcut_score = min((road_cuts / 30) * 100, 100) * 0.05
-    
-    # Composite risk score
-    total_score = rainfall_score + slope_score + moisture_score + deforest_score + roadcut_score
-    
-    return min(total_score, 100)
+# Cache configuration
+# Bump DATA_VERSION whenever the underlying village data changes: it is part of
+# every cache key, so all cached villages, households and trends are invalidated.
+DATA_VERSION = "2026.01-ne-villages"
+CACHE_TTL_SECONDS = 15 * 60  # matches the fastest (Evacuate) re-alert cadence
+CACHE_MAX_ENTRIES = 512
+HOUSEHOLD_SEED = 2026  # synthetic household generator seed (same households every session)
+ALERT_HISTORY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "alert_history.db")
+TIMESERIES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "timeseries")
+READING_INTERVAL_S = 3600  # one factor reading per village per hour
+UNCERTAINTY_DRAWS = 1000  # Monte Carlo draws per village for confidence bands
+
+# What-if forecast grids: factor -> (label, min, max, default range, step)
+SCENARIO_FACTORS = {
+    "rainfall": ("24h Rainfall (mm)", 0, 500, (150, 400), 25),
+    "soil_moisture": ("Soil Moisture (%)", 0, 100, (40, 100), 5)
+}
 
-def generate_ne_villages() -> List[Village]:
+# District of each monitored village (alert history is queried per district)
+VILLAGE_DISTRICTS = {
+    "Mawlynnong": "East Khasi Hills",
+    "Cherrapunji": "East Khasi Hills",
+    "Nongriat": "East Khasi Hills",
+    "Mawsynram": "East Khasi Hills",
+    "Dawki": "West Jaintia Hills",
+    "Shillong Peak": "East Khasi Hills",
+    "Laitkynsew": "East Khasi Hills",
+    "Mawphlang": "East Khasi Hills",
+    "Nongstoin": "West Khasi Hills",
+    "Mairang": "Eastern West Khasi Hills",
+}
+
+# Simulated data generation functions
+def generate_ne_villages() -> VillageTable:
     """Generate realistic Northeast India village data with computed risk scores"""
     # Format: name, lat, lon, population, households, rainfall, slope, moisture, deforestation, road_cuts
     villages_data = [
@@ -461,31 +471,12 @@ def generate_ne_villages() -> List[Village]:
         ("Mairang", 25.5667, 91.6333, 850, 105, 250, 37, 60, 17, 14),
     ]
     
-    villages = []
-    for data in villages_data:
-        # Compute risk score dynamically from factors
-        risk_score = compute_risk_score(
-            rainfall=data[5],
-            slope=data[6],
-            soil_moisture=data[7],
-            deforestation=data[8],
-            road_cuts=data[9]
-        )
-        
-        villages.append(Village(
-            name=data[0],
-            latitude=data[1],
-            longitude=data[2],
-            population=data[3],
-            households=data[4],
-            risk_score=risk_score,
-            rainfall=data[5],
-            slope=data[6],
-            soil_moisture=data[7],
-            deforestation=data[8],
-            road_cuts=data[9]
-        ))
-    return villages
+    # Risk scores, categories, alert levels and ranking computed in one vectorized pass
+    return VillageTable.from_records(villages_data)
+
+def get_village(villages: VillageTable, name: str) -> Village:
+    """Materialize a single village from the columnar store for detailed views"""
+    return Village(**villages.row(villages.index_of(name)))
 
 def calculate_risk_contributions(village: Village) -> Dict[str, float]:
     """Calculate how each factor contributes to risk score"""
@@ -527,9 +518,8 @@ def generate_action_summary(village: Village, households: List[Household]) -> Di
         icon = "✅"
         priority = "LOW"
     
-    # Calculate households to evacuate
-    high_risk_households = [h for h in households if h.priority_score >= 60]
-    critical_households = [h for h in households if h.priority_score >= 75]
+    # Calculate households to evacuate (Phase 1 + Phase 2)
+    phase_counts = summarize_evacuation_phases([h.priority_score for h in households]).households
     
     # Identify focus area (based on household clustering)
     focus_areas = ["eastern slope", "northern ridge", "western valley", "southern approach"]
@@ -555,8 +545,8 @@ def generate_action_summary(village: Village, households: List[Household]) -> Di
         "action": action,
         "icon": icon,
         "priority": priority,
-        "households_evacuate": len(high_risk_households),
-        "households_critical": len(critical_households),
+        "households_evacuate": int(phase_counts[0] + phase_counts[1]),
+        "households_critical": int(phase_counts[0]),
         "focus_area": focus_area,
         "route": route_status,
         "alert_frequency": alert_freq,
@@ -617,6 +607,13 @@ def calculate_confidence_level(village: Village) -> Tuple[str, int, str]:
     
     return confidence, uncertainty, explanation
 
+def get_risk_band(village: Village) -> Tuple[float, float]:
+    """Sampled ±points (half of the 90% Monte Carlo band) and probability of reaching Evacuate"""
+    villages = load_villages(DATA_VERSION)
+    uncertainty = load_risk_uncertainty(villages, DATA_VERSION)
+    i = villages.index_of(village.name)
+    return float(uncertainty.uncertainty[i]), float(uncertainty.probability_of(AlertLevel.EVACUATE)[i])
+
 def get_risk_category(score: float) -> Tuple[str, str]:
     """Get risk category and color"""
     if score >= 75:
@@ -629,53 +626,31 @@ def get_risk_category(score: float) -> Tuple[str, str]:
         return "Low", "#4caf50"
 
 def generate_households(village: Village, count: int = 20) -> List[Household]:
-    """Generate household data for evacuation planning"""
-    households = []
-    for i in range(count):
-        # Generate households with varying risk factors
-        distance = random.uniform(5, 500)  # meters from slope
-        drainage = random.choice(["Poor", "Fair", "Good"])
-        access = random.choice(["Limited", "Moderate", "Good"])
-        occupants = random.randint(2, 8)
-        
-        # Calculate priority score (higher = more urgent)
-        priority = 0
-        priority += (500 - distance) / 500 * 40  # Closer = higher priority
-        priority += {"Poor": 30, "Fair": 15, "Good": 5}[drainage]
-        priority += {"Limited": 25, "Moderate": 10, "Good": 0}[access]
-        priority += village.risk_score / 100 * 20
-        
-        households.append(Household(
-            id=f"{village.name[:3].upper()}-{i+1:03d}",
-            location=(
-                village.latitude + random.uniform(-0.01, 0.01),
-                village.longitude + random.uniform(-0.01, 0.01)
-            ),
-            distance_to_slope=distance,
-            drainage_quality=drainage,
-            road_access=access,
-            occupants=occupants,
-            priority_score=min(priority, 100)
-        ))
-    
-    return sorted(households, key=lambda x: x.priority_score, reverse=True)
+    """Generate household data for evacuation planning (seeded per village, vectorized, generation order)"""
+    return generate_household_arrays(
+        village.name,
+        village.latitude,
+        village.longitude,
+        village.risk_score,
+        count,
+        seed=HOUSEHOLD_SEED
+    ).to_households()
 
-def generate_risk_trend(village: Village, days: int = 7) -> pd.DataFrame:
-    """Generate historical risk trend data"""
-    dates = [(datetime.now() - timedelta(days=days-i)) for i in range(days)]
-    base_score = village.risk_score
-    
-    # Simulate trend with some randomness
-    scores = []
-    current = base_score - random.uniform(5, 15)
-    for _ in range(days):
-        current += random.uniform(-5, 8)
-        current = max(0, min(100, current))
-        scores.append(current)
-    
+def read_risk_trend(village: Village, days: int = 7, freq: str = "hour") -> pd.DataFrame:
+    """Risk history from the time-series store (synthetic backfill where no readings exist yet)"""
+    store = load_timeseries_store(TIMESERIES_PATH)
+    now = time.time()
+    factors = {name: getattr(village, name) for name in RISK_FACTORS}
+    
+    backfill_history(store, village.name, factors, now, days=14, interval_s=READING_INTERVAL_S, seed=HOUSEHOLD_SEED)
+    latest = store.latest(village.name)
+    if latest is None or latest["ts"] // READING_INTERVAL_S < now // READING_INTERVAL_S:
+        store.append(village.name, now, factors)  # current reading for this hour
+    
+    rollup = store.rollup(village.name, now - days * 86400, now + 1, freq, columns=["risk_score"])
     return pd.DataFrame({
-        'Date': dates,
-        'Risk Score': scores
+        'Date': [datetime.fromtimestamp(t) for t in rollup["time"]],
+        'Risk Score': rollup["risk_score"]
     })
 
 def generate_alert_message(village: Village, level: str, language: str = "English") -> str:
@@ -702,6 +677,112 @@ def generate_alert_message(village: Village, level: str, language: str = "Englis
     
     return messages[language][level]
 
+# Cached data layer
+# Streamlit reruns the whole script on every widget interaction; these wrappers
+# keep villages, households, trends and reference tables stable across reruns.
+# Leading-underscore parameters are excluded from the cache key, so each key is
+# spelled out explicitly (village name + risk score + data version).
+@st.cache_data(ttl=CACHE_TTL_SECONDS, max_entries=8, show_spinner=False)
+def load_villages(data_version: str) -> VillageTable:
+    """Cached village table for a data version"""
+    return generate_ne_villages()
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def load_households(_village: Village, village_name: str, risk_score: float, count: int,
+                    data_version: str) -> List[Household]:
+    """Cached household list for a village at its current risk score"""
+    return generate_households(_village, count)
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def load_risk_trend(_village: Village, village_name: str, risk_score: float, days: int,
+                    data_version: str, freq: str = "hour") -> pd.DataFrame:
+    """Cached risk trend for a village"""
+    return read_risk_trend(_village, days, freq)
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, max_entries=8, show_spinner=False)
+def load_risk_uncertainty(_villages: VillageTable, data_version: str) -> RiskUncertainty:
+    """Cached Monte Carlo score bands for every village"""
+    factors = {name: getattr(_villages, name) for name in RISK_FACTORS}
+    return simulate_risk_uncertainty(factors, draws=UNCERTAINTY_DRAWS, seed=HOUSEHOLD_SEED)
+
+@st.cache_resource(show_spinner=False)
+def load_scenario_engine(_villages: VillageTable, data_version: str) -> ScenarioEngine:
+    """What-if engine over all villages, with their full household sets"""
+    households = [
+        generate_household_arrays(
+            str(name), float(lat), float(lon), float(risk), int(count), seed=HOUSEHOLD_SEED
+        )
+        for name, lat, lon, risk, count in zip(
+            _villages.name, _villages.latitude, _villages.longitude, _villages.risk_score, _villages.households
+        )
+    ]
+    return ScenarioEngine(
+        {name: getattr(_villages, name) for name in RISK_FACTORS},
+        _villages.name,
+        regions=[VILLAGE_DISTRICTS.get(str(name), "") for name in _villages.name],
+        households=households
+    )
+
+@st.cache_resource(show_spinner=False)
+def load_map_layers() -> MapLayerCache:
+    """Process-wide village GeoJSON layers (one per data version)"""
+    return MapLayerCache()
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, max_entries=8, show_spinner=False)
+def load_village_map_html(_villages: VillageTable, data_version: str) -> str:
+    """Rendered village risk map: one GeoJSON layer instead of a marker per village"""
+    m = folium.Map(
+        location=[_villages.latitude.mean(), _villages.longitude.mean()],
+        zoom_start=10,
+        tiles='OpenStreetMap'
+    )
+    folium.GeoJson(
+        load_map_layers().layer(data_version, _villages),
+        name="Villages",
+        marker=folium.CircleMarker(),
+        on_each_feature=folium.JsCode(VILLAGE_LAYER_JS)
+    ).add_to(m)
+    return folium.Figure().add_child(m).render()
+
+@st.cache_resource(show_spinner=False)
+def load_timeseries_store(root: str) -> RiskTimeSeriesStore:
+    """Process-wide factor and score history (shared by all sessions)"""
+    return RiskTimeSeriesStore(root)
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def load_escalation_matrix(data_version: str) -> pd.DataFrame:
+    """Cached alert escalation reference table"""
+    return pd.DataFrame(create_alert_escalation_matrix())
+
+@st.cache_resource(show_spinner=False)
+def load_alert_services(history_path: str) -> Tuple[AlertHistoryStore, AlertScheduler]:
+    """Process-wide alert log and re-alert scheduler (shared by all sessions)"""
+    os.makedirs(os.path.dirname(history_path), exist_ok=True)
+    history, scheduler = AlertHistoryStore(history_path), AlertScheduler()
+    # Alerts sent before a restart still count, so they are not re-sent as new
+    scheduler.restore_sent(history.recent(hours=max(scheduler.intervals.values()) / 3600))
+    return history, scheduler
+
+def record_due_alerts(villages: VillageTable) -> List[AlertRecord]:
+    """Log every alert the scheduler says is due now to the alert history"""
+    history, scheduler = load_alert_services(ALERT_HISTORY_PATH)
+    scheduler.update_many(villages.name, villages.risk_score)
+    
+    records = []
+    for alert in scheduler.pop_due():
+        village = get_village(villages, alert.village)
+        metadata = generate_alert_metadata(village.name, village.risk_score, village.households, village.population)
+        records.append(AlertRecord.from_metadata(
+            metadata,
+            district=VILLAGE_DISTRICTS.get(village.name, ""),
+            message=generate_alert_message(village, alert.alert_level, "English")
+        ))
+    if records:
+        history.extend(records)
+        history.flush()
+        st.session_state.alerts_history.extend(record.to_dict() for record in records)
+    return records
+
 # Main Application
 def main():
     # Hero Section
@@ -737,22 +818,23 @@ def main():
     )
     st.session_state.current_mode = mode
     
-    # Generate village data
-    villages = generate_ne_villages()
+    # Load village data (cached per data version)
+    villages = load_villages(DATA_VERSION)
+    record_due_alerts(villages)
     
     if mode == "Disaster Officer":
         render_officer_dashboard(villages)
     else:
         render_citizen_view(villages)
 
-def render_officer_dashboard(villages: List[Village]):
+def render_officer_dashboard(villages: VillageTable):
     """Render the comprehensive disaster officer dashboard"""
     
     st.sidebar.markdown("---")
     st.sidebar.title("🎯 Dashboard Controls")
     
     # Village selector
-    village_names = [v.name for v in villages]
+    village_names = villages.name.tolist()
     selected_village_name = st.sidebar.selectbox(
         "Select Village for Detailed Analysis:",
         ["Overview"] + village_names
@@ -776,10 +858,10 @@ def render_officer_dashboard(villages: List[Village]):
     if selected_village_name == "Overview":
         render_overview_dashboard(villages, alert_language)
     else:
-        selected_village = next(v for v in villages if v.name == selected_village_name)
+        selected_village = get_village(villages, selected_village_name)
         render_village_details(selected_village, alert_language, trend_days)
 
-def render_overview_dashboard(villages: List[Village], alert_language: str):
+def render_overview_dashboard(villages: VillageTable, alert_language: str):
     """Render overview dashboard with all villages"""
     
     # Key Metrics Row
@@ -796,7 +878,7 @@ def render_overview_dashboard(villages: List[Village], alert_language: str):
         """, unsafe_allow_html=True)
     
     with col2:
-        critical_villages = sum(1 for v in villages if v.risk_score >= 75)
+        critical_villages = villages.category_counts().get("Critical", 0)
         st.markdown(f"""
         <div class="metric-glass-card">
             <div class="metric-value">{critical_villages}</div>
@@ -805,7 +887,7 @@ def render_overview_dashboard(villages: List[Village], alert_language: str):
         """, unsafe_allow_html=True)
     
     with col3:
-        total_population = sum(v.population for v in villages)
+        total_population = int(villages.population.sum())
         st.markdown(f"""
         <div class="metric-glass-card">
             <div class="metric-value">{total_population:,}</div>
@@ -814,7 +896,7 @@ def render_overview_dashboard(villages: List[Village], alert_language: str):
         """, unsafe_allow_html=True)
     
     with col4:
-        avg_risk = np.mean([v.risk_score for v in villages])
+        avg_risk = villages.risk_score.mean()
         st.markdown(f"""
         <div class="metric-glass-card">
             <div class="metric-value">{avg_risk:.1f}</div>
@@ -830,84 +912,45 @@ def render_overview_dashboard(villages: List[Village], alert_language: str):
     with col1:
         st.subheader("🗺️ Village-Level Risk Intelligence Map")
         
-        # Create interactive map
-        center_lat = np.mean([v.latitude for v in villages])
-        center_lon = np.mean([v.longitude for v in villages])
-        
-        m = folium.Map(
-            location=[center_lat, center_lon],
-            zoom_start=10,
-            tiles='OpenStreetMap'
-        )
-        
-        # Add villages to map
-        for village in villages:
-            category, color = get_risk_category(village.risk_score)
-            
-            folium.CircleMarker(
-                location=[village.latitude, village.longitude],
-                radius=8 + (village.risk_score / 10),
-                popup=folium.Popup(
-                    f"""
-                    <b>{village.name}</b><br>
-                    Risk Score: {village.risk_score:.1f}<br>
-                    Category: {category}<br>
-                    Population: {village.population}<br>
-                    Households: {village.households}
-                    """,
-                    max_width=250
-                ),
-                color=color,
-                fill=True,
-                fillColor=color,
-                fillOpacity=0.7,
-                weight=2
-            ).add_to(m)
-        
-        folium_static(m, width=700, height=500)
+        # Rendered once per data version; reruns are served from cache
+        components.html(load_village_map_html(villages, DATA_VERSION), width=700, height=510)
     
     with col2:
         st.subheader("🎯 High-Risk Villages")
         
-        # Sort villages by risk score
-        sorted_villages = sorted(villages, key=lambda x: x.risk_score, reverse=True)
-        
-        for village in sorted_villages[:5]:
-            category, color = get_risk_category(village.risk_score)
+        # Villages are pre-ranked by risk score
+        categories, colors = villages.categories, villages.colors
+        for i in villages.top(5):
+            category, color = categories[i], colors[i]
             
             st.markdown(f"""
             <div style="background-color: {color}; padding: 10px; border-radius: 5px; margin-bottom: 10px; color: {'white' if category != 'Moderate' else 'black'};">
-                <strong>{village.name}</strong><br>
-                Risk Score: {village.risk_score:.1f} ({category})<br>
-                Population: {village.population} | Households: {village.households}
+                <strong>{villages.name[i]}</strong><br>
+                Risk Score: {villages.risk_score[i]:.1f} ({category})<br>
+                Population: {villages.population[i]} | Households: {villages.households[i]}
             </div>
             """, unsafe_allow_html=True)
         
         st.markdown("---")
         st.subheader("🔔 Active Alerts")
         
-        # Generate alerts for high-risk villages
-        for village in sorted_villages:
-            if village.risk_score >= 60:
-                if village.risk_score >= 75:
-                    level = "Evacuate"
-                    icon = "🆘"
-                    alert_class = "glass-alert-danger"
-                elif village.risk_score >= 65:
-                    level = "Warning"
-                    icon = "🚨"
-                    alert_class = "glass-alert-warning"
-                else:
-                    level = "Advisory"
-                    icon = "⚠️"
-                    alert_class = "glass-alert-warning"
-                
-                st.markdown(f"""
-                <div class="{alert_class}">
-                    {icon} <strong>{level}</strong>: {village.name}<br>
-                    <small>{datetime.now().strftime('%Y-%m-%d %H:%M')}</small>
-                </div>
-                """, unsafe_allow_html=True)
+        # Generate alerts for high-risk villages (alert levels precomputed per village)
+        alert_styles = {
+            AlertLevel.EVACUATE: ("🆘", "glass-alert-danger"),
+            AlertLevel.WARNING: ("🚨", "glass-alert-warning"),
+            AlertLevel.ADVISORY: ("⚠️", "glass-alert-warning")
+        }
+        alert_levels = villages.alert_levels
+        for i in villages.at_least(60):
+            level = alert_levels[i]
+            icon, alert_class = alert_styles[level]
+            
+            st.markdown(f"""
+            <div class="{alert_class}">
+                {icon} <strong>{level}</strong>: {villages.name[i]}<br>
+                <small>{datetime.now().strftime('%Y-%m-%d %H:%M')}</small>
+            </div>
+            """, unsafe_allow_html=True)
     
     st.markdown("---")
     
@@ -918,8 +961,7 @@ def render_overview_dashboard(villages: List[Village], alert_language: str):
     
     with col1:
         # Risk category distribution
-        risk_categories = [get_risk_category(v.risk_score)[0] for v in villages]
-        category_counts = pd.Series(risk_categories).value_counts()
+        category_counts = pd.Series(villages.category_counts())
         
         fig = px.pie(
             values=category_counts.values,
@@ -939,7 +981,7 @@ def render_overview_dashboard(villages: List[Village], alert_language: str):
         # Risk score distribution
         fig = go.Figure()
         fig.add_trace(go.Histogram(
-            x=[v.risk_score for v in villages],
+            x=villages.risk_score,
             nbinsx=10,
             marker_color='#1f77b4',
             name='Villages'
@@ -951,6 +993,59 @@ def render_overview_dashboard(villages: List[Village], alert_language: str):
             showlegend=False
         )
         st.plotly_chart(fig, use_container_width=True)
+    
+    st.markdown("---")
+    render_scenario_explorer(villages)
+
+def render_scenario_explorer(villages: VillageTable):
+    """What-if sweep over a forecast factor for all villages or one district"""
+    st.subheader("🌧️ What-If Scenarios")
+    st.caption("Evaluate every forecast value at once: risk, alert levels and households to evacuate")
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        factor = st.selectbox(
+            "Forecast factor:",
+            list(SCENARIO_FACTORS),
+            format_func=lambda name: SCENARIO_FACTORS[name][0]
+        )
+    label, low, high, default, step = SCENARIO_FACTORS[factor]
+    with col2:
+        region = st.selectbox("Region:", ["All districts"] + sorted(set(VILLAGE_DISTRICTS.values())))
+    with col3:
+        value_range = st.slider(f"{label} range:", low, high, default, step=step)
+    
+    engine = load_scenario_engine(villages, DATA_VERSION)
+    scenarios = [Scenario("Current")] + scenario_grid(
+        factor,
+        np.arange(value_range[0], value_range[1] + step, step),
+        region=None if region == "All districts" else region
+    )
+    cube = engine.run(scenarios)
+    summary = cube.summary()
+    
+    st.dataframe(pd.DataFrame({
+        'Scenario': cube.scenarios,
+        'Max Risk': summary["max_score"].astype(float).round(1),
+        'Evacuate': summary["villages_Evacuate"],
+        'Warning': summary["villages_Warning"],
+        'Advisory': summary["villages_Advisory"],
+        'Households to Evacuate': summary["households_to_evacuate"],
+        'People to Evacuate': summary["people_to_evacuate"]
+    }), use_container_width=True, hide_index=True)
+    
+    fig = px.imshow(
+        cube.scores,
+        x=list(cube.villages),
+        y=list(cube.scenarios),
+        zmin=0,
+        zmax=100,
+        color_continuous_scale=[(0, '#4caf50'), (0.4, '#ffd700'), (0.6, '#ff9800'), (0.75, '#ff4444'), (1, '#b71c1c')],
+        labels={'color': 'Risk Score'},
+        aspect='auto',
+        title="Risk Score by Scenario and Village"
+    )
+    st.plotly_chart(fig, use_container_width=True)
 
 def render_village_details(village: Village, alert_language: str, trend_days: int):
     """Render detailed analysis for a specific village"""
@@ -959,7 +1054,8 @@ def render_village_details(village: Village, alert_language: str, trend_days: in
     
     # Village header with risk score
     category, color = get_risk_category(village.risk_score)
-    confidence, uncertainty, conf_explanation = calculate_confidence_level(village)
+    confidence, _, conf_explanation = calculate_confidence_level(village)
+    uncertainty, evacuate_probability = get_risk_band(village)
     
     col1, col2, col3, col4 = st.columns(4)
     
@@ -970,10 +1066,11 @@ def render_village_details(village: Village, alert_language: str, trend_days: in
             <p><strong>{category} Risk</strong></p>
             <hr style="margin: 8px 0; opacity: 0.5;">
             <p style="font-size: 0.9rem; margin: 0;"><strong>Confidence: {confidence}</strong></p>
-            <p style="font-size: 0.85rem; margin: 0;">(±{uncertainty} points)</p>
+            <p style="font-size: 0.85rem; margin: 0;">(±{uncertainty:.1f} points)</p>
         </div>
         """, unsafe_allow_html=True)
         st.caption(f"🎯 {conf_explanation}")
+        st.caption(f"🎲 {evacuate_probability:.0%} chance of Evacuate level given sensor error")
     
     with col2:
         st.metric("Population", f"{village.population:,}")
@@ -992,7 +1089,7 @@ def render_village_details(village: Village, alert_language: str, trend_days: in
     # FEATURE: Action Summary Card - Intelligence at a Glance
     st.subheader("⚡ Recommended Action Summary")
     
-    households = generate_households(village, 20)
+    households = load_households(village, village.name, village.risk_score, 20, DATA_VERSION)
     action_summary = generate_action_summary(village, households)
     
     # Determine card color based on priority
@@ -1070,7 +1167,7 @@ def render_village_details(village: Village, alert_language: str, trend_days: in
     # FEATURE 6: Time-Based Risk Trend
     st.subheader("📊 Risk Trend Analysis")
     
-    trend_data = generate_risk_trend(village, trend_days)
+    trend_data = load_risk_trend(village, village.name, village.risk_score, trend_days, DATA_VERSION, "hour")
     
     col1, col2 = st.columns([2, 1])
     
@@ -1079,9 +1176,8 @@ def render_village_details(village: Village, alert_language: str, trend_days: in
         fig.add_trace(go.Scatter(
             x=trend_data['Date'],
             y=trend_data['Risk Score'],
-            mode='lines+markers',
+            mode='lines',
             line=dict(color='#1f77b4', width=3),
-            marker=dict(size=8),
             fill='tozeroy',
             fillcolor='rgba(31, 119, 180, 0.2)'
         ))
@@ -1149,14 +1245,20 @@ def render_village_details(village: Village, alert_language: str, trend_days: in
     
     if village.risk_score >= 55:
         
+        # One pass over the households feeds every phase count below
+        priorities = np.fromiter((h.priority_score for h in households), dtype=np.float64, count=len(households))
+        occupants = np.fromiter((h.occupants for h in households), dtype=np.int64, count=len(households))
+        phases = summarize_evacuation_phases(priorities, occupants)
+        
         col1, col2 = st.columns([1, 1])
         
         with col1:
             st.markdown("### 🏠 Priority Evacuation List")
             st.markdown("*Households ranked by urgency*")
             
-            # Show top 10 priority households
-            for i, hh in enumerate(households[:10], 1):
+            # Show top 10 priority households (partial selection, no full sort)
+            top_households, _ = select_priority_households(households, 10)
+            for i, hh in enumerate(top_households, 1):
                 priority_color = "#ff4444" if hh.priority_score >= 75 else "#ff9800" if hh.priority_score >= 60 else "#ffd700"
                 
                 st.markdown(f"""
@@ -1174,16 +1276,16 @@ def render_village_details(village: Village, alert_language: str, trend_days: in
         with col2:
             st.markdown("### 📋 Evacuation Summary")
             
-            total_evacuate = len([h for h in households if h.priority_score >= 60])
-            total_people = sum(h.occupants for h in households if h.priority_score >= 60)
+            total_evacuate = int(phases.households[0] + phases.households[1])
+            total_people = int(phases.people[0] + phases.people[1])
             
             st.markdown(f"""
             <div class="metric-card">
             <h4>Evacuation Requirements</h4>
             <p><strong>Households to evacuate:</strong> {total_evacuate}</p>
             <p><strong>Total people:</strong> {total_people}</p>
-            <p><strong>Phase 1 (Immediate):</strong> {len([h for h in households if h.priority_score >= 75])} households</p>
-            <p><strong>Phase 2 (Within 2 hours):</strong> {len([h for h in households if 60 <= h.priority_score < 75])} households</p>
+            <p><strong>Phase 1 (Immediate):</strong> {phases.households[0]} households</p>
+            <p><strong>Phase 2 (Within 2 hours):</strong> {phases.households[1]} households</p>
             </div>
             """, unsafe_allow_html=True)
             
@@ -1204,20 +1306,12 @@ def render_village_details(village: Village, alert_language: str, trend_days: in
         # Evacuation timeline
         st.markdown("### ⏱️ Recommended Evacuation Timeline")
         
+        # Timeline uses tighter bands (75/65/55) than the planning phases
+        timeline = summarize_evacuation_phases(priorities, occupants, thresholds=(75, 65, 55))
         timeline_data = pd.DataFrame({
             'Phase': ['Immediate\n(0-30 min)', 'High Priority\n(30-60 min)', 'Medium Priority\n(1-2 hours)', 'Monitoring\n(ongoing)'],
-            'Households': [
-                len([h for h in households if h.priority_score >= 75]),
-                len([h for h in households if 65 <= h.priority_score < 75]),
-                len([h for h in households if 55 <= h.priority_score < 65]),
-                len([h for h in households if h.priority_score < 55])
-            ],
-            'People': [
-                sum(h.occupants for h in households if h.priority_score >= 75),
-                sum(h.occupants for h in households if 65 <= h.priority_score < 75),
-                sum(h.occupants for h in households if 55 <= h.priority_score < 65),
-                sum(h.occupants for h in households if h.priority_score < 55)
-            ]
+            'Households': timeline.households,
+            'People': timeline.people
         })
         
         fig = go.Figure()
@@ -1285,16 +1379,26 @@ def render_village_details(village: Village, alert_language: str, trend_days: in
     # Alert escalation logic
     st.markdown("### 📊 Alert Escalation Matrix")
     
-    escalation_df = pd.DataFrame({
-        'Risk Score Range': ['0-40', '40-60', '60-75', '75-100'],
-        'Alert Level': ['Advisory', 'Advisory', 'Warning', 'Evacuate'],
-        'Message Frequency': ['Daily', 'Every 6 hours', 'Every 2 hours', 'Every 15 min'],
-        'Channels': ['SMS', 'SMS + Voice', 'SMS + Voice + Radio', 'All + Sirens'],
-        'Action Required': ['Monitor', 'Prepare', 'Ready to evacuate', 'Immediate evacuation']
-    })
+    escalation_df = load_escalation_matrix(DATA_VERSION)
     
     st.dataframe(escalation_df, use_container_width=True, hide_index=True)
     
+    # Alert log for the village's district
+    district = VILLAGE_DISTRICTS.get(village.name, "")
+    st.markdown(f"### 🗂️ Alert History: {district or village.name} (last 24 hours)")
+    
+    history, _ = load_alert_services(ALERT_HISTORY_PATH)
+    recent_alerts = history.recent_by_district(district, hours=24, limit=50)
+    if recent_alerts:
+        history_df = pd.DataFrame([record.to_dict() for record in recent_alerts])
+        st.dataframe(
+            history_df[["timestamp", "village", "alert_level", "risk_score", "delivery_count", "status"]],
+            use_container_width=True,
+            hide_index=True
+        )
+    else:
+        st.caption("No alerts issued in the last 24 hours.")
+    
     st.markdown("---")
     
     # FEATURE 8: Offline-First Design
@@ -1335,17 +1439,17 @@ def render_village_details(village: Village, alert_language: str, trend_days: in
         </div>
         """, unsafe_allow_html=True)
 
-def render_citizen_view(villages: List[Village]):
+def render_citizen_view(villages: VillageTable):
     """Render simplified citizen-facing view"""
     
     st.subheader("🏘️ Citizen Alert Center")
     
     # Location selector
     st.sidebar.markdown("---")
-    village_names = [v.name for v in villages]
+    village_names = villages.name.tolist()
     my_village = st.sidebar.selectbox("Select Your Village:", village_names)
     
-    village = next(v for v in villages if v.name == my_village)
+    village = get_village(villages, my_village)
     category, color = get_risk_category(village.risk_score)
     
     # Large risk indicator
@@ -1446,7 +1550,7 @@ def render_citizen_view(villages: List[Village]):
     # Risk trend
     st.markdown("### 📊 Risk Trend (Last 7 Days)")
     
-    trend_data = generate_risk_trend(village, 7)
+    trend_data = load_risk_trend(village, village.name, village.risk_score, 7, DATA_VERSION, "day")
     
     fig = go.Figure()
     fig.add_trace(go.Scatter(
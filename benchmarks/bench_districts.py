@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+NER-Aegis AI - District Runner Scaling Benchmark
+
+Runs a synthetic state (districts x villages x households) through
+logic.district_runner.run_districts with 1, 2, 4, ... worker processes and
+reports wall time and speedup over one worker.
+
+Usage:
+    python benchmarks/bench_districts.py                             # 12 districts, 2M households
+    python benchmarks/bench_districts.py --households 5000000 --workers 1,2,4,8
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic.district_runner import run_districts
+from logic.evacuation_planner import DRAINAGE_QUALITIES, ROAD_ACCESS_LEVELS
+
+
+def synthetic_state(districts: int, villages: int, households: int, seed: int = 42) -> dict:
+    """Villages spread over districts, households over villages (uneven, like real districts)"""
+    rng = np.random.default_rng(seed)
+    weights = rng.pareto(2.0, villages) + 0.1
+    return {
+        "village_districts": [f"District-{d:02d}" for d in rng.integers(0, districts, villages)],
+        "village_factors": np.column_stack([
+            rng.uniform(0, 300, villages),
+            rng.uniform(0, 60, villages),
+            rng.uniform(0, 100, villages),
+            rng.uniform(0, 50, villages),
+            rng.uniform(0, 12, villages)
+        ]),
+        "household_village": rng.choice(villages, households, p=weights / weights.sum()),
+        "distance_to_slope": rng.uniform(0, 500, households),
+        "drainage_code": rng.integers(0, len(DRAINAGE_QUALITIES), households).astype(np.uint8),
+        "access_code": rng.integers(0, len(ROAD_ACCESS_LEVELS), households).astype(np.uint8),
+        "occupants": rng.integers(1, 9, households)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark run_districts scaling across worker processes")
+    parser.add_argument("--districts", type=int, default=12)
+    parser.add_argument("--villages", type=int, default=6_000)
+    parser.add_argument("--households", type=int, default=2_000_000)
+    parser.add_argument("--workers", help="Comma-separated worker counts (default: 1, 2, 4, ... up to CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=None)
+    args = parser.parse_args()
+    
+    cpus = os.cpu_count() or 1
+    if args.workers:
+        worker_counts = [int(w) for w in args.workers.split(",")]
+    else:
+        worker_counts = sorted({1, cpus} | {2 ** k for k in range(1, 8) if 2 ** k < cpus})
+    
+    state = synthetic_state(args.districts, args.villages, args.households)
+    extra = {"chunk_size": args.chunk_size} if args.chunk_size else {}
+    print(f"{args.districts} districts, {args.villages:,} villages, {args.households:,} households, {cpus} CPU(s)")
+    
+    baseline = None
+    for workers in worker_counts:
+        start = time.perf_counter()
+        result = run_districts(**state, workers=workers, **extra)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(
+            f"  workers={workers:<3} tasks={result.tasks:<4} {elapsed:8.3f} s | "
+            f"speedup {baseline / elapsed:5.2f}x | {args.households / elapsed:14,.0f} households/s"
+        )
+    
+    total = result.total
+    print(f"\n  {total.households:,} households, {total.people:,} people; Phase 1: {total.phase_households[0]:,}")
+
+
+if __name__ == "__main__":
+    main()
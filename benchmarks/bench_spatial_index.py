@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+NER-Aegis AI - Spatial Index Benchmark
+
+Builds a SpatialGridIndex over synthetic households clustered around
+villages across Northeast India and times nearest-neighbour, radius and
+bounding-box queries against a brute-force scan.
+
+Usage:
+    python benchmarks/bench_spatial_index.py [--households 1000000] [--queries 2000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic.spatial_index import SpatialGridIndex, haversine_m
+
+
+def synthesize_households(count: int, villages: int, seed: int):
+    """Households scattered ~1 km around village centres in the NE India bounding box"""
+    rng = np.random.default_rng(seed)
+    centre_lat = rng.uniform(22.0, 29.0, villages)
+    centre_lon = rng.uniform(89.5, 97.5, villages)
+    village = rng.integers(0, villages, count)
+    latitudes = centre_lat[village] + rng.normal(0, 0.01, count)
+    longitudes = centre_lon[village] + rng.normal(0, 0.01, count)
+    return latitudes, longitudes
+
+
+def time_queries(label: str, queries, run) -> None:
+    """Run one query per entry and print latency percentiles"""
+    timings = np.empty(len(queries))
+    for i, query in enumerate(queries):
+        start = time.perf_counter()
+        run(*query)
+        timings[i] = time.perf_counter() - start
+    timings *= 1e6
+    print(
+        f"  {label:<24} median {np.median(timings):8.1f} µs | "
+        f"p99 {np.percentile(timings, 99):8.1f} µs | max {timings.max():8.1f} µs"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SpatialGridIndex queries")
+    parser.add_argument("--households", type=int, default=1_000_000)
+    parser.add_argument("--villages", type=int, default=5_000)
+    parser.add_argument("--queries", type=int, default=2_000)
+    parser.add_argument("--cell-size", type=float, default=250.0)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    
+    latitudes, longitudes = synthesize_households(args.households, args.villages, args.seed)
+    
+    start = time.perf_counter()
+    index = SpatialGridIndex(latitudes, longitudes, cell_size_m=args.cell_size)
+    build_ms = (time.perf_counter() - start) * 1e3
+    print(f"Indexed {len(index):,} households in {build_ms:.0f} ms ({index.n_rows}x{index.n_cols} cells)")
+    
+    # Query at perturbed household locations so queries land where people live
+    rng = np.random.default_rng(args.seed + 1)
+    picks = rng.integers(0, len(index), args.queries)
+    q_lat = latitudes[picks] + rng.normal(0, 0.002, args.queries)
+    q_lon = longitudes[picks] + rng.normal(0, 0.002, args.queries)
+    
+    time_queries("nearest (k=1)", list(zip(q_lat, q_lon)), lambda la, lo: index.query_nearest(la, lo, 1))
+    time_queries("nearest (k=10)", list(zip(q_lat, q_lon)), lambda la, lo: index.query_nearest(la, lo, 10))
+    time_queries("radius (500 m)", list(zip(q_lat, q_lon)), lambda la, lo: index.query_radius(la, lo, 500.0))
+    time_queries(
+        "bbox (0.01° cell)",
+        list(zip(q_lat, q_lon)),
+        lambda la, lo: index.query_bbox(la - 0.005, lo - 0.005, la + 0.005, lo + 0.005)
+    )
+    
+    # Brute-force reference for a handful of queries
+    brute = [(q_lat[i], q_lon[i]) for i in range(min(20, args.queries))]
+    time_queries("brute-force nearest", brute, lambda la, lo: np.argmin(haversine_m(la, lo, latitudes, longitudes)))
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,22 @@ Modules:
 - risk_engine: Risk scoring, confidence calculation, trigger identification
 - evacuation_planner: Household prioritization, phase planning, route optimization
 - alert_engine: Alert level determination, message generation, multi-channel delivery
+- village_table: Columnar village store with precomputed risk, alert level and ranking
+- spatial_index: Grid-hash spatial index for nearest-neighbour and radius lookups
+- risk_state: Incremental risk state that re-scores only villages touched by a reading
+- household_generator: Seeded, vectorized synthetic household generation
+- routing: Road-network evacuation routing with risk-weighted shortest paths
+- shelter_assignment: Capacity-constrained household-to-shelter assignment
+- alert_dispatcher: Asynchronous multi-channel alert delivery with retries and receipts
+- sms_encoding: GSM-7/UCS-2 aware SMS sizing, segmentation and batch packing
+- alert_scheduler: Heap-based re-alert scheduling with duplicate suppression
+- alert_history: Append-only SQLite alert log with indexed time-window queries
+- timeseries_store: Day-partitioned, memory-mapped factor and score history with rollups
+- sensor_ingestion: Streaming gauge ingestion with rolling rainfall windows and moisture EMA
+- uncertainty: Seeded Monte Carlo score bands and alert-threshold crossing probabilities
+- scenarios: Batched what-if sweeps producing scenario x village risk and evacuation cubes
+- district_runner: State-wide batch runs fanned out per district over a shared-memory process pool
+- map_layers: Village GeoJSON map layers cached per data version
 
 Engineering Philosophy:
 Clean separation of concerns enables:
@@ -24,11 +40,28 @@ from logic.risk_engine import (
     calculate_risk_contributions,
     calculate_confidence_level,
     identify_active_triggers,
-    get_risk_category
+    get_risk_category,
+    get_risk_category_codes,
+    compute_risk_scores,
+    compute_risk_raster,
+    identify_trigger_mask,
+    calculate_confidence_codes,
+    RiskScoreBatch
 )
 
 from logic.evacuation_planner import (
+    Household,
+    HouseholdArrays,
     calculate_household_priority,
+    calculate_household_priorities,
+    encode_drainage_quality,
+    encode_road_access,
+    assign_evacuation_phases,
+    summarize_evacuation_phases,
+    PhaseSummary,
+    top_priority_indices,
+    iter_priority_indices,
+    select_priority_households,
     generate_evacuation_phases,
     calculate_evacuation_statistics,
     generate_evacuation_routes,
@@ -39,12 +72,73 @@ from logic.evacuation_planner import (
 from logic.alert_engine import (
     determine_alert_level,
     get_alert_frequency,
+    get_alert_interval,
     get_delivery_channels,
+    determine_alert_level_codes,
     generate_alert_message,
+    render_alert_messages,
+    get_alert_template,
     create_alert_escalation_matrix,
     simulate_alert_delivery
 )
 
+from logic.village_table import VillageTable
+
+from logic.spatial_index import SpatialGridIndex, haversine_m
+
+from logic.risk_state import IncrementalRiskState, RiskChangeSet, RiskChange
+
+from logic.household_generator import generate_household_arrays, iter_household_chunks
+
+from logic.routing import RoadGraph, Route, ShortestPathTree, HouseholdRoutes, edge_risk_costs
+
+from logic.shelter_assignment import Shelter, ShelterAssignment, assign_shelters
+
+from logic.alert_dispatcher import (
+    AlertDispatcher,
+    DeliveryBackend,
+    StubGateway,
+    DeliveryRequest,
+    DeliveryReceipt,
+    DeliveryError,
+    ChannelConfig,
+    build_alert_requests,
+    deliver_alert,
+    deliver_alert_async
+)
+
+from logic.sms_encoding import SmsInfo, SmsBatch, analyze_sms, segment_sms, fit_sms, pack_sms_batches
+
+from logic.alert_scheduler import AlertScheduler, ScheduledAlert
+
+from logic.alert_history import AlertHistoryStore, AlertRecord
+
+from logic.timeseries_store import RiskTimeSeriesStore, backfill_history
+
+from logic.sensor_ingestion import (
+    SensorIngestionPipeline,
+    SensorReading,
+    SensorSocketServer,
+    RollingSum,
+    TimeDecayEMA,
+    iter_reading_file
+)
+
+from logic.uncertainty import RiskUncertainty, simulate_risk_uncertainty, factor_noise_sd
+
+from logic.scenarios import (
+    FactorPerturbation,
+    Scenario,
+    ScenarioCube,
+    ScenarioEngine,
+    scenario_grid,
+    combine_scenarios
+)
+
+from logic.district_runner import DistrictSummary, StateRunResult, run_districts
+
+from logic.map_layers import MapLayerCache, village_feature
+
 __version__ = "1.0.0"
 __author__ = "NER-Aegis AI Team"
 
@@ -55,9 +149,26 @@ __all__ = [
     'calculate_confidence_level',
     'identify_active_triggers',
     'get_risk_category',
+    'get_risk_category_codes',
+    'compute_risk_scores',
+    'compute_risk_raster',
+    'identify_trigger_mask',
+    'calculate_confidence_codes',
+    'RiskScoreBatch',
     
     # Evacuation Planner
+    'Household',
+    'HouseholdArrays',
     'calculate_household_priority',
+    'calculate_household_priorities',
+    'encode_drainage_quality',
+    'encode_road_access',
+    'assign_evacuation_phases',
+    'summarize_evacuation_phases',
+    'PhaseSummary',
+    'top_priority_indices',
+    'iter_priority_indices',
+    'select_priority_households',
     'generate_evacuation_phases',
     'calculate_evacuation_statistics',
     'generate_evacuation_routes',
@@ -66,9 +177,103 @@ __all__ = [
     
     # Alert Engine
     'determine_alert_level',
+    'determine_alert_level_codes',
     'get_alert_frequency',
+    'get_alert_interval',
     'get_delivery_channels',
     'generate_alert_message',
+    'render_alert_messages',
+    'get_alert_template',
     'create_alert_escalation_matrix',
-    'simulate_alert_delivery'
+    'simulate_alert_delivery',
+    
+    # Village Table
+    'VillageTable',
+    
+    # Spatial Index
+    'SpatialGridIndex',
+    'haversine_m',
+    
+    # Incremental Risk State
+    'IncrementalRiskState',
+    'RiskChangeSet',
+    'RiskChange',
+    
+    # Household Generator
+    'generate_household_arrays',
+    'iter_household_chunks',
+    
+    # Routing
+    'RoadGraph',
+    'Route',
+    'ShortestPathTree',
+    'HouseholdRoutes',
+    'edge_risk_costs',
+    
+    # Shelter Assignment
+    'Shelter',
+    'ShelterAssignment',
+    'assign_shelters',
+    
+    # Alert Dispatcher
+    'AlertDispatcher',
+    'DeliveryBackend',
+    'StubGateway',
+    'DeliveryRequest',
+    'DeliveryReceipt',
+    'DeliveryError',
+    'ChannelConfig',
+    'build_alert_requests',
+    'deliver_alert',
+    'deliver_alert_async',
+    
+    # SMS Encoding
+    'SmsInfo',
+    'SmsBatch',
+    'analyze_sms',
+    'segment_sms',
+    'fit_sms',
+    'pack_sms_batches',
+    
+    # Alert Scheduler
+    'AlertScheduler',
+    'ScheduledAlert',
+    
+    # Alert History
+    'AlertHistoryStore',
+    'AlertRecord',
+    
+    # Time-Series Store
+    'RiskTimeSeriesStore',
+    'backfill_history',
+    
+    # Sensor Ingestion
+    'SensorIngestionPipeline',
+    'SensorReading',
+    'SensorSocketServer',
+    'RollingSum',
+    'TimeDecayEMA',
+    'iter_reading_file',
+    
+    # Uncertainty
+    'RiskUncertainty',
+    'simulate_risk_uncertainty',
+    'factor_noise_sd',
+    
+    # Scenarios
+    'FactorPerturbation',
+    'Scenario',
+    'ScenarioCube',
+    'ScenarioEngine',
+    'scenario_grid',
+    'combine_scenarios',
+    
+    # District Runner
+    'DistrictSummary',
+    'StateRunResult',
+    'run_districts',
+    
+    # Map Layers
+    'MapLayerCache',
+    'village_feature'
 ]
@@ -0,0 +1,497 @@
+"""
+NER-Aegis AI - Alert Dispatcher
+
+This module delivers alerts over every channel chosen by get_delivery_channels:
+- One asyncio worker pool per channel (SMS, Voice IVR, Community Radio, Emergency Sirens)
+- Pluggable delivery backends behind a single async send() interface
+- Bounded queues and concurrency, retries with exponential backoff
+- A delivery receipt for every request, success or failure
+
+Engineering Principle: An alert is not sent until a receipt says it was delivered
+"""
+
+from typing import Dict, List, Any, Optional, Sequence, Callable, Iterable, Tuple
+from dataclasses import dataclass
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import itertools
+import random
+import time
+
+from logic.alert_engine import (
+    determine_alert_level,
+    get_delivery_channels,
+    get_alert_frequency,
+    generate_alert_message,
+    format_sms_alert
+)
+from logic.sms_encoding import analyze_sms, pack_sms_batches
+
+
+# Channels as named by get_delivery_channels
+DELIVERY_CHANNELS = ("SMS", "Voice IVR", "Community Radio", "Emergency Sirens")
+
+# Channels that reach individual phone numbers; the rest broadcast once per village
+PERSONAL_CHANNELS = ("SMS", "Voice IVR")
+
+RECEIPT_STATUSES = ("delivered", "failed")
+
+
+class DeliveryError(Exception):
+    """Raised by a backend when a send fails; retryable errors are retried with backoff"""
+    
+    def __init__(self, message: str, retryable: bool = True):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+@dataclass
+class ChannelConfig:
+    """Worker pool settings for one channel"""
+    concurrency: int  # sends in flight at once
+    max_attempts: int = 3
+    backoff_base_s: float = 0.5  # delay before the 2nd attempt; doubles each retry
+    backoff_max_s: float = 30.0
+    timeout_s: float = 10.0  # per attempt
+    queue_size: int = 10_000  # submit() waits when the queue is full
+
+
+DEFAULT_CHANNEL_CONFIGS = {
+    "SMS": ChannelConfig(concurrency=200),
+    "Voice IVR": ChannelConfig(concurrency=30, timeout_s=60.0),
+    "Community Radio": ChannelConfig(concurrency=2, max_attempts=5, timeout_s=30.0),
+    "Emergency Sirens": ChannelConfig(concurrency=4, max_attempts=5)
+}
+
+
+@dataclass
+class DeliveryRequest:
+    """One message to one recipient over one channel"""
+    channel: str
+    recipient: str  # phone number, radio station or siren id (batch label for batched SMS)
+    message: str
+    village: str = ""
+    alert_level: str = ""
+    language: str = "English"
+    request_id: str = ""
+    recipients: Tuple[str, ...] = ()  # batched SMS: every number in this gateway request
+    segments: int = 1  # SMS segments billed per recipient
+    
+    @property
+    def numbers(self) -> Tuple[str, ...]:
+        """Every recipient this request reaches"""
+        return self.recipients or (self.recipient,)
+
+
+@dataclass
+class DeliveryReceipt:
+    """Outcome of a DeliveryRequest after all attempts"""
+    request_id: str
+    channel: str
+    recipient: str
+    status: str  # "delivered" or "failed"
+    attempts: int
+    gateway_id: Optional[str] = None  # backend message id when delivered
+    error: Optional[str] = None
+    queued_at: float = 0.0  # time.monotonic()
+    completed_at: float = 0.0
+    
+    @property
+    def delivered(self) -> bool:
+        return self.status == "delivered"
+    
+    @property
+    def latency_s(self) -> float:
+        return self.completed_at - self.queued_at
+
+
+class DeliveryBackend(ABC):
+    """
+    Channel gateway interface: an SMS aggregator, IVR platform, radio
+    desk or siren controller. Subclasses implement send().
+    """
+    
+    @abstractmethod
+    async def send(self, request: DeliveryRequest) -> str:
+        """
+        Deliver one request.
+        
+        Returns:
+            Gateway message id
+        
+        Raises:
+            DeliveryError: On failure (retryable or permanent); any other
+                exception is treated as a retryable failure
+        """
+
+
+class StubGateway(DeliveryBackend):
+    """
+    Local stand-in gateway for tests and load runs.
+    
+    Simulates network latency and transient failures with a seeded RNG and
+    records every accepted request.
+    """
+    
+    def __init__(self, latency_s: float = 0.0, failure_rate: float = 0.0, seed: int = 0, name: str = "stub"):
+        self.latency_s = latency_s
+        self.failure_rate = failure_rate
+        self.name = name
+        self.sent: List[DeliveryRequest] = []
+        self.calls = 0
+        self.segments_billed = 0
+        self._rng = random.Random(seed)
+        self._ids = itertools.count(1)
+    
+    async def send(self, request: DeliveryRequest) -> str:
+        self.calls += 1
+        if self.latency_s:
+            await asyncio.sleep(self.latency_s)
+        if self._rng.random() < self.failure_rate:
+            raise DeliveryError(f"{self.name}: transient gateway error")
+        self.sent.append(request)
+        self.segments_billed += request.segments * len(request.numbers)
+        return f"{self.name}-{next(self._ids)}"
+
+
+class AlertDispatcher:
+    """
+    Multi-channel asynchronous dispatcher.
+    
+    Each channel has a bounded queue drained by `concurrency` workers, so a
+    slow channel (voice calls) never holds up a fast one (SMS).
+    
+    Usage:
+        async with AlertDispatcher({"SMS": sms_backend}) as dispatcher:
+            for request in requests:
+                await dispatcher.submit(request)
+            await dispatcher.join()
+        receipts = dispatcher.receipts
+    """
+    
+    def __init__(
+        self,
+        backends: Dict[str, DeliveryBackend],
+        configs: Optional[Dict[str, ChannelConfig]] = None,
+        on_receipt: Optional[Callable[[DeliveryReceipt], Any]] = None
+    ):
+        """
+        Args:
+            backends: Backend per channel name
+            configs: Per-channel overrides of DEFAULT_CHANNEL_CONFIGS
+            on_receipt: Called with every receipt as it is produced
+        """
+        self.backends = dict(backends)
+        self.configs = {
+            channel: (configs or {}).get(channel) or DEFAULT_CHANNEL_CONFIGS.get(channel) or ChannelConfig(concurrency=10)
+            for channel in self.backends
+        }
+        self.on_receipt = on_receipt
+        self.receipts: List[DeliveryReceipt] = []
+        self.callback_errors: List[Exception] = []  # raised by on_receipt (the worker keeps going)
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._workers: List[asyncio.Task] = []
+        self._ids = itertools.count(1)
+    
+    async def start(self) -> None:
+        """Create channel queues and worker pools"""
+        if self._workers:
+            return
+        for channel, config in self.configs.items():
+            queue = asyncio.Queue(maxsize=config.queue_size)
+            self._queues[channel] = queue
+            self._workers.extend(
+                asyncio.create_task(self._worker(channel, queue)) for _ in range(config.concurrency)
+            )
+    
+    async def submit(self, request: DeliveryRequest) -> None:
+        """
+        Queue a request (waits while the channel queue is full).
+        
+        Raises:
+            ValueError: If no backend is registered for the request's channel
+        """
+        if request.channel not in self._queues:
+            raise ValueError(f"No backend for channel '{request.channel}', expected one of {tuple(self.backends)}")
+        if not request.request_id:
+            request.request_id = f"alert-{next(self._ids)}"
+        await self._queues[request.channel].put((request, time.monotonic()))
+    
+    async def join(self) -> None:
+        """Wait until every submitted request has a receipt"""
+        await asyncio.gather(*(queue.join() for queue in self._queues.values()))
+    
+    async def stop(self) -> None:
+        """Cancel the worker pools (pending requests are dropped)"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queues = {}
+    
+    async def __aenter__(self) -> "AlertDispatcher":
+        await self.start()
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
+    
+    async def dispatch(self, requests: Iterable[DeliveryRequest]) -> List[DeliveryReceipt]:
+        """
+        Deliver a batch of requests and return their receipts.
+        
+        Args:
+            requests: Delivery requests (any mix of channels)
+        
+        Returns:
+            Receipts for this batch, in completion order
+        """
+        first = len(self.receipts)
+        owns_workers = not self._workers
+        await self.start()
+        try:
+            for request in requests:
+                await self.submit(request)
+            await self.join()
+        finally:
+            if owns_workers:
+                await self.stop()
+        return self.receipts[first:]
+    
+    def _backoff(self, config: ChannelConfig, attempt: int) -> float:
+        """Full-jitter exponential backoff before attempt + 1"""
+        return random.uniform(0, min(config.backoff_max_s, config.backoff_base_s * 2 ** (attempt - 1)))
+    
+    async def _worker(self, channel: str, queue: asyncio.Queue) -> None:
+        backend = self.backends[channel]
+        config = self.configs[channel]
+        while True:
+            request, queued_at = await queue.get()
+            try:
+                receipt = await self._deliver(backend, config, request, queued_at)
+                self.receipts.append(receipt)
+                if self.on_receipt is not None:
+                    try:
+                        self.on_receipt(receipt)
+                    except Exception as e:
+                        self.callback_errors.append(e)
+            finally:
+                queue.task_done()
+    
+    async def _deliver(
+        self,
+        backend: DeliveryBackend,
+        config: ChannelConfig,
+        request: DeliveryRequest,
+        queued_at: float
+    ) -> DeliveryReceipt:
+        error = None
+        for attempt in range(1, config.max_attempts + 1):
+            try:
+                gateway_id = await asyncio.wait_for(backend.send(request), timeout=config.timeout_s)
+                return DeliveryReceipt(
+                    request_id=request.request_id,
+                    channel=request.channel,
+                    recipient=request.recipient,
+                    status="delivered",
+                    attempts=attempt,
+                    gateway_id=gateway_id,
+                    queued_at=queued_at,
+                    completed_at=time.monotonic()
+                )
+            except asyncio.TimeoutError:
+                error, retryable = f"timed out after {config.timeout_s}s", True
+            except DeliveryError as e:
+                error, retryable = str(e), e.retryable
+            except Exception as e:
+                # Backend bugs and raw network errors (e.g. ConnectionResetError)
+                # must still end in a receipt, never in a dead worker
+                error, retryable = f"{type(e).__name__}: {e}", True
+            
+            if not retryable or attempt == config.max_attempts:
+                break
+            await asyncio.sleep(self._backoff(config, attempt))
+        
+        return DeliveryReceipt(
+            request_id=request.request_id,
+            channel=request.channel,
+            recipient=request.recipient,
+            status="failed",
+            attempts=attempt,
+            error=error,
+            queued_at=queued_at,
+            completed_at=time.monotonic()
+        )
+
+
+def build_alert_requests(
+    village_name: str,
+    risk_score: float,
+    phone_numbers: Sequence[str],
+    language: str = "English",
+    channels: Optional[Sequence[str]] = None,
+    sms_batch_size: Optional[int] = None
+) -> List[DeliveryRequest]:
+    """
+    Expand one village alert into per-channel delivery requests.
+    
+    SMS and Voice IVR go to every phone number; Community Radio and
+    Emergency Sirens get one broadcast request for the village. With
+    sms_batch_size, SMS numbers sharing the payload are packed into
+    multi-recipient gateway requests instead of one request per number.
+    
+    Args:
+        village_name: Name of village
+        risk_score: Current risk score
+        phone_numbers: Registered mobile numbers in the village
+        language: Alert language
+        channels: Channels to use (default: get_delivery_channels(risk_score))
+        sms_batch_size: Recipients per batched SMS request (None = one request per number)
+    
+    Returns:
+        List of DeliveryRequest (empty if no alert is needed)
+    """
+    alert_level = determine_alert_level(risk_score)
+    if alert_level == "No Alert":
+        return []
+    
+    messages = {
+        "SMS": format_sms_alert(village_name, risk_score, language),
+        "default": generate_alert_message(village_name, risk_score, alert_level, language)
+    }
+    sms_segments = analyze_sms(messages["SMS"]).segments
+    requests = []
+    for channel in channels or get_delivery_channels(risk_score):
+        if channel == "SMS" and sms_batch_size:
+            batches = pack_sms_batches(((str(number), messages["SMS"]) for number in phone_numbers), sms_batch_size)
+            requests.extend(
+                DeliveryRequest(
+                    channel=channel,
+                    recipient=f"{village_name}/SMS/{k}",
+                    message=batch.message,
+                    village=village_name,
+                    alert_level=alert_level,
+                    language=language,
+                    recipients=tuple(batch.recipients),
+                    segments=batch.segments
+                )
+                for k, batch in enumerate(batches, 1)
+            )
+            continue
+        recipients = phone_numbers if channel in PERSONAL_CHANNELS else [f"{village_name}/{channel}"]
+        message = messages.get(channel, messages["default"])
+        requests.extend(
+            DeliveryRequest(
+                channel=channel,
+                recipient=str(recipient),
+                message=message,
+                village=village_name,
+                alert_level=alert_level,
+                language=language,
+                segments=sms_segments if channel == "SMS" else 1
+            )
+            for recipient in recipients
+        )
+    return requests
+
+
+def summarize_receipts(receipts: Sequence[DeliveryReceipt]) -> Dict[str, Dict[str, int]]:
+    """
+    Delivery counts per channel.
+    
+    Returns:
+        Dict channel -> {"delivered", "failed", "attempts"}
+    """
+    summary: Dict[str, Dict[str, int]] = {}
+    for receipt in receipts:
+        counts = summary.setdefault(receipt.channel, {"delivered": 0, "failed": 0, "attempts": 0})
+        counts[receipt.status] += 1
+        counts["attempts"] += receipt.attempts
+    return summary
+
+
+async def deliver_alert_async(
+    village_name: str,
+    risk_score: float,
+    phone_numbers: Sequence[str],
+    backends: Dict[str, DeliveryBackend],
+    language: str = "English",
+    configs: Optional[Dict[str, ChannelConfig]] = None,
+    sms_batch_size: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Dispatch a village alert on all escalation channels and report receipts.
+    
+    The result has the same shape as simulate_alert_delivery, with counts
+    taken from receipts. Use this from async code (e.g. the API server);
+    deliver_alert is the synchronous wrapper.
+    
+    Args:
+        village_name: Name of village
+        risk_score: Current risk score
+        phone_numbers: Registered mobile numbers in the village
+        backends: Backend per channel (channels without a backend are skipped)
+        language: Alert language
+        configs: Per-channel worker pool overrides
+        sms_batch_size: Recipients per batched SMS request (None = one request per number)
+    
+    Returns:
+        Dict with delivery results and the receipts
+    """
+    alert_level = determine_alert_level(risk_score)
+    if alert_level == "No Alert":
+        return {"status": "no_alert_needed", "alert_level": "No Alert"}
+    
+    channels = [channel for channel in get_delivery_channels(risk_score) if channel in backends]
+    requests = build_alert_requests(village_name, risk_score, phone_numbers, language, channels, sms_batch_size)
+    receipts = await AlertDispatcher(backends, configs).dispatch(requests)
+    summary = summarize_receipts(receipts)
+    by_id = {request.request_id: request for request in requests}
+    delivered_numbers = {
+        number
+        for r in receipts if r.delivered and r.channel in PERSONAL_CHANNELS
+        for number in by_id[r.request_id].numbers
+    }
+    
+    return {
+        "status": "delivered" if all(r.delivered for r in receipts) else "partial",
+        "alert_level": alert_level,
+        "channels_used": channels,
+        "sms_message": format_sms_alert(village_name, risk_score, language),
+        "sms_segments": analyze_sms(format_sms_alert(village_name, risk_score, language)).segments,
+        "voice_message": generate_alert_message(village_name, risk_score, alert_level, language),
+        "mobile_numbers_reached": len(delivered_numbers),
+        "channel_summary": summary,
+        "frequency": get_alert_frequency(risk_score),
+        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "language": language,
+        "receipts": receipts
+    }
+
+
+def deliver_alert(
+    village_name: str,
+    risk_score: float,
+    phone_numbers: Sequence[str],
+    backends: Dict[str, DeliveryBackend],
+    language: str = "English",
+    configs: Optional[Dict[str, ChannelConfig]] = None,
+    sms_batch_size: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Synchronous deliver_alert_async (same arguments and result).
+    
+    Runs its own event loop; called from a thread that already runs one, the
+    dispatch runs on a helper thread instead (blocking the caller until done).
+    Inside async code, await deliver_alert_async directly.
+    """
+    coroutine = deliver_alert_async(
+        village_name, risk_score, phone_numbers, backends, language, configs, sms_batch_size
+    )
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coroutine).result()
@@ -10,8 +10,15 @@ This module handles alert generation, escalation, and multi-channel delivery:
 Engineering Principle: Progressive alert escalation with cultural sensitivity
 """
 
-from typing import Dict, List, Tuple
+from typing import Dict, List, Tuple, Any, Optional, Sequence
 from datetime import datetime
+from functools import lru_cache
+from string import Formatter
+
+import numpy as np
+
+from logic.risk_engine import RISK_CATEGORIES, get_risk_category, get_risk_category_codes
+from logic.sms_encoding import TRUNCATION_MARKER, fit_sms
 
 
 class AlertLevel:
@@ -21,6 +28,13 @@ class AlertLevel:
     EVACUATE = "Evacuate"
 
 
+# Alert level names indexed by alert code (0 = No Alert ... 3 = Evacuate)
+ALERT_LEVELS = ("No Alert", AlertLevel.ADVISORY, AlertLevel.WARNING, AlertLevel.EVACUATE)
+
+# Lower bounds for Advisory, Warning and Evacuate (see determine_alert_level)
+ALERT_THRESHOLDS = (40, 60, 75)
+
+
 def determine_alert_level(risk_score: float) -> str:
     """
     Determine appropriate alert level based on risk score.
@@ -49,6 +63,23 @@ def determine_alert_level(risk_score: float) -> str:
         return "No Alert"  # Explicit state for clear system behavior
 
 
+def determine_alert_level_codes(risk_scores: Any) -> np.ndarray:
+    """
+    Vectorized determine_alert_level returning alert codes.
+    
+    Args:
+        risk_scores: Array of risk scores (0-100)
+    
+    Returns:
+        uint8 array indexing ALERT_LEVELS (0 = No Alert ... 3 = Evacuate)
+    """
+    risk_scores = np.asarray(risk_scores, dtype=np.float64)
+    codes = np.zeros(risk_scores.shape, dtype=np.uint8)
+    for threshold in ALERT_THRESHOLDS:
+        codes += risk_scores >= threshold
+    return codes
+
+
 def get_alert_frequency(risk_score: float) -> str:
     """
     Determine alert repetition frequency based on risk level.
@@ -69,6 +100,28 @@ def get_alert_frequency(risk_score: float) -> str:
         return "daily"
 
 
+# Re-alert interval in seconds per alert level (same cadence as get_alert_frequency)
+ALERT_INTERVALS_S = {
+    "No Alert": 24 * 3600,
+    AlertLevel.ADVISORY: 6 * 3600,
+    AlertLevel.WARNING: 2 * 3600,
+    AlertLevel.EVACUATE: 15 * 60
+}
+
+
+def get_alert_interval(risk_score: float) -> int:
+    """
+    Alert repetition interval in seconds (machine form of get_alert_frequency).
+    
+    Args:
+        risk_score: Risk score (0-100)
+    
+    Returns:
+        int: Seconds between repeated alerts
+    """
+    return ALERT_INTERVALS_S[determine_alert_level(risk_score)]
+
+
 def get_delivery_channels(risk_score: float) -> List[str]:
     """
     Determine which communication channels to use based on urgency.
@@ -97,6 +150,87 @@ def get_delivery_channels(risk_score: float) -> List[str]:
         return ["SMS"]
 
 
+# Supported message languages (unknown languages fall back to English)
+ALERT_LANGUAGES = ("English", "Hindi", "Khasi")
+
+# Message templates per language and alert level; {village} and {category}
+# are filled at render time
+ALERT_TEMPLATES = {
+    "English": {
+        AlertLevel.ADVISORY: "⚠️ Landslide Risk Advisory for {village}. Risk Level: {category}. Monitor weather conditions closely.",
+        AlertLevel.WARNING: "🚨 Landslide Warning for {village}! Risk Level: {category}. Prepare for possible evacuation.",
+        AlertLevel.EVACUATE: "IMMEDIATE EVACUATION REQUIRED for {village}. Risk Level: {category}. Move to designated shelters now."
+    },
+    "Hindi": {
+        AlertLevel.ADVISORY: "⚠️ {village} के लिए भूस्खलन जोखिम सलाह। जोखिम स्तर: {category}। मौसम की स्थिति की निगरानी करें।",
+        AlertLevel.WARNING: "🚨 {village} के लिए भूस्खलन चेतावनी! जोखिम स्तर: {category}। संभावित निकासी के लिए तैयार रहें।",
+        AlertLevel.EVACUATE: "तत्काल निकासी आवश्यक {village}। जोखिम स्तर: {category}। अभी सुरक्षित आश्रयों में जाएं।"
+    },
+    "Khasi": {
+        AlertLevel.ADVISORY: "⚠️ Ka jingsngewbha ha {village}. Jingialang: {category}. Khlain ruh ka bynta.",
+        AlertLevel.WARNING: "🚨 Ka jingsngewbha kaba bha ha {village}! Jingialang: {category}. Lah bynta sha ka evacuation.",
+        AlertLevel.EVACUATE: "PYRSHAH EVACUATION HA {village}. Jingialang: {category}. Shong da ka jingïaiñ mynta."
+    }
+}
+
+# Distinct (village, category, level, language) messages kept by generate_alert_message
+ALERT_MESSAGE_CACHE_SIZE = 4096
+
+
+class AlertTemplate:
+    """
+    Message template parsed once into literal segments and field names.
+    
+    Rendering joins pre-split segments, with no format-string parsing per message.
+    """
+    
+    __slots__ = ("source", "literals", "fields")
+    
+    def __init__(self, source: str):
+        self.source = source
+        parsed = list(Formatter().parse(source))
+        self.literals = tuple(literal for literal, _, _, _ in parsed)
+        self.fields = tuple(field for _, field, _, _ in parsed if field is not None)
+    
+    def render(self, **values: str) -> str:
+        parts = []
+        for i, literal in enumerate(self.literals):
+            parts.append(literal)
+            if i < len(self.fields):
+                parts.append(values[self.fields[i]])
+        return "".join(parts)
+
+
+# Compiled once at import: (language, alert level) -> AlertTemplate
+_TEMPLATE_REGISTRY = {
+    (language, level): AlertTemplate(template)
+    for language, templates in ALERT_TEMPLATES.items()
+    for level, template in templates.items()
+}
+
+
+def get_alert_template(alert_level: str, language: str = "English") -> Optional[AlertTemplate]:
+    """
+    Compiled template for an alert level and language.
+    
+    Args:
+        alert_level: Advisory/Warning/Evacuate
+        language: Target language (unknown languages fall back to English)
+    
+    Returns:
+        AlertTemplate, or None if the level has no message (e.g. "No Alert")
+    """
+    if language not in ALERT_TEMPLATES:
+        language = "English"
+    return _TEMPLATE_REGISTRY.get((language, alert_level))
+
+
+@lru_cache(maxsize=ALERT_MESSAGE_CACHE_SIZE)
+def _render_alert_message(village_name: str, category: str, alert_level: str, language: str) -> str:
+    template = get_alert_template(alert_level, language)
+    return template.render(village=village_name, category=category) if template else ""
+
+
 def generate_alert_message(
     village_name: str,
     risk_score: float,
@@ -111,6 +245,8 @@ def generate_alert_message(
     - Hindi: Wide regional coverage
     - Khasi: Local tribal language
     
+    Messages are memoized on (village, risk category, alert level, language).
+    
     Args:
         village_name: Name of the village
         risk_score: Risk score (0-100)
@@ -120,28 +256,45 @@ def generate_alert_message(
     Returns:
         str: Formatted alert message
     """
-    from logic.risk_engine import get_risk_category
     category, _ = get_risk_category(risk_score)
+    return _render_alert_message(village_name, category, alert_level, language)
+
+
+def render_alert_messages(
+    village_names: Sequence[str],
+    risk_scores: Any,
+    alert_levels: Optional[Sequence[str]] = None,
+    language: str = "English"
+) -> List[str]:
+    """
+    Render alert messages for many villages (or recipients) in one call.
     
-    messages = {
-        "English": {
-            AlertLevel.ADVISORY: f"⚠️ Landslide Risk Advisory for {village_name}. Risk Level: {category}. Monitor weather conditions closely.",
-            AlertLevel.WARNING: f"🚨 Landslide Warning for {village_name}! Risk Level: {category}. Prepare for possible evacuation.",
-            AlertLevel.EVACUATE: f"IMMEDIATE EVACUATION REQUIRED for {village_name}. Risk Level: {category}. Move to designated shelters now."
-        },
-        "Hindi": {
-            AlertLevel.ADVISORY: f"⚠️ {village_name} के लिए भूस्खलन जोखिम सलाह। जोखिम स्तर: {category}। मौसम की स्थिति की निगरानी करें।",
-            AlertLevel.WARNING: f"🚨 {village_name} के लिए भूस्खलन चेतावनी! जोखिम स्तर: {category}। संभावित निकासी के लिए तैयार रहें।",
-            AlertLevel.EVACUATE: f"तत्काल निकासी आवश्यक {village_name}। जोखिम स्तर: {category}। अभी सुरक्षित आश्रयों में जाएं।"
-        },
-        "Khasi": {
-            AlertLevel.ADVISORY: f"⚠️ Ka jingsngewbha ha {village_name}. Jingialang: {category}. Khlain ruh ka bynta.",
-            AlertLevel.WARNING: f"🚨 Ka jingsngewbha kaba bha ha {village_name}! Jingialang: {category}. Lah bynta sha ka evacuation.",
-            AlertLevel.EVACUATE: f"PYRSHAH EVACUATION HA {village_name}. Jingialang: {category}. Shong da ka jingïaiñ mynta."
-        }
-    }
+    Risk categories and alert levels are computed vectorized; each distinct
+    (village, category, level) is rendered once, so a campaign to 100k
+    recipients across a few hundred villages renders a few hundred strings.
     
-    return messages.get(language, messages["English"]).get(alert_level, "")
+    Args:
+        village_names: Village name per message
+        risk_scores: Risk score per message (0-100)
+        alert_levels: Alert level per message (default: from the risk score)
+        language: Target language
+    
+    Returns:
+        List of messages, "" where no alert is needed
+    """
+    category_codes = get_risk_category_codes(risk_scores).tolist()
+    if alert_levels is None:
+        alert_levels = [ALERT_LEVELS[code] for code in determine_alert_level_codes(risk_scores).tolist()]
+    
+    rendered: Dict[Tuple[str, int, str], str] = {}
+    messages = []
+    for village_name, code, alert_level in zip(village_names, category_codes, alert_levels):
+        key = (village_name, code, alert_level)
+        message = rendered.get(key)
+        if message is None:
+            message = rendered[key] = _render_alert_message(village_name, RISK_CATEGORIES[code], alert_level, language)
+        messages.append(message)
+    return messages
 
 
 def create_alert_escalation_matrix() -> List[Dict[str, str]]:
@@ -223,16 +376,24 @@ def format_sms_alert(
     village_name: str,
     risk_score: float,
     language: str = "English",
-    max_length: int = 160
+    max_length: Optional[int] = None,
+    max_segments: Optional[int] = None
 ) -> str:
     """
-    Format alert for SMS delivery (160 character limit).
+    Format alert for SMS delivery.
+    
+    By default the full message is returned and sent as a concatenated SMS
+    when it needs more than one segment, so safety instructions are never
+    cut. Length is counted as the network bills it: 160 GSM-7 characters per
+    SMS, but only 70 when the text needs UCS-2 (Hindi, emoji, most Khasi
+    diacritics), with 153/67 per part once the message is concatenated.
     
     Args:
         village_name: Name of village
         risk_score: Current risk score
         language: Target language
-        max_length: Maximum SMS length
+        max_length: Optional hard cap in characters (truncated with "...")
+        max_segments: Optional segment budget (None = no cap, full multipart delivery)
     
     Returns:
         str: Formatted SMS message (empty if no alert needed)
@@ -241,13 +402,12 @@ def format_sms_alert(
     if alert_level == "No Alert":
         return ""
     
-    full_message = generate_alert_message(village_name, risk_score, alert_level, language)
-    
-    # Truncate if needed (though our messages are designed to fit)
-    if len(full_message) > max_length:
-        return full_message[:max_length-3] + "..."
-    
-    return full_message
+    message = generate_alert_message(village_name, risk_score, alert_level, language)
+    if max_segments is not None:
+        message = fit_sms(message, max_segments)
+    if max_length is not None and len(message) > max_length:
+        message = message[:max_length - len(TRUNCATION_MARKER)] + TRUNCATION_MARKER
+    return message
 
 
 def simulate_alert_delivery(
@@ -257,7 +417,8 @@ def simulate_alert_delivery(
     language: str = "English"
 ) -> Dict[str, any]:
     """
-    Simulate alert delivery across channels.
+    Simulate alert delivery across channels (estimates reach, sends nothing;
+    see alert_dispatcher.deliver_alert for real delivery with receipts).
     
     Args:
         village_name: Name of village
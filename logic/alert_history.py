@@ -0,0 +1,264 @@
+"""
+NER-Aegis AI - Alert History
+
+This module keeps an append-only log of every alert issued:
+- SQLite in WAL mode (readers never block the writer)
+- Indexes on (district, time), (village, time) and (level, time)
+- Batched writes: records are buffered and inserted in one transaction
+- Queries such as "alerts in the last N hours for a district", fast with
+  millions of rows because every query is an index range scan
+
+Engineering Principle: Every alert leaves an audit trail
+"""
+
+from typing import Dict, List, Any, Optional, Sequence
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+import sqlite3
+import threading
+import time
+
+from logic.alert_engine import ALERT_LEVELS
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS alerts (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    village TEXT NOT NULL,
+    district TEXT NOT NULL,
+    level INTEGER NOT NULL,
+    risk_score REAL NOT NULL,
+    channels TEXT NOT NULL,
+    households_affected INTEGER NOT NULL,
+    population_affected INTEGER NOT NULL,
+    delivery_count INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    message TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS alerts_district_ts ON alerts (district, ts);
+CREATE INDEX IF NOT EXISTS alerts_village_ts ON alerts (village, ts);
+CREATE INDEX IF NOT EXISTS alerts_level_ts ON alerts (level, ts);
+CREATE INDEX IF NOT EXISTS alerts_ts ON alerts (ts);
+"""
+
+_COLUMNS = (
+    "ts", "village", "district", "level", "risk_score", "channels",
+    "households_affected", "population_affected", "delivery_count", "status", "message"
+)
+
+_INSERT = f"INSERT INTO alerts ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})"
+
+
+@dataclass
+class AlertRecord:
+    """One issued alert (the fields of generate_alert_metadata plus district and message)"""
+    village: str
+    alert_level: str
+    risk_score: float
+    timestamp: float = field(default_factory=time.time)  # epoch seconds
+    district: str = ""
+    channels: List[str] = field(default_factory=list)
+    households_affected: int = 0
+    population_affected: int = 0
+    delivery_count: int = 0
+    status: str = "active"
+    message: str = ""
+    
+    @classmethod
+    def from_metadata(cls, metadata: Dict[str, Any], district: str = "", message: str = "") -> "AlertRecord":
+        """Build a record from a generate_alert_metadata dict"""
+        return cls(
+            village=metadata["village"],
+            alert_level=metadata["alert_level"],
+            risk_score=float(metadata["risk_score"]),
+            timestamp=datetime.fromisoformat(metadata["timestamp"]).timestamp(),
+            district=district,
+            channels=list(metadata.get("channels", [])),
+            households_affected=int(metadata.get("households_affected", 0)),
+            population_affected=int(metadata.get("population_affected", 0)),
+            delivery_count=int(metadata.get("delivery_count", 0)),
+            status=metadata.get("status", "active"),
+            message=message
+        )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict with an ISO timestamp (for tables and JSON)"""
+        record = asdict(self)
+        record["timestamp"] = datetime.fromtimestamp(self.timestamp).isoformat(timespec="seconds")
+        return record
+    
+    def _row(self) -> tuple:
+        return (
+            self.timestamp, self.village, self.district, ALERT_LEVELS.index(self.alert_level),
+            self.risk_score, ",".join(self.channels), self.households_affected,
+            self.population_affected, self.delivery_count, self.status, self.message
+        )
+
+
+def _record(row: sqlite3.Row) -> AlertRecord:
+    return AlertRecord(
+        village=row["village"],
+        alert_level=ALERT_LEVELS[row["level"]],
+        risk_score=row["risk_score"],
+        timestamp=row["ts"],
+        district=row["district"],
+        channels=row["channels"].split(",") if row["channels"] else [],
+        households_affected=row["households_affected"],
+        population_affected=row["population_affected"],
+        delivery_count=row["delivery_count"],
+        status=row["status"],
+        message=row["message"]
+    )
+
+
+class AlertHistoryStore:
+    """
+    Append-only alert log backed by SQLite (WAL).
+    
+    Appends are buffered and written batch_size at a time; every query
+    flushes first, so readers always see their own writes. Safe to share
+    between threads (Streamlit sessions).
+    """
+    
+    def __init__(self, path: str = ":memory:", batch_size: int = 500):
+        """
+        Args:
+            path: Database file (":memory:" for a throwaway store)
+            batch_size: Buffered records per write transaction
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self._buffer: List[tuple] = []
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")  # durable at checkpoints; safe with WAL
+        self._conn.execute("PRAGMA cache_size=-65536")  # 64 MB page cache keeps index pages hot
+        self._conn.executescript(_SCHEMA)
+    
+    def __enter__(self) -> "AlertHistoryStore":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    def __len__(self) -> int:
+        self.flush()
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM alerts").fetchone()[0]
+    
+    def append(self, record: AlertRecord) -> None:
+        """Buffer one record (written once batch_size records are pending)"""
+        with self._lock:
+            self._buffer.append(record._row())
+            if len(self._buffer) < self.batch_size:
+                return
+        self.flush()
+    
+    def extend(self, records: Sequence[AlertRecord]) -> None:
+        """Append many records"""
+        with self._lock:
+            self._buffer.extend(record._row() for record in records)
+            if len(self._buffer) < self.batch_size:
+                return
+        self.flush()
+    
+    def flush(self) -> int:
+        """
+        Write all buffered records in one transaction.
+        
+        Returns:
+            Number of records written
+        """
+        with self._lock:
+            pending, self._buffer = self._buffer, []
+            if pending:
+                with self._conn:
+                    self._conn.executemany(_INSERT, pending)
+            return len(pending)
+    
+    def close(self) -> None:
+        """Flush and close the database"""
+        self.flush()
+        self._conn.close()
+    
+    def _query(self, where: str, params: list, min_level: Optional[str], limit: Optional[int]) -> List[AlertRecord]:
+        if min_level is not None:
+            # Level codes are contiguous, so "at least" is an IN list the planner can use
+            codes = list(range(ALERT_LEVELS.index(min_level), len(ALERT_LEVELS)))
+            where += f" AND level IN ({', '.join('?' * len(codes))})"
+            params = params + codes
+        sql = f"SELECT * FROM alerts WHERE {where} ORDER BY ts DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params = params + [limit]
+        self.flush()
+        with self._lock:
+            return [_record(row) for row in self._conn.execute(sql, params)]
+    
+    def recent_by_district(
+        self,
+        district: str,
+        hours: float = 24,
+        now: Optional[float] = None,
+        min_level: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[AlertRecord]:
+        """
+        Alerts for a district in the last N hours, newest first.
+        
+        Args:
+            district: District name
+            hours: Look-back window
+            now: End of the window (epoch seconds, default time.time())
+            min_level: Only alerts at or above this level (e.g. "Warning")
+            limit: Maximum records returned
+        
+        Returns:
+            List of AlertRecord
+        """
+        now = time.time() if now is None else now
+        return self._query("district = ? AND ts >= ? AND ts <= ?", [district, now - hours * 3600, now], min_level, limit)
+    
+    def recent_by_village(
+        self,
+        village: str,
+        hours: float = 24,
+        now: Optional[float] = None,
+        limit: Optional[int] = None
+    ) -> List[AlertRecord]:
+        """Alerts for a village in the last N hours, newest first"""
+        now = time.time() if now is None else now
+        return self._query("village = ? AND ts >= ? AND ts <= ?", [village, now - hours * 3600, now], None, limit)
+    
+    def recent(
+        self,
+        hours: float = 24,
+        now: Optional[float] = None,
+        min_level: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[AlertRecord]:
+        """Alerts for all districts in the last N hours, newest first"""
+        now = time.time() if now is None else now
+        return self._query("ts >= ? AND ts <= ?", [now - hours * 3600, now], min_level, limit)
+    
+    def counts_by_district(self, hours: float = 24, now: Optional[float] = None) -> Dict[str, Dict[str, int]]:
+        """
+        Alert counts per district and level in the last N hours.
+        
+        Returns:
+            Dict district -> {alert level: count}
+        """
+        now = time.time() if now is None else now
+        self.flush()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT district, level, COUNT(*) FROM alerts WHERE ts >= ? AND ts <= ? GROUP BY district, level",
+                (now - hours * 3600, now)
+            ).fetchall()
+        counts: Dict[str, Dict[str, int]] = {}
+        for district, level, count in rows:
+            counts.setdefault(district, {})[ALERT_LEVELS[level]] = count
+        return counts
@@ -0,0 +1,229 @@
+"""
+NER-Aegis AI - Alert Scheduler
+
+This module decides when each village is (re-)alerted:
+- Alert frequency turned into real intervals (ALERT_INTERVALS_S)
+- Per-village, per-level last-sent state
+- Duplicate suppression: flapping between levels never re-sends a level
+  inside its own interval
+- Re-alerts fired from a heap keyed by due time, O(log n) per alert
+
+Engineering Principle: Repeat alerts on a cadence people can trust, never spam
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Any
+from dataclasses import dataclass, field
+import heapq
+import itertools
+import threading
+import time
+
+from logic.alert_engine import ALERT_LEVELS, ALERT_INTERVALS_S, determine_alert_level
+
+
+ALERT_REASONS = ("initial", "escalation", "re-alert")
+
+
+@dataclass
+class ScheduledAlert:
+    """An alert the scheduler says is due now"""
+    village: str
+    alert_level: str
+    risk_score: float
+    due_at: float  # scheduled time (epoch seconds)
+    reason: str  # one of ALERT_REASONS
+
+
+@dataclass
+class _VillageSchedule:
+    alert_level: str = "No Alert"
+    risk_score: float = 0.0
+    last_sent: Dict[str, float] = field(default_factory=dict)  # alert level -> time sent
+    due_at: Optional[float] = None  # next alert (None = not scheduled)
+    reason: str = "initial"  # reason reported when due_at fires
+    generation: int = 0  # bumped on every reschedule; older heap entries are stale
+
+
+class AlertScheduler:
+    """
+    Heap-based alert scheduler for many villages.
+    
+    Feed it risk updates with update(); call pop_due(now) on every tick to
+    get the alerts to send. An escalation is due immediately; a same-level
+    update is a duplicate and changes nothing; a de-escalation keeps the
+    cadence at the new level's interval.
+    
+    Thread-safe: one scheduler can be shared by every session of the app.
+    """
+    
+    def __init__(self, intervals: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            intervals: Seconds between alerts per level (default ALERT_INTERVALS_S)
+        """
+        self.intervals = dict(ALERT_INTERVALS_S if intervals is None else intervals)
+        self._villages: Dict[str, _VillageSchedule] = {}
+        self._heap: List[tuple] = []  # (due_at, seq, village, generation)
+        self._seq = itertools.count()
+        self._stale = 0
+        self.suppressed = 0  # updates that would have re-sent a level too early
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        """Villages with an active (non "No Alert") schedule"""
+        with self._lock:
+            return sum(1 for state in self._villages.values() if state.due_at is not None)
+    
+    def _schedule(self, village: str, state: _VillageSchedule, due_at: Optional[float]) -> None:
+        if state.due_at is not None:
+            self._stale += 1  # the entry already in the heap is superseded
+        state.generation += 1
+        state.due_at = due_at
+        if due_at is not None:
+            heapq.heappush(self._heap, (due_at, next(self._seq), village, state.generation))
+        # Drop stale entries once they dominate the heap
+        if self._stale > 64 and self._stale > len(self._heap) // 2:
+            self._heap = [
+                entry for entry in self._heap
+                if self._villages[entry[2]].generation == entry[3]
+            ]
+            heapq.heapify(self._heap)
+            self._stale = 0
+    
+    def update(self, village: str, risk_score: float, now: Optional[float] = None) -> Optional[float]:
+        """
+        Record a new risk score for a village.
+        
+        Args:
+            village: Village name
+            risk_score: Current risk score
+            now: Current time (epoch seconds, default time.time())
+        
+        Returns:
+            Time the village's next alert is due, or None if no alert is needed
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            return self._update(village, risk_score, now)
+    
+    def _update(self, village: str, risk_score: float, now: float) -> Optional[float]:
+        level = determine_alert_level(risk_score)
+        state = self._villages.setdefault(village, _VillageSchedule())
+        previous = state.alert_level
+        state.risk_score = risk_score
+        
+        if level == previous:
+            return state.due_at
+        state.alert_level = level
+        if level == "No Alert":
+            self._schedule(village, state, None)
+            return None
+        
+        interval = self.intervals[level]
+        last = state.last_sent.get(level)
+        if last is not None and now - last < interval:
+            self.suppressed += 1
+            due_at = last + interval  # same level sent recently: keep its cadence
+            state.reason = "re-alert"
+        elif ALERT_LEVELS.index(level) > ALERT_LEVELS.index(previous):
+            due_at = now
+            state.reason = "escalation" if state.last_sent else "initial"
+        else:
+            due_at = max(state.last_sent.values(), default=now) + interval
+            state.reason = "re-alert"
+        self._schedule(village, state, due_at)
+        return due_at
+    
+    def update_many(self, villages: Sequence[str], risk_scores: Sequence[float], now: Optional[float] = None) -> None:
+        """update() for many villages at the same time"""
+        now = time.time() if now is None else now
+        with self._lock:
+            for village, risk_score in zip(villages, risk_scores):
+                self._update(str(village), float(risk_score), now)
+    
+    def restore_sent(self, records: Iterable[Any]) -> None:
+        """
+        Seed per-level last-sent times from alerts already issued (e.g. after a restart).
+        
+        Args:
+            records: AlertRecord-like objects (village, alert_level, timestamp),
+                such as AlertHistoryStore.recent(hours=...)
+        """
+        with self._lock:
+            for record in records:
+                state = self._villages.setdefault(record.village, _VillageSchedule())
+                sent = state.last_sent.get(record.alert_level)
+                if sent is None or record.timestamp > sent:
+                    state.last_sent[record.alert_level] = record.timestamp
+    
+    def apply_changes(self, change_set: Any, now: Optional[float] = None) -> None:
+        """
+        Feed an IncrementalRiskState change set (only alert-level moves matter).
+        
+        Args:
+            change_set: RiskChangeSet from IncrementalRiskState.apply_update
+            now: Current time (epoch seconds)
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            for change in change_set.alert_changes:
+                self._update(change.village, change.new_score, now)
+    
+    def cancel(self, village: str) -> None:
+        """Stop alerting a village (its last-sent history is kept)"""
+        with self._lock:
+            state = self._villages.get(village)
+            if state is not None and state.due_at is not None:
+                state.alert_level = "No Alert"
+                self._schedule(village, state, None)
+    
+    def _is_current(self, entry: tuple) -> bool:
+        return self._villages[entry[2]].generation == entry[3]
+    
+    def next_due(self) -> Optional[float]:
+        """Earliest due time over all villages (None if nothing is scheduled)"""
+        with self._lock:
+            while self._heap and not self._is_current(self._heap[0]):
+                heapq.heappop(self._heap)
+                self._stale -= 1
+            return self._heap[0][0] if self._heap else None
+    
+    def next_due_for(self, village: str) -> Optional[float]:
+        """Due time of a village's next alert (None if not scheduled)"""
+        with self._lock:
+            state = self._villages.get(village)
+            return None if state is None else state.due_at
+    
+    def pop_due(self, now: Optional[float] = None) -> List[ScheduledAlert]:
+        """
+        Alerts due at or before now, marking them sent and scheduling their repeats.
+        
+        Args:
+            now: Current time (epoch seconds, default time.time())
+        
+        Returns:
+            List of ScheduledAlert in due-time order
+        """
+        now = time.time() if now is None else now
+        alerts = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                due_at, _, village, generation = heapq.heappop(self._heap)
+                state = self._villages[village]
+                if generation != state.generation:
+                    self._stale -= 1
+                    continue
+                
+                level = state.alert_level
+                alerts.append(ScheduledAlert(
+                    village=village,
+                    alert_level=level,
+                    risk_score=state.risk_score,
+                    due_at=due_at,
+                    reason=state.reason
+                ))
+                state.last_sent[level] = now
+                state.reason = "re-alert"
+                state.due_at = now + self.intervals[level]
+                heapq.heappush(self._heap, (state.due_at, next(self._seq), village, generation))
+        return alerts
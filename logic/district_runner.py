@@ -0,0 +1,310 @@
+"""
+NER-Aegis AI - District Batch Runner
+
+This module runs a state-wide assessment across CPU cores:
+- Villages and households partitioned by district (contiguous ranges)
+- Inputs copied once into shared memory; worker processes attach to them
+  instead of receiving pickled arrays
+- Each task scores its district's villages, prioritizes a chunk of its
+  households and writes priorities / phases straight into shared outputs
+- Only small per-district summaries travel back and are merged
+
+Engineering Principle: State-wide answers in the time of one district
+"""
+
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import multiprocessing
+import os
+import time
+
+import numpy as np
+
+from logic.risk_engine import _factor_columns, compute_risk_scores
+from logic.alert_engine import ALERT_LEVELS, determine_alert_level_codes
+from logic.evacuation_planner import (
+    EVACUATION_PHASES,
+    calculate_household_priorities,
+    assign_evacuation_phases
+)
+
+
+DEFAULT_CHUNK_SIZE = 500_000  # households per task; big districts are split for load balancing
+
+
+@dataclass
+class DistrictSummary:
+    """Merged results for one district (or, via merge, several)"""
+    district: str
+    villages: int = 0
+    households: int = 0
+    people: int = 0
+    max_risk_score: float = 0.0
+    villages_per_alert_level: np.ndarray = field(default_factory=lambda: np.zeros(len(ALERT_LEVELS), dtype=np.int64))
+    phase_households: np.ndarray = field(default_factory=lambda: np.zeros(len(EVACUATION_PHASES), dtype=np.int64))
+    phase_people: np.ndarray = field(default_factory=lambda: np.zeros(len(EVACUATION_PHASES), dtype=np.int64))
+    
+    def merge(self, other: "DistrictSummary", district: Optional[str] = None) -> "DistrictSummary":
+        """Combined summary (counts add, max risk is the larger)"""
+        return DistrictSummary(
+            district=district or self.district,
+            villages=self.villages + other.villages,
+            households=self.households + other.households,
+            people=self.people + other.people,
+            max_risk_score=max(self.max_risk_score, other.max_risk_score),
+            villages_per_alert_level=self.villages_per_alert_level + other.villages_per_alert_level,
+            phase_households=self.phase_households + other.phase_households,
+            phase_people=self.phase_people + other.phase_people
+        )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Flat dict (for tables and JSON)"""
+        record = {
+            "district": self.district,
+            "villages": self.villages,
+            "households": self.households,
+            "people": self.people,
+            "max_risk_score": round(self.max_risk_score, 1)
+        }
+        record.update({f"villages_{level}": int(n) for level, n in zip(ALERT_LEVELS, self.villages_per_alert_level)})
+        record.update({f"households_{phase}": int(n) for phase, n in zip(EVACUATION_PHASES, self.phase_households)})
+        return record
+
+
+@dataclass
+class StateRunResult:
+    """Output of run_districts"""
+    districts: Dict[str, DistrictSummary]
+    village_scores: np.ndarray  # float64 per village (input order)
+    village_alert_codes: np.ndarray  # uint8 per village, index into ALERT_LEVELS
+    household_priorities: np.ndarray  # float64 per household (input order)
+    household_phases: np.ndarray  # uint8 per household, index into EVACUATION_PHASES
+    workers: int
+    tasks: int
+    elapsed_s: float
+    
+    @property
+    def total(self) -> DistrictSummary:
+        """All districts merged"""
+        merged = DistrictSummary("All districts")
+        for summary in self.districts.values():
+            merged = merged.merge(summary, "All districts")
+        return merged
+
+
+# Shared-memory plumbing
+# A block is described by (name, shape, dtype string); workers attach once, in
+# the pool initializer, and keep NumPy views in _WORKER_ARRAYS.
+
+_WORKER_ARRAYS: Dict[str, np.ndarray] = {}
+_WORKER_BLOCKS: List[shared_memory.SharedMemory] = []
+
+
+def _share(array: np.ndarray, order: Optional[np.ndarray] = None) -> Tuple[shared_memory.SharedMemory, Tuple[str, tuple, str]]:
+    """Copy an array (gathered by order, if given) into a new shared-memory block"""
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    view = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+    if order is None:
+        view[...] = array
+    else:
+        np.take(array, order, axis=0, out=view)
+    return block, (block.name, array.shape, array.dtype.str)
+
+
+def _attach(descriptor: Tuple[str, tuple, str]) -> Tuple[shared_memory.SharedMemory, np.ndarray]:
+    name, shape, dtype = descriptor
+    block = shared_memory.SharedMemory(name=name)
+    return block, np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+
+
+def _init_worker(descriptors: Dict[str, Tuple[str, tuple, str]]) -> None:
+    for key, descriptor in descriptors.items():
+        block, array = _attach(descriptor)
+        _WORKER_BLOCKS.append(block)
+        _WORKER_ARRAYS[key] = array
+
+
+def _run_task(task: Tuple[str, int, int, int, int, bool], arrays: Optional[Dict[str, np.ndarray]] = None) -> DistrictSummary:
+    """
+    Score one district's villages and prioritize one chunk of its households.
+    
+    Args:
+        task: (district, start, stop into district_villages, household start, household stop,
+               first chunk of the district?); households are grouped by district
+        arrays: Input/output arrays (default: the worker's shared-memory views)
+    
+    Returns:
+        DistrictSummary for the chunk (village counts only in the first chunk)
+    """
+    arrays = _WORKER_ARRAYS if arrays is None else arrays
+    district, v0, v1, h0, h1, first = task
+    
+    villages = arrays["district_villages"][v0:v1]
+    scores = compute_risk_scores(arrays["factors"][villages], with_contributions=False).scores
+    summary = DistrictSummary(district)
+    if first:
+        alert_codes = determine_alert_level_codes(scores)
+        arrays["village_scores"][villages] = scores
+        arrays["village_alert_codes"][villages] = alert_codes
+        summary.villages = v1 - v0
+        summary.max_risk_score = float(scores.max()) if v1 > v0 else 0.0
+        summary.villages_per_alert_level = np.bincount(alert_codes, minlength=len(ALERT_LEVELS)).astype(np.int64)
+    
+    if h1 > h0:
+        # Village risk lookup by global village index (only this district's entries are read)
+        village_risk = np.zeros(len(arrays["factors"]))
+        village_risk[villages] = scores
+        priorities = calculate_household_priorities(
+            arrays["distance_to_slope"][h0:h1],
+            arrays["drainage_code"][h0:h1],
+            arrays["access_code"][h0:h1],
+            village_risk[arrays["household_village"][h0:h1]]
+        )
+        phases = assign_evacuation_phases(priorities)
+        occupants = arrays["occupants"][h0:h1]
+        arrays["priorities"][h0:h1] = priorities
+        arrays["phases"][h0:h1] = phases
+        summary.households = h1 - h0
+        summary.people = int(occupants.sum())
+        summary.phase_households = np.bincount(phases, minlength=len(EVACUATION_PHASES)).astype(np.int64)
+        summary.phase_people = np.bincount(phases, weights=occupants, minlength=len(EVACUATION_PHASES)).astype(np.int64)
+    return summary
+
+
+def _bounds(codes: np.ndarray, n_districts: int) -> np.ndarray:
+    """Start of each district's range in code-grouped order, plus the end"""
+    return np.concatenate([[0], np.cumsum(np.bincount(codes, minlength=n_districts))])
+
+
+def _plan_tasks(
+    districts: Sequence[str],
+    village_bounds: np.ndarray,
+    household_bounds: np.ndarray,
+    chunk_size: int
+) -> List[Tuple[str, int, int, int, int, bool]]:
+    """District ranges split into household chunks, largest first (better packing)"""
+    tasks = []
+    for d, district in enumerate(districts):
+        v0, v1 = int(village_bounds[d]), int(village_bounds[d + 1])
+        h0, h1 = int(household_bounds[d]), int(household_bounds[d + 1])
+        starts = range(h0, h1, chunk_size) if h1 > h0 else [h0]
+        for i, start in enumerate(starts):
+            tasks.append((district, v0, v1, start, min(start + chunk_size, h1), i == 0))
+    return sorted(tasks, key=lambda task: task[4] - task[3], reverse=True)
+
+
+def run_districts(
+    village_districts: Sequence[str],
+    village_factors: Any,
+    household_village: Any,
+    distance_to_slope: Any,
+    drainage_code: Any,
+    access_code: Any,
+    occupants: Any,
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    start_method: Optional[str] = None
+) -> StateRunResult:
+    """
+    State-wide risk scoring, household prioritization and evacuation statistics.
+    
+    Households already stored district by district are used as they are;
+    otherwise they are grouped once (a radix sort on district codes) while
+    being copied into shared memory.
+    
+    Args:
+        village_districts: District of each village
+        village_factors: DataFrame/mapping with RISK_FACTORS columns, or (n_villages, 5) array
+        household_village: Village index of each household
+        distance_to_slope, drainage_code, access_code, occupants: Household columns
+            (as in HouseholdArrays)
+        workers: Worker processes (default: CPU count; 1 runs in-process, no pool)
+        chunk_size: Maximum households per task
+        start_method: Multiprocessing start method ("spawn", "forkserver", "fork";
+            default: the platform's). Prefer "spawn" from threaded hosts such as Streamlit
+    
+    Returns:
+        StateRunResult with per-district summaries and per-village / per-household outputs
+    """
+    started = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    factors = np.column_stack([np.atleast_1d(c) for c in _factor_columns(village_factors)])
+    household_village = np.asarray(household_village, dtype=np.int64)
+    n_villages, n_households = len(factors), len(household_village)
+    if len(village_districts) != n_villages:
+        raise ValueError("village_districts and village_factors must have one entry per village")
+    
+    # Partition: contiguous village and household ranges per district
+    districts, village_codes = np.unique(np.asarray(village_districts, dtype=str), return_inverse=True)
+    village_codes = village_codes.astype(np.min_scalar_type(len(districts)))
+    household_codes = village_codes[household_village]
+    grouped = n_households < 2 or bool(np.all(household_codes[:-1] <= household_codes[1:]))
+    household_order = None if grouped else np.argsort(household_codes, kind="stable")
+    tasks = _plan_tasks(
+        [str(d) for d in districts],
+        _bounds(village_codes, len(districts)),
+        _bounds(household_codes, len(districts)),
+        chunk_size
+    )
+    
+    inputs = {
+        "factors": factors,
+        "district_villages": np.argsort(village_codes, kind="stable"),
+        "household_village": household_village,
+        "distance_to_slope": np.asarray(distance_to_slope, dtype=np.float64),
+        "drainage_code": np.asarray(drainage_code, dtype=np.uint8),
+        "access_code": np.asarray(access_code, dtype=np.uint8),
+        "occupants": np.asarray(occupants, dtype=np.int64)
+    }
+    household_keys = ("household_village", "distance_to_slope", "drainage_code", "access_code", "occupants")
+    outputs = {
+        "village_scores": np.zeros(n_villages),
+        "village_alert_codes": np.zeros(n_villages, dtype=np.uint8),
+        "priorities": np.zeros(n_households),
+        "phases": np.zeros(n_households, dtype=np.uint8)
+    }
+    
+    if workers == 1:
+        if household_order is not None:
+            inputs.update({key: inputs[key][household_order] for key in household_keys})
+        arrays = {**inputs, **outputs}
+        summaries = [_run_task(task, arrays) for task in tasks]
+    else:
+        blocks, descriptors = {}, {}
+        try:
+            for key, array in {**inputs, **outputs}.items():
+                blocks[key], descriptors[key] = _share(array, household_order if key in household_keys else None)
+            context = multiprocessing.get_context(start_method)
+            with ProcessPoolExecutor(workers, context, initializer=_init_worker, initargs=(descriptors,)) as pool:
+                summaries = list(pool.map(_run_task, tasks))
+            for key, output in outputs.items():
+                output[...] = np.ndarray(output.shape, dtype=output.dtype, buffer=blocks[key].buf)
+        finally:
+            for block in blocks.values():
+                block.close()
+                block.unlink()
+        arrays = outputs
+    
+    merged: Dict[str, DistrictSummary] = {str(d): DistrictSummary(str(d)) for d in districts}
+    for summary in summaries:
+        merged[summary.district] = merged[summary.district].merge(summary)
+    
+    priorities, phases = arrays["priorities"], arrays["phases"]
+    if household_order is not None:
+        # Back to input order
+        priorities, phases = np.empty_like(priorities), np.empty_like(phases)
+        priorities[household_order] = arrays["priorities"]
+        phases[household_order] = arrays["phases"]
+    
+    return StateRunResult(
+        districts=merged,
+        village_scores=arrays["village_scores"],
+        village_alert_codes=arrays["village_alert_codes"],
+        household_priorities=priorities,
+        household_phases=phases,
+        workers=workers,
+        tasks=len(tasks),
+        elapsed_s=time.perf_counter() - started
+    )
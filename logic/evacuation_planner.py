@@ -9,10 +9,15 @@ This module contains the household-level evacuation prioritization logic:
 Engineering Principle: Granular evacuation intelligence, not mass displacement
 """
 
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional, Any, Iterator, Sequence
 from dataclasses import dataclass
+import heapq
 import random
 
+import numpy as np
+
+from logic.routing import RoadGraph
+
 
 @dataclass
 class Household:
@@ -26,6 +31,94 @@ class Household:
     priority_score: float  # 0-100
 
 
+# Categorical household attributes, indexed by their array codes
+DRAINAGE_QUALITIES = ("Poor", "Fair", "Good")
+ROAD_ACCESS_LEVELS = ("Limited", "Moderate", "Good")
+
+# Priority points per category (unknown values score as the middle category)
+DRAINAGE_PRIORITY_SCORES = {"Poor": 30, "Fair": 15, "Good": 5}
+ACCESS_PRIORITY_SCORES = {"Limited": 25, "Moderate": 10, "Good": 0}
+
+# Evacuation phases, indexed by phase code (0 = most urgent)
+EVACUATION_PHASES = (
+    "Phase 1: Immediate (0-30 min)",
+    "Phase 2: High Priority (30-120 min)",
+    "Phase 3: Moderate Priority (2-4 hours)",
+    "Monitoring: Stay Alert"
+)
+
+# Lower priority bounds of Phase 1, 2 and 3 (see generate_evacuation_phases)
+PHASE_THRESHOLDS = (75, 60, 45)
+
+# Array code for values outside DRAINAGE_QUALITIES / ROAD_ACCESS_LEVELS
+UNKNOWN_CATEGORY_CODE = 3
+
+# Priority points indexed by code; the last entry is the unknown-value default
+_DRAINAGE_POINTS = np.array([DRAINAGE_PRIORITY_SCORES[q] for q in DRAINAGE_QUALITIES] + [15], dtype=np.float64)
+_ACCESS_POINTS = np.array([ACCESS_PRIORITY_SCORES[a] for a in ROAD_ACCESS_LEVELS] + [10], dtype=np.float64)
+
+
+@dataclass
+class HouseholdArrays:
+    """Columnar batch of households (struct-of-arrays counterpart of Household)"""
+    id: np.ndarray  # str
+    latitude: np.ndarray  # float64
+    longitude: np.ndarray  # float64
+    distance_to_slope: np.ndarray  # meters
+    drainage_code: np.ndarray  # uint8, index into DRAINAGE_QUALITIES
+    access_code: np.ndarray  # uint8, index into ROAD_ACCESS_LEVELS
+    occupants: np.ndarray  # int64
+    priority_score: np.ndarray  # float64, 0-100
+    
+    def __len__(self) -> int:
+        return len(self.priority_score)
+    
+    @classmethod
+    def from_households(cls, households: List[Household]) -> "HouseholdArrays":
+        """Convert Household objects to columnar form"""
+        return cls(
+            id=np.array([hh.id for hh in households], dtype=str),
+            latitude=np.array([hh.location[0] for hh in households], dtype=np.float64),
+            longitude=np.array([hh.location[1] for hh in households], dtype=np.float64),
+            distance_to_slope=np.array([hh.distance_to_slope for hh in households], dtype=np.float64),
+            drainage_code=encode_drainage_quality([hh.drainage_quality for hh in households]),
+            access_code=encode_road_access([hh.road_access for hh in households]),
+            occupants=np.array([hh.occupants for hh in households], dtype=np.int64),
+            priority_score=np.array([hh.priority_score for hh in households], dtype=np.float64)
+        )
+    
+    def reprioritize(self, village_risk_score: Any) -> np.ndarray:
+        """Recompute priority_score in place for a new village risk; returns it"""
+        self.priority_score = calculate_household_priorities(
+            self.distance_to_slope, self.drainage_code, self.access_code, village_risk_score
+        )
+        return self.priority_score
+    
+    def to_households(self, indices: Optional[Any] = None) -> List[Household]:
+        """
+        Materialize Household objects (for display of a handful of rows).
+        
+        Args:
+            indices: Row indices to materialize, in order (default: all rows)
+        
+        Returns:
+            List of Household objects
+        """
+        rows = range(len(self)) if indices is None else indices
+        return [
+            Household(
+                id=str(self.id[i]),
+                location=(float(self.latitude[i]), float(self.longitude[i])),
+                distance_to_slope=float(self.distance_to_slope[i]),
+                drainage_quality=(DRAINAGE_QUALITIES + ("Unknown",))[self.drainage_code[i]],
+                road_access=(ROAD_ACCESS_LEVELS + ("Unknown",))[self.access_code[i]],
+                occupants=int(self.occupants[i]),
+                priority_score=float(self.priority_score[i])
+            )
+            for i in rows
+        ]
+
+
 def calculate_household_priority(
     distance_to_slope: float,
     drainage_quality: str,
@@ -58,12 +151,10 @@ def calculate_household_priority(
     priority += (500 - distance_to_slope) / 500 * 40
     
     # Drainage factor (30%)
-    drainage_scores = {"Poor": 30, "Fair": 15, "Good": 5}
-    priority += drainage_scores.get(drainage_quality, 15)
+    priority += DRAINAGE_PRIORITY_SCORES.get(drainage_quality, 15)
     
     # Road access factor (25%)
-    access_scores = {"Limited": 25, "Moderate": 10, "Good": 0}
-    priority += access_scores.get(road_access, 10)
+    priority += ACCESS_PRIORITY_SCORES.get(road_access, 10)
     
     # Village risk amplification (20%)
     priority += village_risk_score / 100 * 20
@@ -72,6 +163,249 @@ def calculate_household_priority(
     return min(priority, 100)
 
 
+def _encode(values: Any, levels: Tuple[str, ...]) -> np.ndarray:
+    """
+    Map category names to codes; numeric arrays are codes already and pass through.
+    
+    Unknown names, missing values (None/NaN) and out-of-range codes map to
+    UNKNOWN_CATEGORY_CODE, like the scalar function's default. Fractional
+    codes, booleans and mixed names/numbers raise ValueError.
+    """
+    values = np.asarray(values)
+    kind = values.dtype.kind
+    if kind == "O":
+        # pandas columns and JSON lists arrive as objects: names (with gaps) or numbers
+        items = values.ravel().tolist()
+        if all(isinstance(v, str) or v is None or (isinstance(v, float) and np.isnan(v)) for v in items):
+            kind = "U"
+        elif all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in items):
+            values, kind = values.astype(np.float64), "f"
+    
+    if kind in "US":
+        codes = np.full(values.shape, UNKNOWN_CATEGORY_CODE, dtype=np.uint8)
+        for code, level in enumerate(levels):
+            codes[values == level] = code
+        return codes
+    if kind == "f":
+        missing = np.isnan(values)
+        if not (missing | (values == np.round(values))).all():
+            raise ValueError("Category codes must be whole numbers")
+        values = np.where(missing, -1, values)
+    elif kind not in "iu":
+        raise ValueError(f"Expected category names or integer codes, got {values.dtype} values")
+    # Range-check before the uint8 cast, which would wrap -1 or 256 onto valid codes
+    valid = (values >= 0) & (values < len(levels))
+    return np.where(valid, values, UNKNOWN_CATEGORY_CODE).astype(np.uint8)
+
+
+def encode_drainage_quality(values: Any) -> np.ndarray:
+    """Drainage names ("Poor"/"Fair"/"Good") to codes into DRAINAGE_QUALITIES"""
+    return _encode(values, DRAINAGE_QUALITIES)
+
+
+def encode_road_access(values: Any) -> np.ndarray:
+    """Road access names ("Limited"/"Moderate"/"Good") to codes into ROAD_ACCESS_LEVELS"""
+    return _encode(values, ROAD_ACCESS_LEVELS)
+
+
+def calculate_household_priorities(
+    distance_to_slope: Any,
+    drainage_code: Any,
+    access_code: Any,
+    village_risk_score: Any
+) -> np.ndarray:
+    """
+    Vectorized calculate_household_priority for many households in one call.
+    
+    Same weights, same default for unknown categories and same cap at 100;
+    results are bit-for-bit identical to the scalar function.
+    
+    Args:
+        distance_to_slope: Distances in meters
+        drainage_code: Codes into DRAINAGE_QUALITIES (or the names themselves)
+        access_code: Codes into ROAD_ACCESS_LEVELS (or the names themselves)
+        village_risk_score: Village risk (0-100), scalar or per household
+    
+    Returns:
+        float64 array of priority scores (0-100, higher = more urgent)
+    """
+    distance_to_slope = np.asarray(distance_to_slope, dtype=np.float64)
+    village_risk_score = np.asarray(village_risk_score, dtype=np.float64)
+    
+    # Terms added in the scalar function's order so rounding matches exactly
+    priority = (500 - distance_to_slope) / 500 * 40
+    priority += _DRAINAGE_POINTS[encode_drainage_quality(drainage_code)]
+    priority += _ACCESS_POINTS[encode_road_access(access_code)]
+    priority += village_risk_score / 100 * 20
+    
+    return np.minimum(priority, 100)
+
+
+def top_priority_indices(priorities: Any, k: int) -> np.ndarray:
+    """
+    Indices of the k highest-priority households without sorting all of them.
+    
+    Order matches sorted(..., reverse=True) on priority: highest first, ties in
+    input order. O(n + k log k) via argpartition.
+    
+    Args:
+        priorities: Household priority scores
+        k: Number of households to select
+    
+    Returns:
+        int64 indices, highest priority first
+    """
+    priorities = np.asarray(priorities, dtype=np.float64)
+    n = len(priorities)
+    k = max(0, min(k, n))
+    if k == 0:
+        return np.empty(0, dtype=np.int64)
+    
+    if k < n:
+        # k-th largest value; everything above it is in, ties at it are taken in input order
+        kth = -np.partition(-priorities, k - 1)[k - 1]
+        above = np.flatnonzero(priorities > kth)
+        tied = np.flatnonzero(priorities == kth)[:k - len(above)]
+        candidates = np.concatenate([above, tied])
+    else:
+        candidates = np.arange(n)
+    
+    # lexsort: last key is primary (priority descending), then index ascending
+    return candidates[np.lexsort((candidates, -priorities[candidates]))]
+
+
+def iter_priority_indices(priorities: Any, exclude: Optional[Any] = None) -> Iterator[int]:
+    """
+    Lazily yield household indices in priority order (highest first, ties in input order).
+    
+    Building the heap is O(n); each yielded index costs O(log n), so consumers
+    that stop early never pay for a full sort.
+    
+    Args:
+        priorities: Household priority scores
+        exclude: Indices to skip (e.g. those already returned by top_priority_indices)
+    
+    Returns:
+        Iterator of int indices
+    """
+    priorities = np.asarray(priorities, dtype=np.float64)
+    remaining = np.ones(len(priorities), dtype=bool)
+    if exclude is not None:
+        remaining[np.asarray(exclude, dtype=np.int64)] = False
+    
+    indices = np.flatnonzero(remaining)
+    heap = list(zip((-priorities[indices]).tolist(), indices.tolist()))
+    heapq.heapify(heap)
+    while heap:
+        yield heapq.heappop(heap)[1]
+
+
+def select_priority_households(households: Any, k: int) -> Tuple[List[Household], Iterator[Household]]:
+    """
+    Top-k households for display plus an ordered stream of the rest.
+    
+    Args:
+        households: HouseholdArrays or list of Household objects (any order)
+        k: Number of households to return up front
+    
+    Returns:
+        Tuple of (top-k households, highest first; iterator over the remaining
+        households in priority order)
+    """
+    priorities, _ = _household_columns(households, with_occupants=False)
+    top = top_priority_indices(priorities, k)
+    rest = iter_priority_indices(priorities, exclude=top)
+    
+    if isinstance(households, HouseholdArrays):
+        return households.to_households(top), (households.to_households([i])[0] for i in rest)
+    return [households[i] for i in top], (households[i] for i in rest)
+
+
+@dataclass
+class PhaseSummary:
+    """Evacuation phase membership, counts and occupant totals from one pass"""
+    phase: np.ndarray  # uint8 phase code per household (0 = most urgent)
+    households: np.ndarray  # households per phase
+    people: np.ndarray  # occupants per phase
+    order: np.ndarray  # household indices grouped by phase, input order within a phase
+    
+    def members(self, phase: int) -> np.ndarray:
+        """Household indices in a phase (input order)"""
+        end = int(self.households[:phase + 1].sum())
+        return self.order[end - int(self.households[phase]):end]
+    
+    @property
+    def total_households(self) -> int:
+        return int(self.households.sum())
+    
+    @property
+    def total_people(self) -> int:
+        return int(self.people.sum())
+
+
+def assign_evacuation_phases(priorities: Any, thresholds: Tuple[float, ...] = PHASE_THRESHOLDS) -> np.ndarray:
+    """
+    Vectorized phase assignment.
+    
+    Args:
+        priorities: Household priority scores
+        thresholds: Descending lower bounds of each phase except the last
+    
+    Returns:
+        uint8 phase code per household (0 = first phase, len(thresholds) = monitoring)
+    """
+    priorities = np.asarray(priorities, dtype=np.float64)
+    phases = np.full(priorities.shape, len(thresholds), dtype=np.uint8)
+    for threshold in thresholds:
+        phases -= priorities >= threshold
+    return phases
+
+
+def _household_columns(households: Any, with_occupants: bool = True) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """Priority (and occupant) arrays from HouseholdArrays or a list of Household-like objects"""
+    if isinstance(households, HouseholdArrays):
+        return households.priority_score, households.occupants if with_occupants else None
+    priorities = np.fromiter((hh.priority_score for hh in households), dtype=np.float64, count=len(households))
+    occupants = None
+    if with_occupants:
+        occupants = np.fromiter((hh.occupants for hh in households), dtype=np.int64, count=len(households))
+    return priorities, occupants
+
+
+def summarize_evacuation_phases(
+    priorities: Any,
+    occupants: Optional[Any] = None,
+    thresholds: Tuple[float, ...] = PHASE_THRESHOLDS
+) -> PhaseSummary:
+    """
+    Bucket households into phases and total them in a single vectorized pass.
+    
+    Args:
+        priorities: Household priority scores
+        occupants: Occupants per household (None = count households only)
+        thresholds: Descending phase lower bounds (default: PHASE_THRESHOLDS)
+    
+    Returns:
+        PhaseSummary with membership, household counts and people per phase
+    """
+    phase = assign_evacuation_phases(priorities, thresholds)
+    n_phases = len(thresholds) + 1
+    
+    counts = np.bincount(phase, minlength=n_phases)
+    if occupants is None:
+        people = np.zeros(n_phases, dtype=np.int64)
+    else:
+        people = np.bincount(phase, weights=np.asarray(occupants, dtype=np.float64), minlength=n_phases).astype(np.int64)
+    
+    return PhaseSummary(
+        phase=phase,
+        households=counts,
+        people=people,
+        # Stable sort of small integer codes is a linear-time radix sort
+        order=np.argsort(phase, kind="stable")
+    )
+
+
 def generate_evacuation_phases(households: List[Household]) -> Dict[str, List[Household]]:
     """
     Organize households into evacuation phases based on priority.
@@ -89,24 +423,13 @@ def generate_evacuation_phases(households: List[Household]) -> Dict[str, List[Ho
     Returns:
         Dict mapping phase names to household lists
     """
-    phases = {
-        "Phase 1: Immediate (0-30 min)": [],
-        "Phase 2: High Priority (30-120 min)": [],
-        "Phase 3: Moderate Priority (2-4 hours)": [],
-        "Monitoring: Stay Alert": []
-    }
-    
-    for hh in households:
-        if hh.priority_score >= 75:
-            phases["Phase 1: Immediate (0-30 min)"].append(hh)
-        elif hh.priority_score >= 60:
-            phases["Phase 2: High Priority (30-120 min)"].append(hh)
-        elif hh.priority_score >= 45:
-            phases["Phase 3: Moderate Priority (2-4 hours)"].append(hh)
-        else:
-            phases["Monitoring: Stay Alert"].append(hh)
+    priorities, _ = _household_columns(households, with_occupants=False)
+    summary = summarize_evacuation_phases(priorities)
     
-    return phases
+    return {
+        name: [households[i] for i in summary.members(code)]
+        for code, name in enumerate(EVACUATION_PHASES)
+    }
 
 
 def calculate_evacuation_statistics(households: List[Household]) -> Dict[str, int]:
@@ -114,45 +437,72 @@ def calculate_evacuation_statistics(households: List[Household]) -> Dict[str, in
     Calculate evacuation statistics for planning purposes.
     
     Args:
-        households: List of Household objects
+        households: List of Household objects (or HouseholdArrays)
     
     Returns:
         Dict with evacuation statistics
     """
-    total_households = len(households)
-    total_people = sum(hh.occupants for hh in households)
-    
-    critical_households = [hh for hh in households if hh.priority_score >= 75]
-    high_priority = [hh for hh in households if 60 <= hh.priority_score < 75]
-    moderate_priority = [hh for hh in households if 45 <= hh.priority_score < 60]
-    
-    critical_people = sum(hh.occupants for hh in critical_households)
-    high_people = sum(hh.occupants for hh in high_priority)
-    moderate_people = sum(hh.occupants for hh in moderate_priority)
+    summary = summarize_evacuation_phases(*_household_columns(households))
+    counts, people = summary.households, summary.people
     
     return {
-        "total_households": total_households,
-        "total_people": total_people,
-        "critical_households": len(critical_households),
-        "critical_people": critical_people,
-        "high_priority_households": len(high_priority),
-        "high_priority_people": high_people,
-        "moderate_priority_households": len(moderate_priority),
-        "moderate_priority_people": moderate_people
+        "total_households": summary.total_households,
+        "total_people": summary.total_people,
+        "critical_households": int(counts[0]),
+        "critical_people": int(people[0]),
+        "high_priority_households": int(counts[1]),
+        "high_priority_people": int(people[1]),
+        "moderate_priority_households": int(counts[2]),
+        "moderate_priority_people": int(people[2])
     }
 
 
-def generate_evacuation_routes(village_name: str, road_condition: float) -> Dict[str, str]:
+def generate_evacuation_routes(
+    village_name: str,
+    road_condition: float,
+    road_graph: Optional[RoadGraph] = None,
+    origin: Optional[Tuple[float, float]] = None,
+    shelters: Optional[Sequence[Any]] = None
+) -> Dict[str, str]:
     """
     Generate evacuation route recommendations based on conditions.
     
+    Without a road graph the standard district routes are returned. With a
+    road graph, village origin and shelter nodes, routes are the two safest
+    paths to different shelters (edges weighted by road cuts and slope).
+    
     Args:
         village_name: Name of the village
         road_condition: Road quality indicator (0-30 = road cuts percentage)
+        road_graph: Local road network (optional)
+        origin: Village (lat, lon), snapped to the nearest road node
+        shelters: Shelter node ids or indices in road_graph
     
     Returns:
         Dict with primary and alternative routes
     """
+    if road_graph is not None and origin is not None and shelters:
+        candidates = road_graph.routes_to_shelters(road_graph.nearest_node(*origin), shelters)
+        if not candidates:
+            return {
+                "primary": "No passable route",
+                "alternative": "No passable route",
+                "status": "cut off",
+                "recommendation": "All routes to shelters impassable - request rescue support"
+            }
+        
+        primary = candidates[0]
+        routes = {
+            "primary": primary.describe(),
+            "alternative": candidates[1].describe() if len(candidates) > 1 else "None available",
+            "status": "compromised" if primary.compromised else "good"
+        }
+        if primary.compromised:
+            routes["recommendation"] = f"Use Route A with caution (road cuts up to {primary.max_road_cuts:.0f}%)"
+        else:
+            routes["recommendation"] = "Use Route A (road intact)"
+        return routes
+    
     routes = {
         "primary": "Village Road → NH-106 → Relief Camp A (5 km)",
         "alternative": "Forest Path → State Highway → Relief Camp B (7 km)",
@@ -175,7 +525,8 @@ def identify_shelter_capacity(num_people: int) -> List[Dict[str, any]]:
         num_people: Number of people to evacuate
     
     Returns:
-        List of shelter options with capacity and distance
+        List of shelter options with capacity, distance and people allocated
+        (nearest shelters filled first; see shelter_assignment for household-level placement)
     """
     shelters = [
         {
@@ -198,8 +549,14 @@ def identify_shelter_capacity(num_people: int) -> List[Dict[str, any]]:
         }
     ]
     
-    # Sort by distance for immediate use
-    return sorted(shelters, key=lambda x: x['distance_km'])
+    # Sort by distance for immediate use, filling the nearest shelters first
+    shelters = sorted(shelters, key=lambda x: x['distance_km'])
+    unallocated = max(num_people, 0)
+    for shelter in shelters:
+        shelter["assigned_people"] = min(unallocated, shelter["capacity"])
+        unallocated -= shelter["assigned_people"]
+    
+    return shelters
 
 
 def generate_action_summary(
@@ -239,9 +596,9 @@ def generate_action_summary(
         icon = "✅"
         priority = "LOW"
     
-    # Calculate households to evacuate
-    high_risk_households = [h for h in households if h.priority_score >= 60]
-    critical_households = [h for h in households if h.priority_score >= 75]
+    # Calculate households to evacuate (Phase 1 + Phase 2)
+    priorities, _ = _household_columns(households, with_occupants=False)
+    phase_counts = summarize_evacuation_phases(priorities).households
     
     # Identify focus area (based on household clustering)
     focus_areas = ["eastern slope", "northern ridge", "western valley", "southern approach"]
@@ -267,8 +624,8 @@ def generate_action_summary(
         "action": action,
         "icon": icon,
         "priority": priority,
-        "households_evacuate": len(high_risk_households),
-        "households_critical": len(critical_households),
+        "households_evacuate": int(phase_counts[0] + phase_counts[1]),
+        "households_critical": int(phase_counts[0]),
         "focus_area": focus_area,
         "route": route_status,
         "alert_frequency": alert_freq,
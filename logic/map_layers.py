@@ -0,0 +1,124 @@
+"""
+NER-Aegis AI - Cached Map Layers
+
+This module prepares the village risk map once per data version:
+- Villages as GeoJSON point features carrying their own marker style,
+  radius and popup, so the map needs no per-village Python at render time
+- Serialized layers cached per data version (LRU)
+
+Engineering Principle: Draw the map once per data version
+"""
+
+from typing import Dict, List, Any, Tuple
+from collections import OrderedDict
+import json
+import threading
+
+import numpy as np
+
+from logic.village_table import VillageTable
+
+
+MARKER_STYLE = {"weight": 2, "fillOpacity": 0.7}
+POPUP_MAX_WIDTH = 250
+
+# Leaflet onEachFeature hook applying the per-feature style, radius and popup
+# (for folium.GeoJson(..., marker=folium.CircleMarker(), on_each_feature=...))
+VILLAGE_LAYER_JS = """
+function(feature, layer) {
+    var props = feature.properties;
+    layer.setStyle(Object.assign({color: props.color, fillColor: props.color, fill: true}, props.style));
+    layer.setRadius(props.radius);
+    layer.bindPopup(props.popup, {maxWidth: %d});
+}
+""" % POPUP_MAX_WIDTH
+
+
+def _display_keys(villages: VillageTable) -> List[Tuple]:
+    """Everything a village marker shows, per village"""
+    return list(zip(
+        villages.latitude.tolist(),
+        villages.longitude.tolist(),
+        np.round(villages.risk_score, 1).tolist(),
+        villages.categories.tolist(),
+        villages.colors.tolist(),
+        villages.population.tolist(),
+        villages.households.tolist()
+    ))
+
+
+def village_feature(name: str, key: Tuple) -> Dict[str, Any]:
+    """
+    GeoJSON point feature for one village marker.
+    
+    Args:
+        name: Village name (used as the feature id)
+        key: (latitude, longitude, risk score, category, color, population, households)
+    
+    Returns:
+        Feature dict; properties hold the marker color, radius, style and popup HTML
+    """
+    lat, lon, risk, category, color, population, households = key
+    return {
+        "type": "Feature",
+        "id": name,
+        "geometry": {"type": "Point", "coordinates": [lon, lat]},
+        "properties": {
+            "name": name,
+            "risk_score": risk,
+            "category": category,
+            "population": population,
+            "households": households,
+            "color": color,
+            "radius": round(8 + risk / 10, 2),
+            "style": MARKER_STYLE,
+            "popup": (
+                f"<b>{name}</b><br>Risk Score: {risk:.1f}<br>Category: {category}<br>"
+                f"Population: {population}<br>Households: {households}"
+            )
+        }
+    }
+
+
+class MapLayerCache:
+    """
+    Serialized village layers per data version.
+    
+    Thread-safe (Streamlit sessions share one instance via st.cache_resource).
+    """
+    
+    def __init__(self, max_versions: int = 4):
+        self.max_versions = max_versions
+        self._layers: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def __contains__(self, version: str) -> bool:
+        return version in self._layers
+    
+    def layer(self, version: str, villages: VillageTable) -> str:
+        """
+        GeoJSON FeatureCollection for a data version (built on first request).
+        
+        Args:
+            version: Data version (cache key)
+            villages: Village table for that version (only read on a cache miss)
+        
+        Returns:
+            Serialized FeatureCollection
+        """
+        with self._lock:
+            if version in self._layers:
+                self._layers.move_to_end(version)
+                return self._layers[version]
+            layer = self._layers[version] = self._build(villages)
+            while len(self._layers) > self.max_versions:
+                self._layers.popitem(last=False)
+            return layer
+    
+    @staticmethod
+    def _build(villages: VillageTable) -> str:
+        features = [
+            village_feature(str(name), key)
+            for name, key in zip(villages.name.tolist(), _display_keys(villages))
+        ]
+        return json.dumps({"type": "FeatureCollection", "features": features}, separators=(",", ":"))
@@ -9,8 +9,11 @@ This module contains the core risk assessment algorithms including:
 Engineering Principle: Separation of intelligence logic from presentation layer
 """
 
-from typing import Dict, Tuple, List
+from typing import Dict, Tuple, List, Any, Iterator, Optional, Union
 from dataclasses import dataclass
+import os
+
+import numpy as np
 
 
 @dataclass
@@ -23,6 +26,68 @@ class RiskFactors:
     road_cuts: float  # percentage
 
 
+# Factor order shared by compute_risk_score and the batch APIs below
+RISK_FACTORS = ("rainfall", "slope", "soil_moisture", "deforestation", "road_cuts")
+
+# Full-scale value and maximum points per factor: compute_risk_score scores each
+# factor as min(value / full_scale, 1) * points, and the points sum to 100
+RISK_FACTOR_SCALES = {
+    "rainfall": (400, 35),
+    "slope": (50, 30),
+    "soil_moisture": (100, 20),
+    "deforestation": (30, 10),
+    "road_cuts": (30, 5)
+}
+
+# Category names indexed by category code (0 = Low ... 3 = Critical)
+RISK_CATEGORIES = ("Low", "Moderate", "High", "Critical")
+RISK_CATEGORY_COLORS = ("#4caf50", "#ffd700", "#ff9800", "#ff4444")
+
+# Lower bounds for Moderate, High and Critical (see get_risk_category)
+RISK_CATEGORY_THRESHOLDS = (40, 60, 75)
+
+# Trigger thresholds (strictly greater than) in the order calculate_confidence_level
+# reports them, with the trigger name used in confidence explanations
+TRIGGER_THRESHOLDS = (
+    ("rainfall", 250, "rainfall"),
+    ("slope", 40, "slope"),
+    ("soil_moisture", 60, "saturation"),
+    ("road_cuts", 15, "road-cuts"),
+    ("deforestation", 15, "deforestation"),
+)
+
+# Confidence levels indexed by confidence code (= active trigger count, capped at 4)
+CONFIDENCE_LEVELS = ("Low", "Medium-Low", "Medium", "High-Medium", "High")
+CONFIDENCE_UNCERTAINTY = (15, 12, 10, 7, 5)
+
+# Category raster value for cells with missing input data (NaN)
+RASTER_NODATA_CATEGORY = 255
+
+# A raster input/output: in-memory array, or path to a .npy file (memory-mapped)
+RasterSource = Union[np.ndarray, float, str, os.PathLike]
+
+
+@dataclass
+class RiskScoreBatch:
+    """Vectorized risk scoring result for many locations"""
+    scores: np.ndarray  # float64, 0-100
+    category_codes: np.ndarray  # uint8, index into RISK_CATEGORIES
+    contributions: Dict[str, np.ndarray]  # same keys as calculate_risk_contributions
+    
+    @property
+    def categories(self) -> np.ndarray:
+        """Category names per location"""
+        return np.asarray(RISK_CATEGORIES, dtype=object)[self.category_codes]
+    
+    @property
+    def colors(self) -> np.ndarray:
+        """Category hex colors per location"""
+        return np.asarray(RISK_CATEGORY_COLORS, dtype=object)[self.category_codes]
+    
+    def __len__(self) -> int:
+        return len(self.scores)
+
+
 def compute_risk_score(
     rainfall: float, 
     slope: float, 
@@ -230,3 +295,236 @@ def get_risk_category(score: float) -> Tuple[str, str]:
         return "Moderate", "#ffd700"
     else:
         return "Low", "#4caf50"
+
+
+def _factor_columns(factors: Any) -> Tuple[np.ndarray, ...]:
+    """
+    Split batch input into the five factor columns (float64).
+    
+    Accepts a pandas DataFrame (or any mapping) keyed by RISK_FACTORS,
+    or an array of shape (..., 5) in compute_risk_score argument order.
+    """
+    if hasattr(factors, "columns") or isinstance(factors, dict):
+        missing = [name for name in RISK_FACTORS if name not in factors]
+        if missing:
+            raise ValueError(f"Missing risk factor columns: {', '.join(missing)}")
+        return tuple(np.asarray(factors[name], dtype=np.float64) for name in RISK_FACTORS)
+    
+    values = np.asarray(factors, dtype=np.float64)
+    if values.ndim == 0 or values.shape[-1] != len(RISK_FACTORS):
+        raise ValueError(
+            f"Expected factor array with last dimension {len(RISK_FACTORS)}, got shape {values.shape}"
+        )
+    return tuple(values[..., i] for i in range(len(RISK_FACTORS)))
+
+
+def _score_columns(
+    rainfall: np.ndarray,
+    slope: np.ndarray,
+    soil_moisture: np.ndarray,
+    deforestation: np.ndarray,
+    road_cuts: np.ndarray
+) -> np.ndarray:
+    """Array version of compute_risk_score (same operation order, same rounding)"""
+    rainfall_score = np.minimum((rainfall / 400) * 100, 100) * 0.35
+    slope_score = np.minimum((slope / 50) * 100, 100) * 0.30
+    moisture_score = np.minimum((soil_moisture / 100) * 100, 100) * 0.20
+    deforest_score = np.minimum((deforestation / 30) * 100, 100) * 0.10
+    roadcut_score = np.minimum((road_cuts / 30) * 100, 100) * 0.05
+    
+    total_score = rainfall_score + slope_score + moisture_score + deforest_score + roadcut_score
+    
+    return np.minimum(total_score, 100)
+
+
+def get_risk_category_codes(scores: Any) -> np.ndarray:
+    """
+    Vectorized get_risk_category returning category codes.
+    
+    Args:
+        scores: Array of risk scores (0-100)
+    
+    Returns:
+        uint8 array indexing RISK_CATEGORIES (0 = Low ... 3 = Critical)
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    codes = np.zeros(scores.shape, dtype=np.uint8)
+    for threshold in RISK_CATEGORY_THRESHOLDS:
+        codes += scores >= threshold
+    return codes
+
+
+def compute_risk_scores(factors: Any, with_contributions: bool = True) -> RiskScoreBatch:
+    """
+    Score many locations in one vectorized pass.
+    
+    Results are bit-for-bit identical to calling compute_risk_score,
+    get_risk_category and calculate_risk_contributions per location.
+    
+    Args:
+        factors: DataFrame/mapping with RISK_FACTORS columns, or an
+                 array of shape (n, 5) in compute_risk_score argument order
+        with_contributions: Also compute per-factor contributions
+    
+    Returns:
+        RiskScoreBatch with scores, category codes and contributions
+    """
+    rainfall, slope, soil_moisture, deforestation, road_cuts = _factor_columns(factors)
+    
+    scores = _score_columns(rainfall, slope, soil_moisture, deforestation, road_cuts)
+    
+    contributions = {}
+    if with_contributions:
+        contributions = {
+            "Rainfall surge": np.minimum(rainfall / 400 * 35, 35),
+            "Steep slope": np.minimum(slope / 50 * 30, 30),
+            "Soil moisture": np.minimum(soil_moisture / 100 * 20, 20),
+            "Vegetation loss": np.minimum(deforestation / 30 * 10, 10),
+            "Road cutting": np.minimum(road_cuts / 30 * 5, 5)
+        }
+    
+    return RiskScoreBatch(
+        scores=scores,
+        category_codes=get_risk_category_codes(scores),
+        contributions=contributions
+    )
+
+
+def _open_raster(source: RasterSource) -> np.ndarray:
+    """Open a raster input; .npy paths are memory-mapped read-only, never fully loaded"""
+    if isinstance(source, (str, os.PathLike)):
+        return np.load(source, mmap_mode="r")
+    return np.asarray(source)
+
+
+def _create_raster(
+    target: Optional[Union[np.ndarray, str, os.PathLike]],
+    shape: Tuple[int, int],
+    dtype: Any
+) -> np.ndarray:
+    """Create a raster output: .npy path -> writable memmap, None -> in-memory array"""
+    if target is None:
+        return np.empty(shape, dtype=dtype)
+    if isinstance(target, (str, os.PathLike)):
+        return np.lib.format.open_memmap(target, mode="w+", dtype=dtype, shape=shape)
+    if target.shape != shape:
+        raise ValueError(f"Output raster shape {target.shape} does not match input shape {shape}")
+    return target
+
+
+def iter_raster_tiles(shape: Tuple[int, int], tile_size: int = 1024) -> Iterator[Tuple[slice, slice]]:
+    """
+    Yield (row_slice, col_slice) windows covering a 2D grid in row-major order.
+    
+    Args:
+        shape: Grid shape (rows, cols)
+        tile_size: Tile edge length in cells
+    
+    Returns:
+        Iterator of slice pairs
+    """
+    if tile_size <= 0:
+        raise ValueError(f"tile_size must be positive, got {tile_size}")
+    rows, cols = shape
+    for row in range(0, rows, tile_size):
+        for col in range(0, cols, tile_size):
+            yield slice(row, min(row + tile_size, rows)), slice(col, min(col + tile_size, cols))
+
+
+def compute_risk_raster(
+    rainfall: RasterSource,
+    slope: RasterSource,
+    soil_moisture: RasterSource,
+    deforestation: RasterSource,
+    road_cuts: RasterSource,
+    scores_out: Optional[Union[np.ndarray, str, os.PathLike]] = None,
+    categories_out: Optional[Union[np.ndarray, str, os.PathLike]] = None,
+    tile_size: int = 1024,
+    score_dtype: Any = np.float64
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Score aligned 2D factor grids tile by tile.
+    
+    Inputs may be arrays, .npy paths (memory-mapped) or scalars applied to
+    the whole grid (e.g. uniform deforestation). Only one tile of each factor
+    is resident at a time, so a 10k x 10k grid scored into .npy outputs needs
+    roughly tile_size^2 x 8 bytes per factor of working memory.
+    
+    Cell values match compute_risk_score bit-for-bit when score_dtype is float64.
+    
+    Args:
+        rainfall: Rainfall grid in mm (e.g. IMD gridded rainfall)
+        slope: Slope grid in degrees (e.g. derived from a DEM)
+        soil_moisture: Soil moisture grid in percent (e.g. satellite raster)
+        deforestation: Deforestation grid in percent
+        road_cuts: Road cutting grid in percent
+        scores_out: Output array or .npy path for the risk raster (None = in memory)
+        categories_out: Output array or .npy path for the category raster (None = in memory)
+        tile_size: Tile edge length in cells
+        score_dtype: dtype of the risk raster (float32 halves output size)
+    
+    Returns:
+        Tuple of (risk_raster, category_raster); categories are codes into
+        RISK_CATEGORIES, RASTER_NODATA_CATEGORY where any input is NaN
+    """
+    grids = [_open_raster(g) for g in (rainfall, slope, soil_moisture, deforestation, road_cuts)]
+    
+    shapes = {g.shape for g in grids if g.ndim > 0}
+    if len(shapes) != 1:
+        raise ValueError(f"Factor rasters must share one 2D shape, got {sorted(shapes)}")
+    shape = shapes.pop()
+    if len(shape) != 2:
+        raise ValueError(f"Factor rasters must be 2D, got shape {shape}")
+    
+    scores = _create_raster(scores_out, shape, score_dtype)
+    categories = _create_raster(categories_out, shape, np.uint8)
+    
+    for rows, cols in iter_raster_tiles(shape, tile_size):
+        tile = [
+            np.asarray(g[rows, cols] if g.ndim else g, dtype=np.float64)
+            for g in grids
+        ]
+        tile_scores = _score_columns(*tile)
+        
+        tile_categories = get_risk_category_codes(tile_scores)
+        tile_categories[np.isnan(tile_scores)] = RASTER_NODATA_CATEGORY
+        
+        scores[rows, cols] = tile_scores
+        categories[rows, cols] = tile_categories
+    
+    for raster in (scores, categories):
+        if isinstance(raster, np.memmap):
+            raster.flush()
+    
+    return scores, categories
+
+
+def identify_trigger_mask(factors: Any) -> np.ndarray:
+    """
+    Vectorized trigger detection.
+    
+    Args:
+        factors: DataFrame/mapping with RISK_FACTORS columns, or (n, 5) array
+    
+    Returns:
+        bool array of shape (n, 5); column j is TRIGGER_THRESHOLDS[j]
+    """
+    columns = dict(zip(RISK_FACTORS, _factor_columns(factors)))
+    return np.stack(
+        [columns[factor] > threshold for factor, threshold, _ in TRIGGER_THRESHOLDS],
+        axis=-1
+    )
+
+
+def calculate_confidence_codes(trigger_mask: np.ndarray) -> np.ndarray:
+    """
+    Vectorized calculate_confidence_level returning confidence codes.
+    
+    Args:
+        trigger_mask: bool array from identify_trigger_mask
+    
+    Returns:
+        uint8 array indexing CONFIDENCE_LEVELS and CONFIDENCE_UNCERTAINTY
+    """
+    counts = np.count_nonzero(trigger_mask, axis=-1)
+    return np.minimum(counts, len(CONFIDENCE_LEVELS) - 1).astype(np.uint8)
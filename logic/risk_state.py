@@ -0,0 +1,276 @@
+"""
+NER-Aegis AI - Incremental Risk State
+
+This module keeps live risk intelligence for a set of villages and updates
+only what a sensor reading actually touches:
+- Factor deltas applied to a subset of villages
+- Scores, triggers, confidence bands and alert levels recomputed for that subset
+- Household evacuation priorities refreshed only in affected villages
+- Change-sets listing every threshold crossing for downstream alerting
+
+Engineering Principle: Work proportional to the update, not to the district
+"""
+
+from typing import Dict, List, Any, Sequence, Union
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from logic.risk_engine import (
+    RISK_FACTORS,
+    RISK_CATEGORIES,
+    TRIGGER_THRESHOLDS,
+    CONFIDENCE_LEVELS,
+    CONFIDENCE_UNCERTAINTY,
+    _factor_columns,
+    _score_columns,
+    get_risk_category_codes,
+    identify_trigger_mask,
+    calculate_confidence_codes
+)
+from logic.alert_engine import determine_alert_level_codes, ALERT_LEVELS
+from logic.evacuation_planner import (
+    HouseholdArrays,
+    assign_evacuation_phases,
+    calculate_household_priorities,
+    encode_drainage_quality,
+    encode_road_access
+)
+
+
+@dataclass
+class RiskChange:
+    """Threshold crossings for one village caused by an update"""
+    village: str
+    index: int
+    old_score: float
+    new_score: float
+    old_category: str
+    new_category: str
+    old_alert_level: str
+    new_alert_level: str
+    old_confidence: str
+    new_confidence: str
+    triggers_activated: List[str] = field(default_factory=list)
+    triggers_cleared: List[str] = field(default_factory=list)
+    households_escalated: int = 0  # moved to a more urgent evacuation phase
+    households_deescalated: int = 0
+    
+    @property
+    def alert_changed(self) -> bool:
+        return self.old_alert_level != self.new_alert_level
+
+
+@dataclass
+class RiskChangeSet:
+    """Result of one incremental update"""
+    factor: str
+    version: int
+    updated: np.ndarray  # indices of villages whose factor value was written
+    changes: List[RiskChange]  # villages where any threshold was crossed
+    
+    def __len__(self) -> int:
+        return len(self.changes)
+    
+    def __bool__(self) -> bool:
+        return bool(self.changes)
+    
+    @property
+    def alert_changes(self) -> List[RiskChange]:
+        """Changes where the alert level moved (re-alert candidates)"""
+        return [change for change in self.changes if change.alert_changed]
+
+
+class IncrementalRiskState:
+    """
+    Live risk state for many villages with O(k) updates for k touched villages.
+    
+    Scores and categories are bit-for-bit identical to recomputing with
+    compute_risk_score; confidence and triggers follow
+    calculate_confidence_level and identify_active_triggers.
+    """
+    
+    def __init__(self, names: Sequence[str], factors: Any):
+        """
+        Args:
+            names: Village names
+            factors: DataFrame/mapping with RISK_FACTORS columns, or (n, 5) array
+        """
+        self.names = np.asarray(list(names), dtype=object)
+        self.factors = {
+            name: np.array(column, dtype=np.float64)
+            for name, column in zip(RISK_FACTORS, _factor_columns(factors))
+        }
+        if any(len(column) != len(self.names) for column in self.factors.values()):
+            raise ValueError("Each factor column must have one value per village")
+        
+        self._index = {str(name): i for i, name in enumerate(self.names)}
+        self.version = 0
+        
+        self.scores = _score_columns(*(self.factors[name] for name in RISK_FACTORS))
+        self.category_codes = get_risk_category_codes(self.scores)
+        self.alert_codes = determine_alert_level_codes(self.scores)
+        self.trigger_mask = identify_trigger_mask(self.factors)
+        self.confidence_codes = calculate_confidence_codes(self.trigger_mask)
+        
+        # Households grouped by village: base priority excludes the village-risk term
+        self._household_base: Dict[int, np.ndarray] = {}
+        self.household_priorities: Dict[int, np.ndarray] = {}
+    
+    @classmethod
+    def from_village_table(cls, table: Any) -> "IncrementalRiskState":
+        """Build state from a VillageTable"""
+        return cls(table.name, {name: getattr(table, name) for name in RISK_FACTORS})
+    
+    def __len__(self) -> int:
+        return len(self.names)
+    
+    def index_of(self, village: Union[str, int]) -> int:
+        """Row index for a village name (ints are range-checked and pass through)"""
+        if isinstance(village, (int, np.integer)):
+            if not 0 <= village < len(self.names):
+                raise IndexError(f"Village index {village} out of range for {len(self.names)} villages")
+            return int(village)
+        return self._index[village]
+    
+    def attach_households(self, village: Union[str, int], households: Union[HouseholdArrays, Sequence[Any]]) -> np.ndarray:
+        """
+        Register a village's households so their priorities follow village risk.
+        
+        Args:
+            village: Village name or index
+            households: HouseholdArrays, or objects with distance_to_slope,
+                        drainage_quality and road_access
+        
+        Returns:
+            Current priority scores for the households (input order)
+        """
+        i = self.index_of(village)
+        if isinstance(households, HouseholdArrays):
+            distance, drainage, access = households.distance_to_slope, households.drainage_code, households.access_code
+        else:
+            distance = [hh.distance_to_slope for hh in households]
+            drainage = encode_drainage_quality([hh.drainage_quality for hh in households])
+            access = encode_road_access([hh.road_access for hh in households])
+        
+        # Village-risk term is added last in the priority formula, so a
+        # zero-risk priority is the exact base to which the risk term is added
+        self._household_base[i] = calculate_household_priorities(distance, drainage, access, 0)
+        self.household_priorities[i] = self._priorities_for(i)
+        return self.household_priorities[i]
+    
+    def _priorities_for(self, i: int) -> np.ndarray:
+        return np.minimum(self._household_base[i] + self.scores[i] / 100 * 20, 100)
+    
+    def snapshot(self, village: Union[str, int]) -> Dict[str, Any]:
+        """Current state of one village as plain Python values"""
+        i = self.index_of(village)
+        code = self.confidence_codes[i]
+        return {
+            "village": str(self.names[i]),
+            "risk_score": float(self.scores[i]),
+            "category": RISK_CATEGORIES[self.category_codes[i]],
+            "alert_level": ALERT_LEVELS[self.alert_codes[i]],
+            "confidence": CONFIDENCE_LEVELS[code],
+            "uncertainty": CONFIDENCE_UNCERTAINTY[code],
+            "active_triggers": [
+                trigger for (_, _, trigger), active in zip(TRIGGER_THRESHOLDS, self.trigger_mask[i]) if active
+            ],
+            **{name: float(self.factors[name][i]) for name in RISK_FACTORS}
+        }
+    
+    def apply_update(
+        self,
+        factor: str,
+        villages: Union[str, int, Sequence[Union[str, int]]],
+        values: Any,
+        mode: str = "set"
+    ) -> RiskChangeSet:
+        """
+        Apply a reading for one factor to a subset of villages.
+        
+        Args:
+            factor: One of RISK_FACTORS
+            villages: Village name or index, or a sequence of them, receiving the reading
+            values: New values (mode="set") or increments (mode="add"); scalar or per village
+            mode: "set" or "add"
+        
+        Returns:
+            RiskChangeSet with every category, alert, confidence, trigger and
+            household-phase crossing caused by the update
+        """
+        if factor not in self.factors:
+            raise ValueError(f"Unknown risk factor '{factor}', expected one of {RISK_FACTORS}")
+        if mode not in ("set", "add"):
+            raise ValueError(f"mode must be 'set' or 'add', got '{mode}'")
+        
+        if isinstance(villages, (str, int, np.integer)):
+            villages = [villages]  # a single name would otherwise be iterated per character
+        idx = np.fromiter((self.index_of(v) for v in villages), dtype=np.int64)
+        values = np.broadcast_to(np.asarray(values, dtype=np.float64), idx.shape)
+        
+        column = self.factors[factor]
+        if mode == "add":
+            np.add.at(column, idx, values)  # repeated villages accumulate
+        else:
+            column[idx] = values
+        idx = np.unique(idx)
+        self.version += 1
+        
+        old_scores = self.scores[idx]
+        old_categories = self.category_codes[idx]
+        old_alerts = self.alert_codes[idx]
+        old_confidence = self.confidence_codes[idx]
+        old_triggers = self.trigger_mask[idx]
+        
+        # Recompute only the touched villages
+        new_scores = _score_columns(*(self.factors[name][idx] for name in RISK_FACTORS))
+        self.scores[idx] = new_scores
+        self.category_codes[idx] = get_risk_category_codes(new_scores)
+        self.alert_codes[idx] = determine_alert_level_codes(new_scores)
+        
+        trigger_col = next(j for j, (name, _, _) in enumerate(TRIGGER_THRESHOLDS) if name == factor)
+        self.trigger_mask[idx, trigger_col] = column[idx] > TRIGGER_THRESHOLDS[trigger_col][1]
+        self.confidence_codes[idx] = calculate_confidence_codes(self.trigger_mask[idx])
+        
+        changes = []
+        for pos, i in enumerate(idx.tolist()):
+            escalated = deescalated = 0
+            if i in self._household_base and new_scores[pos] != old_scores[pos]:
+                old_phases = assign_evacuation_phases(self.household_priorities[i])
+                self.household_priorities[i] = self._priorities_for(i)
+                new_phases = assign_evacuation_phases(self.household_priorities[i])
+                escalated = int(np.count_nonzero(new_phases < old_phases))
+                deescalated = int(np.count_nonzero(new_phases > old_phases))
+            
+            trigger_flip = old_triggers[pos, trigger_col] != self.trigger_mask[i, trigger_col]
+            crossed = (
+                old_categories[pos] != self.category_codes[i]
+                or old_alerts[pos] != self.alert_codes[i]
+                or old_confidence[pos] != self.confidence_codes[i]
+                or trigger_flip
+                or escalated
+                or deescalated
+            )
+            if not crossed:
+                continue
+            
+            trigger_name = TRIGGER_THRESHOLDS[trigger_col][2]
+            changes.append(RiskChange(
+                village=str(self.names[i]),
+                index=i,
+                old_score=float(old_scores[pos]),
+                new_score=float(new_scores[pos]),
+                old_category=RISK_CATEGORIES[old_categories[pos]],
+                new_category=RISK_CATEGORIES[self.category_codes[i]],
+                old_alert_level=ALERT_LEVELS[old_alerts[pos]],
+                new_alert_level=ALERT_LEVELS[self.alert_codes[i]],
+                old_confidence=CONFIDENCE_LEVELS[old_confidence[pos]],
+                new_confidence=CONFIDENCE_LEVELS[self.confidence_codes[i]],
+                triggers_activated=[trigger_name] if trigger_flip and self.trigger_mask[i, trigger_col] else [],
+                triggers_cleared=[trigger_name] if trigger_flip and not self.trigger_mask[i, trigger_col] else [],
+                households_escalated=escalated,
+                households_deescalated=deescalated
+            ))
+        
+        return RiskChangeSet(factor=factor, version=self.version, updated=idx, changes=changes)
@@ -0,0 +1,547 @@
+"""
+NER-Aegis AI - Evacuation Routing Engine
+
+This module routes households to shelters over a local road network:
+- Road graph loaded from a CSV edge list or GeoJSON LineStrings
+- Edge costs weighted by road-cut damage and slope risk
+- Dijkstra and A* (haversine heuristic) shortest safe paths
+- Multi-source shortest-path trees from all shelters, reused for every household
+
+Engineering Principle: Route on the roads that still exist
+"""
+
+from typing import Dict, List, Tuple, Any, Optional, Sequence, Union
+from dataclasses import dataclass
+import csv
+import heapq
+import json
+import math
+
+import numpy as np
+
+from logic.spatial_index import SpatialGridIndex, haversine_m
+
+
+# Edge cost = length * (1 + road-cut penalty + slope penalty)
+ROAD_CUT_PENALTY = 3.0  # extra cost multiplier at 100% road cuts
+SLOPE_PENALTY = 1.5  # extra cost multiplier at MAX_SLOPE_DEG and above
+SAFE_SLOPE_DEG = 15.0  # slopes up to this add no penalty
+MAX_SLOPE_DEG = 45.0
+IMPASSABLE_ROAD_CUTS = 80.0  # edges at or above this are closed to routing
+
+# Routes crossing road cuts at or above this are reported as compromised
+# (same threshold as generate_evacuation_routes)
+ROUTE_COMPROMISED_ROAD_CUTS = 20.0
+
+NodeRef = Union[str, int]
+
+
+def edge_risk_costs(length_m: Any, road_cuts: Any, slope: Any) -> np.ndarray:
+    """
+    Risk-weighted traversal cost per road segment (vectorized).
+    
+    Args:
+        length_m: Segment length in meters
+        road_cuts: Road-cut damage percentage (0-100)
+        slope: Terrain slope along the segment in degrees
+    
+    Returns:
+        Cost in risk-weighted meters (inf for impassable segments)
+    """
+    length_m = np.asarray(length_m, dtype=np.float64)
+    road_cuts = np.asarray(road_cuts, dtype=np.float64)
+    slope = np.asarray(slope, dtype=np.float64)
+    
+    slope_term = np.clip((slope - SAFE_SLOPE_DEG) / (MAX_SLOPE_DEG - SAFE_SLOPE_DEG), 0, 1)
+    cost = length_m * (1 + ROAD_CUT_PENALTY * road_cuts / 100 + SLOPE_PENALTY * slope_term)
+    return np.where(road_cuts >= IMPASSABLE_ROAD_CUTS, np.inf, cost)
+
+
+def _csr(tails: np.ndarray, n_nodes: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Compressed adjacency: (indptr, positions of edges grouped by tail node)"""
+    order = np.argsort(tails, kind="stable")
+    indptr = np.zeros(n_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(tails, minlength=n_nodes), out=indptr[1:])
+    return indptr, order
+
+
+def _search(
+    adjacency: Tuple[List[int], List[int], List[float], List[float], List[int]],
+    sources: Sequence[int],
+    target: int = -1,
+    heuristic: Optional[List[float]] = None
+) -> Tuple[List[float], List[float], List[int], List[int]]:
+    """
+    Dijkstra (or A* with a heuristic) over a CSR adjacency.
+    
+    Returns:
+        Per node: (cost, length_m, edge used to reach it or -1, source it was reached from or -1)
+    """
+    indptr, heads, costs, lengths, edge_ids = adjacency
+    n = len(indptr) - 1
+    cost = [math.inf] * n
+    length = [math.inf] * n
+    via = [-1] * n
+    origin = [-1] * n
+    settled = bytearray(n)
+    
+    heap = []
+    for s in sources:
+        cost[s] = 0.0
+        length[s] = 0.0
+        origin[s] = s
+        heap.append((heuristic[s] if heuristic else 0.0, s))
+    heapq.heapify(heap)
+    
+    while heap:
+        _, u = heapq.heappop(heap)
+        if settled[u]:
+            continue
+        settled[u] = 1
+        if u == target:
+            break
+        
+        cu, lu, ou = cost[u], length[u], origin[u]
+        for pos in range(indptr[u], indptr[u + 1]):
+            v = heads[pos]
+            cv = cu + costs[pos]
+            if cv < cost[v]:
+                cost[v] = cv
+                length[v] = lu + lengths[pos]
+                via[v] = edge_ids[pos]
+                origin[v] = ou
+                heapq.heappush(heap, (cv + heuristic[v] if heuristic else cv, v))
+    
+    return cost, length, via, origin
+
+
+@dataclass
+class Route:
+    """One evacuation path through the road network"""
+    nodes: List[str]  # node ids, origin first, shelter last
+    roads: List[str]  # named roads travelled, consecutive repeats collapsed
+    cost: float  # risk-weighted meters
+    length_m: float
+    max_road_cuts: float  # worst road-cut damage along the route (%)
+    max_slope: float  # steepest segment along the route (degrees)
+    
+    @property
+    def shelter(self) -> str:
+        return self.nodes[-1]
+    
+    @property
+    def compromised(self) -> bool:
+        return self.max_road_cuts >= ROUTE_COMPROMISED_ROAD_CUTS
+    
+    def describe(self) -> str:
+        """Dashboard-style summary, e.g. 'Village Road → NH-106 → Relief Camp A (5.0 km)'"""
+        return f"{' → '.join(self.roads + [self.shelter])} ({self.length_m / 1000:.1f} km)"
+
+
+@dataclass
+class HouseholdRoutes:
+    """Per-household routing result from a ShortestPathTree"""
+    node: np.ndarray  # road node each household was snapped to
+    shelter: np.ndarray  # shelter node index reached (-1 = unreachable)
+    cost: np.ndarray  # risk-weighted meters (inf = unreachable)
+    length_m: np.ndarray  # road distance in meters (inf = unreachable)
+    
+    def __len__(self) -> int:
+        return len(self.node)
+    
+    @property
+    def reachable(self) -> np.ndarray:
+        return self.shelter >= 0
+
+
+class RoadGraph:
+    """
+    Directed road network in compressed sparse row form.
+    
+    Two-way roads are stored as a pair of directed edges. Impassable edges
+    (road cuts >= IMPASSABLE_ROAD_CUTS) are kept for reporting but left out
+    of the adjacency used for routing.
+    """
+    
+    def __init__(
+        self,
+        node_ids: Sequence[str],
+        latitudes: Any,
+        longitudes: Any,
+        edge_from: Any,
+        edge_to: Any,
+        length_m: Optional[Any] = None,
+        road_cuts: Optional[Any] = None,
+        slope: Optional[Any] = None,
+        names: Optional[Sequence[str]] = None,
+        oneway: Optional[Any] = None
+    ):
+        """
+        Build the graph.
+        
+        Args:
+            node_ids: Unique node identifiers
+            latitudes, longitudes: Node coordinates in degrees
+            edge_from, edge_to: Edge endpoints as node indices
+            length_m: Segment lengths (default: great-circle distance)
+            road_cuts: Road-cut damage per segment in % (default 0)
+            slope: Slope per segment in degrees (default 0)
+            names: Road name per segment (default unnamed)
+            oneway: True for segments drivable only from -> to (default two-way)
+        """
+        self.node_ids = [str(node) for node in node_ids]
+        self.latitudes = np.asarray(latitudes, dtype=np.float64)
+        self.longitudes = np.asarray(longitudes, dtype=np.float64)
+        n_nodes = len(self.node_ids)
+        if self.latitudes.shape != (n_nodes,) or self.longitudes.shape != (n_nodes,):
+            raise ValueError("latitudes and longitudes must have one value per node")
+        self._index = {node: i for i, node in enumerate(self.node_ids)}
+        if len(self._index) != n_nodes:
+            raise ValueError("node_ids must be unique")
+        
+        src = np.asarray(edge_from, dtype=np.int64)
+        dst = np.asarray(edge_to, dtype=np.int64)
+        n_edges = len(src)
+        if length_m is None:
+            length_m = haversine_m(self.latitudes[src], self.longitudes[src], self.latitudes[dst], self.longitudes[dst])
+        columns = {
+            "length_m": np.broadcast_to(np.asarray(length_m, dtype=np.float64), (n_edges,)),
+            "road_cuts": np.broadcast_to(np.asarray(0.0 if road_cuts is None else road_cuts, dtype=np.float64), (n_edges,)),
+            "slope": np.broadcast_to(np.asarray(0.0 if slope is None else slope, dtype=np.float64), (n_edges,)),
+            "name": np.asarray([""] * n_edges if names is None else [str(name or "") for name in names], dtype=object)
+        }
+        two_way = ~np.broadcast_to(np.asarray(False if oneway is None else oneway, dtype=bool), (n_edges,))
+        
+        # Directed edge list: every segment forward, two-way segments also reversed
+        self.edge_from = np.concatenate([src, dst[two_way]])
+        self.edge_to = np.concatenate([dst, src[two_way]])
+        self.edge_length_m = np.concatenate([columns["length_m"], columns["length_m"][two_way]])
+        self.edge_road_cuts = np.concatenate([columns["road_cuts"], columns["road_cuts"][two_way]])
+        self.edge_slope = np.concatenate([columns["slope"], columns["slope"][two_way]])
+        self.edge_name = np.concatenate([columns["name"], columns["name"][two_way]])
+        self.edge_cost = edge_risk_costs(self.edge_length_m, self.edge_road_cuts, self.edge_slope)
+        
+        # A* heuristic: straight-line distance times the smallest cost per
+        # straight-line meter on any edge, so it never overestimates
+        straight = haversine_m(
+            self.latitudes[self.edge_from], self.longitudes[self.edge_from],
+            self.latitudes[self.edge_to], self.longitudes[self.edge_to]
+        )
+        usable = np.isfinite(self.edge_cost) & (straight > 0)
+        self._heuristic_scale = float(np.min(self.edge_cost[usable] / straight[usable])) if usable.any() else 0.0
+        
+        self._forward = None
+        self._reverse = None
+        self._spatial_index: Optional[SpatialGridIndex] = None
+    
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+    
+    @classmethod
+    def from_csv(cls, path: str) -> "RoadGraph":
+        """
+        Load an edge list CSV.
+        
+        Required columns: from_id, to_id, from_lat, from_lon, to_lat, to_lon.
+        Optional columns: length_m, road_cuts, slope, name, oneway (1/true/yes).
+        
+        Args:
+            path: CSV file path
+        
+        Returns:
+            RoadGraph
+        """
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        
+        nodes: Dict[str, Tuple[float, float]] = {}
+        for row in rows:
+            nodes.setdefault(row["from_id"], (float(row["from_lat"]), float(row["from_lon"])))
+            nodes.setdefault(row["to_id"], (float(row["to_lat"]), float(row["to_lon"])))
+        index = {node: i for i, node in enumerate(nodes)}
+        
+        def optional(column: str, default: float) -> List[float]:
+            return [float(row[column]) if row.get(column) not in (None, "") else default for row in rows]
+        
+        lengths = None
+        if rows and all(row.get("length_m") not in (None, "") for row in rows):
+            lengths = optional("length_m", 0.0)
+        
+        return cls(
+            node_ids=list(nodes),
+            latitudes=[lat for lat, _ in nodes.values()],
+            longitudes=[lon for _, lon in nodes.values()],
+            edge_from=[index[row["from_id"]] for row in rows],
+            edge_to=[index[row["to_id"]] for row in rows],
+            length_m=lengths,
+            road_cuts=optional("road_cuts", 0.0),
+            slope=optional("slope", 0.0),
+            names=[row.get("name", "") for row in rows],
+            oneway=[str(row.get("oneway", "")).strip().lower() in ("1", "true", "yes") for row in rows]
+        )
+    
+    @classmethod
+    def from_geojson(cls, source: Union[str, Dict[str, Any]]) -> "RoadGraph":
+        """
+        Load roads from a GeoJSON FeatureCollection.
+        
+        LineString/MultiLineString features become road segments between
+        consecutive vertices; properties road_cuts, slope, name and oneway
+        apply to every segment of the feature. Vertices shared by features
+        (to 6 decimal places) become junctions. Point features with a "name"
+        property name the vertex at their coordinates (e.g. shelters).
+        
+        Args:
+            source: File path or parsed GeoJSON dict
+        
+        Returns:
+            RoadGraph
+        """
+        if isinstance(source, str):
+            with open(source, encoding="utf-8") as f:
+                source = json.load(f)
+        
+        def key(position: Sequence[float]) -> Tuple[float, float]:
+            return round(float(position[1]), 6), round(float(position[0]), 6)
+        
+        nodes: Dict[Tuple[float, float], int] = {}
+        edges = {"from": [], "to": [], "road_cuts": [], "slope": [], "name": [], "oneway": []}
+        labels: Dict[Tuple[float, float], str] = {}
+        
+        for feature in source.get("features", []):
+            geometry = feature.get("geometry") or {}
+            props = feature.get("properties") or {}
+            if geometry.get("type") == "Point":
+                if props.get("name"):
+                    labels[key(geometry["coordinates"])] = str(props["name"])
+                continue
+            if geometry.get("type") == "LineString":
+                lines = [geometry["coordinates"]]
+            elif geometry.get("type") == "MultiLineString":
+                lines = geometry["coordinates"]
+            else:
+                continue
+            
+            for line in lines:
+                vertices = [nodes.setdefault(key(p), len(nodes)) for p in line]
+                for a, b in zip(vertices, vertices[1:]):
+                    if a == b:
+                        continue
+                    edges["from"].append(a)
+                    edges["to"].append(b)
+                    edges["road_cuts"].append(float(props.get("road_cuts", 0) or 0))
+                    edges["slope"].append(float(props.get("slope", 0) or 0))
+                    edges["name"].append(str(props.get("name", "") or ""))
+                    edges["oneway"].append(bool(props.get("oneway", False)))
+        
+        coordinates = list(nodes)
+        return cls(
+            node_ids=[labels.get(c, f"{c[0]:.6f},{c[1]:.6f}") for c in coordinates],
+            latitudes=[lat for lat, _ in coordinates],
+            longitudes=[lon for _, lon in coordinates],
+            edge_from=edges["from"],
+            edge_to=edges["to"],
+            road_cuts=edges["road_cuts"],
+            slope=edges["slope"],
+            names=edges["name"],
+            oneway=edges["oneway"]
+        )
+    
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+    
+    def __len__(self) -> int:
+        return len(self.node_ids)
+    
+    @property
+    def edge_count(self) -> int:
+        """Number of directed edges (two-way roads count twice)"""
+        return len(self.edge_from)
+    
+    def index_of(self, node: NodeRef) -> int:
+        """Node index for a node id (ints are range-checked and pass through)"""
+        if isinstance(node, (int, np.integer)):
+            if not 0 <= node < len(self.node_ids):
+                raise IndexError(f"Node index {node} out of range for {len(self.node_ids)} nodes")
+            return int(node)
+        return self._index[node]
+    
+    @property
+    def spatial_index(self) -> SpatialGridIndex:
+        """Grid index over node locations (built on first use)"""
+        if self._spatial_index is None:
+            self._spatial_index = SpatialGridIndex(self.latitudes, self.longitudes, cell_size_m=250.0)
+        return self._spatial_index
+    
+    def nearest_node(self, lat: float, lon: float) -> int:
+        """Index of the road node closest to a point"""
+        indices, _ = self.spatial_index.query_nearest(lat, lon, 1)
+        if not len(indices):
+            raise ValueError("Road graph has no nodes")
+        return int(indices[0])
+    
+    def snap(self, latitudes: Any, longitudes: Any) -> np.ndarray:
+        """Nearest road node for each point (e.g. every household of a village)"""
+        latitudes = np.asarray(latitudes, dtype=np.float64)
+        longitudes = np.asarray(longitudes, dtype=np.float64)
+        return np.fromiter(
+            (self.nearest_node(lat, lon) for lat, lon in zip(latitudes.tolist(), longitudes.tolist())),
+            dtype=np.int64,
+            count=len(latitudes)
+        )
+    
+    # ------------------------------------------------------------------
+    # Routing
+    # ------------------------------------------------------------------
+    
+    def _adjacency(self, reverse: bool):
+        """Passable edges as Python-list CSR (cached); reverse follows edges backwards"""
+        cached = self._reverse if reverse else self._forward
+        if cached is not None:
+            return cached
+        
+        passable = np.flatnonzero(np.isfinite(self.edge_cost))
+        tails, heads = (self.edge_to, self.edge_from) if reverse else (self.edge_from, self.edge_to)
+        indptr, order = _csr(tails[passable], len(self))
+        edge_ids = passable[order]
+        adjacency = (
+            indptr.tolist(),
+            heads[edge_ids].tolist(),
+            self.edge_cost[edge_ids].tolist(),
+            self.edge_length_m[edge_ids].tolist(),
+            edge_ids.tolist()
+        )
+        if reverse:
+            self._reverse = adjacency
+        else:
+            self._forward = adjacency
+        return adjacency
+    
+    def _route(self, start: int, edges: List[int], cost: float, length_m: float) -> Route:
+        """Assemble a Route from a start node and directed edge ids in travel order"""
+        edges_arr = np.asarray(edges, dtype=np.int64)
+        roads: List[str] = []
+        for name in self.edge_name[edges_arr].tolist():
+            if name and (not roads or roads[-1] != name):
+                roads.append(name)
+        return Route(
+            nodes=[self.node_ids[start]] + [self.node_ids[v] for v in self.edge_to[edges_arr].tolist()],
+            roads=roads,
+            cost=float(cost),
+            length_m=float(length_m),
+            max_road_cuts=float(self.edge_road_cuts[edges_arr].max()) if edges else 0.0,
+            max_slope=float(self.edge_slope[edges_arr].max()) if edges else 0.0
+        )
+    
+    def _path_edges(self, via: Sequence[int], node: int, backwards: bool) -> List[int]:
+        """Edges from a search source to node; backwards=True for reverse searches"""
+        edges = []
+        while via[node] >= 0:
+            e = via[node]
+            edges.append(e)
+            node = self.edge_to[e] if backwards else self.edge_from[e]
+        return edges if backwards else edges[::-1]
+    
+    def shortest_path(self, source: NodeRef, target: NodeRef) -> Optional[Route]:
+        """
+        Safest path between two nodes (A* with a straight-line heuristic).
+        
+        Args:
+            source: Origin node id or index
+            target: Destination node id or index
+        
+        Returns:
+            Route, or None if the target is unreachable
+        """
+        s, t = self.index_of(source), self.index_of(target)
+        heuristic = (
+            self._heuristic_scale * haversine_m(self.latitudes[t], self.longitudes[t], self.latitudes, self.longitudes)
+        ).tolist()
+        cost, length, via, _ = _search(self._adjacency(reverse=False), [s], target=t, heuristic=heuristic)
+        if math.isinf(cost[t]):
+            return None
+        return self._route(s, self._path_edges(via, t, backwards=False), cost[t], length[t])
+    
+    def routes_to_shelters(self, source: NodeRef, shelters: Sequence[NodeRef]) -> List[Route]:
+        """
+        Safest route from one origin to each reachable shelter (single Dijkstra pass).
+        
+        Args:
+            source: Origin node id or index
+            shelters: Shelter node ids or indices
+        
+        Returns:
+            Routes ordered by cost, safest first (unreachable shelters omitted)
+        """
+        s = self.index_of(source)
+        cost, length, via, _ = _search(self._adjacency(reverse=False), [s])
+        routes = []
+        for shelter in dict.fromkeys(self.index_of(x) for x in shelters):
+            if math.isinf(cost[shelter]):
+                continue
+            routes.append(self._route(s, self._path_edges(via, shelter, backwards=False), cost[shelter], length[shelter]))
+        return sorted(routes, key=lambda route: route.cost)
+    
+    def shelter_tree(self, shelters: Sequence[NodeRef]) -> "ShortestPathTree":
+        """
+        Multi-source shortest-path tree toward the nearest shelter from every node.
+        
+        One reverse Dijkstra pass from all shelters at once; afterwards the
+        route from any node is a parent-pointer walk and the cost/shelter of
+        any number of households is an array lookup.
+        
+        Args:
+            shelters: Shelter node ids or indices
+        
+        Returns:
+            ShortestPathTree
+        """
+        sources = list(dict.fromkeys(self.index_of(x) for x in shelters))
+        cost, length, via, origin = _search(self._adjacency(reverse=True), sources)
+        return ShortestPathTree(
+            graph=self,
+            shelters=np.asarray(sources, dtype=np.int64),
+            cost=np.asarray(cost),
+            length_m=np.asarray(length),
+            next_edge=np.asarray(via, dtype=np.int64),
+            shelter=np.asarray(origin, dtype=np.int64)
+        )
+
+
+@dataclass
+class ShortestPathTree:
+    """Safest route from every road node to its nearest shelter"""
+    graph: RoadGraph
+    shelters: np.ndarray  # shelter node indices
+    cost: np.ndarray  # risk-weighted meters to the nearest shelter (inf = cut off)
+    length_m: np.ndarray  # road meters along that route
+    next_edge: np.ndarray  # directed edge to follow from each node (-1 at shelters / cut off)
+    shelter: np.ndarray  # shelter node index each node evacuates to (-1 = cut off)
+    
+    def route(self, node: NodeRef) -> Optional[Route]:
+        """Route from a node to its shelter, or None if the node is cut off"""
+        i = self.graph.index_of(node)
+        if self.shelter[i] < 0:
+            return None
+        edges = self.graph._path_edges(self.next_edge, i, backwards=True)
+        return self.graph._route(i, edges, self.cost[i], self.length_m[i])
+    
+    def route_households(self, latitudes: Any, longitudes: Any) -> HouseholdRoutes:
+        """
+        Snap households to the road network and look up their routes.
+        
+        Args:
+            latitudes, longitudes: Household coordinates
+        
+        Returns:
+            HouseholdRoutes (use route(node) for the path of any household)
+        """
+        nodes = self.graph.snap(latitudes, longitudes)
+        return HouseholdRoutes(
+            node=nodes,
+            shelter=self.shelter[nodes],
+            cost=self.cost[nodes],
+            length_m=self.length_m[nodes]
+        )
@@ -0,0 +1,289 @@
+"""
+NER-Aegis AI - Scenario Engine
+
+This module answers "what if" questions over the whole village set:
+- Factor perturbations: set to a value, scale, or add, for every village
+  or only the villages of one region
+- Scenario grids over forecast values (e.g. rainfall 150-400 mm) and
+  their combinations
+- Every scenario scored in one batched pass: risk, alert level and
+  evacuation phase counts per village
+- Results as a compact scenario x village cube
+
+Engineering Principle: Rehearse the storm before it arrives
+"""
+
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+from dataclasses import dataclass
+import itertools
+
+import numpy as np
+
+from logic.risk_engine import RISK_FACTORS, _factor_columns, _score_columns, get_risk_category_codes
+from logic.alert_engine import ALERT_LEVELS, determine_alert_level_codes
+from logic.evacuation_planner import EVACUATION_PHASES, PHASE_THRESHOLDS, HouseholdArrays, calculate_household_priorities
+
+
+PERTURBATION_OPS = ("set", "scale", "add")
+
+
+@dataclass(frozen=True)
+class FactorPerturbation:
+    """
+    Change to one risk factor.
+    
+    Operations apply in PERTURBATION_OPS order within a scenario (set, then
+    scale, then add), and results are floored at 0.
+    """
+    factor: str  # one of RISK_FACTORS
+    op: str  # one of PERTURBATION_OPS
+    value: float
+    region: Optional[str] = None  # only villages in this region (None = all)
+    
+    def __post_init__(self):
+        if self.factor not in RISK_FACTORS:
+            raise ValueError(f"Unknown risk factor '{self.factor}', expected one of {RISK_FACTORS}")
+        if self.op not in PERTURBATION_OPS:
+            raise ValueError(f"Unknown operation '{self.op}', expected one of {PERTURBATION_OPS}")
+    
+    @property
+    def label(self) -> str:
+        text = {"set": f"{self.factor}={self.value:g}", "scale": f"{self.factor}x{self.value:g}",
+                "add": f"{self.factor}{self.value:+g}"}[self.op]
+        return f"{text} ({self.region})" if self.region else text
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """A named set of perturbations (no perturbations = current conditions)"""
+    name: str
+    perturbations: Tuple[FactorPerturbation, ...] = ()
+
+
+def scenario_grid(
+    factor: str,
+    values: Sequence[float],
+    op: str = "set",
+    region: Optional[str] = None
+) -> List[Scenario]:
+    """
+    One scenario per forecast value.
+    
+    Args:
+        factor: Risk factor to perturb
+        values: Grid of values (e.g. np.arange(150, 401, 50) for rainfall)
+        op: "set", "scale" or "add"
+        region: Restrict to one region (None = all villages)
+    
+    Returns:
+        List of Scenario named after their perturbation
+    """
+    scenarios = []
+    for value in values:
+        perturbation = FactorPerturbation(factor, op, float(value), region)
+        scenarios.append(Scenario(perturbation.label, (perturbation,)))
+    return scenarios
+
+
+def combine_scenarios(*grids: Sequence[Scenario]) -> List[Scenario]:
+    """Cartesian product of scenario grids (e.g. rainfall x soil moisture)"""
+    return [
+        Scenario(", ".join(s.name for s in combo), tuple(p for s in combo for p in s.perturbations))
+        for combo in itertools.product(*grids)
+    ]
+
+
+@dataclass
+class ScenarioCube:
+    """Scenario x village results"""
+    scenarios: Tuple[str, ...]
+    villages: Tuple[str, ...]
+    factors: np.ndarray  # (s, n, 5) float32, perturbed factors in RISK_FACTORS order
+    scores: np.ndarray  # (s, n) float32
+    category_codes: np.ndarray  # (s, n) uint8, index into RISK_CATEGORIES
+    alert_codes: np.ndarray  # (s, n) uint8, index into ALERT_LEVELS
+    phase_households: Optional[np.ndarray] = None  # (s, n, 3) int32 households in Phase 1-3
+    phase_people: Optional[np.ndarray] = None  # (s, n, 3) int64 occupants in Phase 1-3
+    
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.scores.shape
+    
+    def scenario(self, name: str) -> int:
+        return self.scenarios.index(name)
+    
+    def alert_level_counts(self) -> np.ndarray:
+        """(s, len(ALERT_LEVELS)) villages at each alert level per scenario"""
+        counts = np.zeros((len(self.scenarios), len(ALERT_LEVELS)), dtype=np.int64)
+        for code in range(len(ALERT_LEVELS)):
+            counts[:, code] = np.count_nonzero(self.alert_codes == code, axis=1)
+        return counts
+    
+    def summary(self) -> Dict[str, np.ndarray]:
+        """
+        Per-scenario totals.
+        
+        Returns:
+            Dict of (s,) arrays: max_score, mean_score, villages per alert level
+            ("villages_<level>") and, with households, households_to_evacuate /
+            people_to_evacuate (Phase 1-3 over all villages)
+        """
+        result = {"max_score": self.scores.max(axis=1), "mean_score": self.scores.mean(axis=1)}
+        counts = self.alert_level_counts()
+        for code, level in enumerate(ALERT_LEVELS):
+            result[f"villages_{level}"] = counts[:, code]
+        if self.phase_households is not None:
+            result["households_to_evacuate"] = self.phase_households.sum(axis=(1, 2))
+            result["people_to_evacuate"] = self.phase_people.sum(axis=(1, 2))
+        return result
+
+
+@dataclass
+class _HouseholdIndex:
+    """A village's households sorted by priority without the village-risk term"""
+    values: np.ndarray  # distinct base priorities, ascending
+    households_above: np.ndarray  # households_above[j] = households with base >= values[j] (len + 1)
+    people_above: np.ndarray  # people_above[j] = their occupants (len + 1)
+
+
+class ScenarioEngine:
+    """
+    Batched what-if evaluation over a fixed village set.
+    
+    Household priority is a household-only base plus village_risk / 100 * 20,
+    so each village's households are sorted by base once; phase counts for any
+    number of scenarios are then binary searches, not re-prioritizations.
+    """
+    
+    def __init__(
+        self,
+        factors: Any,
+        villages: Sequence[str],
+        regions: Optional[Sequence[str]] = None,
+        households: Optional[Sequence[HouseholdArrays]] = None
+    ):
+        """
+        Args:
+            factors: Current factors: DataFrame/mapping with RISK_FACTORS columns, or (n, 5) array
+            villages: Village names
+            regions: Region (district) of each village, for regional perturbations
+            households: HouseholdArrays per village (enables evacuation counts)
+        """
+        self.factors = np.column_stack([np.atleast_1d(c) for c in _factor_columns(factors)])
+        self.villages = tuple(str(v) for v in villages)
+        self.regions = np.asarray(regions if regions is not None else [""] * len(self.villages), dtype=object)
+        if len(self.factors) != len(self.villages) or len(self.regions) != len(self.villages):
+            raise ValueError("factors, villages and regions must have one entry per village")
+        
+        self._households: Optional[List[_HouseholdIndex]] = None
+        if households is not None:
+            if len(households) != len(self.villages):
+                raise ValueError("households must have one HouseholdArrays per village")
+            self._households = [self._index_households(hh) for hh in households]
+    
+    @staticmethod
+    def _index_households(households: HouseholdArrays) -> _HouseholdIndex:
+        base = calculate_household_priorities(
+            households.distance_to_slope, households.drainage_code, households.access_code, 0.0
+        )
+        order = np.argsort(base, kind="stable")
+        base = base[order]
+        people = households.occupants[order]
+        people_above = np.concatenate([np.cumsum(people[::-1])[::-1], [0]])
+        # Equal bases always land in the same phase, so search over distinct values
+        values, starts = np.unique(base, return_index=True)
+        starts = np.append(starts, len(base))
+        return _HouseholdIndex(values=values, households_above=len(base) - starts, people_above=people_above[starts])
+    
+    def apply(self, scenarios: Sequence[Scenario]) -> np.ndarray:
+        """
+        Perturbed factors for every scenario.
+        
+        Returns:
+            (s, n, 5) float64 array
+        """
+        s, n = len(scenarios), len(self.villages)
+        shape = (s, n, len(RISK_FACTORS))
+        set_mask = np.zeros(shape, dtype=bool)
+        set_values = np.zeros(shape)
+        scale = np.ones(shape)
+        shift = np.zeros(shape)
+        
+        region_masks: Dict[Optional[str], Any] = {None: slice(None)}
+        for i, scenario in enumerate(scenarios):
+            for p in scenario.perturbations:
+                if p.region not in region_masks:
+                    region_masks[p.region] = self.regions == p.region
+                rows = region_masks[p.region]
+                j = RISK_FACTORS.index(p.factor)
+                if p.op == "set":
+                    set_mask[i, rows, j] = True
+                    set_values[i, rows, j] = p.value
+                elif p.op == "scale":
+                    scale[i, rows, j] *= p.value
+                else:
+                    shift[i, rows, j] += p.value
+        
+        perturbed = np.where(set_mask, set_values, self.factors[None, :, :]) * scale + shift
+        return np.maximum(perturbed, 0)
+    
+    def run(self, scenarios: Sequence[Scenario]) -> ScenarioCube:
+        """
+        Evaluate every scenario in one batched pass.
+        
+        Args:
+            scenarios: Scenarios to evaluate (include Scenario("Current") for a baseline row)
+        
+        Returns:
+            ScenarioCube
+        """
+        factors = self.apply(scenarios)
+        scores = _score_columns(*(factors[..., j] for j in range(len(RISK_FACTORS))))
+        
+        phase_households = phase_people = None
+        if self._households is not None:
+            phase_households, phase_people = self._phase_counts(scores)
+        
+        return ScenarioCube(
+            scenarios=tuple(scenario.name for scenario in scenarios),
+            villages=self.villages,
+            factors=factors.astype(np.float32),
+            scores=scores.astype(np.float32),
+            category_codes=get_risk_category_codes(scores),
+            alert_codes=determine_alert_level_codes(scores),
+            phase_households=phase_households,
+            phase_people=phase_people
+        )
+    
+    def _phase_counts(self, scores: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Households and people in Phase 1-3 per scenario and village"""
+        s, n = scores.shape
+        phases = len(EVACUATION_PHASES) - 1
+        at_least_households = np.zeros((s, n, phases), dtype=np.int64)
+        at_least_people = np.zeros((s, n, phases), dtype=np.int64)
+        risk_terms = scores / 100 * 20  # same expression as calculate_household_priorities
+        thresholds = np.asarray(PHASE_THRESHOLDS, dtype=np.float64)[None, :]
+        
+        for v, index in enumerate(self._households):
+            values = index.values
+            if not len(values):
+                continue
+            # Household reaches a phase threshold T when base + risk term >= T
+            terms = np.broadcast_to(risk_terms[:, v, None], (s, phases))
+            first = np.searchsorted(values, thresholds - terms, side="left")
+            # T - risk term rounds differently from base + risk term; step the
+            # boundary until it agrees with the sum calculate_household_priorities
+            # compares (the sum is monotone in base, so this converges)
+            while True:
+                down = (first > 0) & (values[np.maximum(first - 1, 0)] + terms >= thresholds)
+                up = ~down & (first < len(values)) & (values[np.minimum(first, len(values) - 1)] + terms < thresholds)
+                if not (down.any() or up.any()):
+                    break
+                first = first - down + up
+            at_least_households[:, v, :] = index.households_above[first]
+            at_least_people[:, v, :] = index.people_above[first]
+        
+        # "At least phase k" counts -> counts per phase
+        households = np.diff(at_least_households, axis=2, prepend=0).astype(np.int32)
+        people = np.diff(at_least_people, axis=2, prepend=0)
+        return households, people
@@ -0,0 +1,382 @@
+"""
+NER-Aegis AI - Sensor Ingestion
+
+This module turns raw gauge streams into the factor values risk scoring expects:
+- Rain gauge increments summed over rolling 24h / 72h windows
+  (bucketed ring buffers, O(1) per reading, bounded memory)
+- Soil moisture smoothed with a time-aware exponential moving average
+- One station can cover several villages
+- Aggregates pushed into IncrementalRiskState in batched updates, so only
+  villages whose factor actually moved are re-scored
+- Readings from CSV / JSON-lines files or a local TCP socket
+
+Engineering Principle: Summarize the stream as it arrives, score the summary
+"""
+
+from typing import Dict, List, Any, Optional, Sequence, Iterator, Iterable, Callable, Tuple
+from dataclasses import dataclass
+import asyncio
+import csv
+import json
+import math
+
+from logic.risk_state import IncrementalRiskState, RiskChangeSet
+
+
+SENSOR_TYPES = ("rain_gauge", "soil_moisture")
+
+# Rolling rainfall windows; the 72h total is the "rainfall" risk factor
+RAINFALL_WINDOWS_S = {
+    "rain_24h": 24 * 3600,
+    "rain_72h": 72 * 3600
+}
+RAINFALL_FACTOR_WINDOW = "rain_72h"
+
+WINDOW_RESOLUTION_S = 300  # rainfall bucket width
+MOISTURE_HALF_LIFE_S = 6 * 3600
+
+
+@dataclass
+class SensorReading:
+    """One gauge reading"""
+    station: str
+    sensor: str  # one of SENSOR_TYPES
+    value: float  # rain_gauge: mm since the previous reading; soil_moisture: %
+    timestamp: float  # epoch seconds
+
+
+class RollingSum:
+    """
+    Sum of values over a sliding time window.
+    
+    Values land in fixed-width buckets on a ring; advancing time clears the
+    buckets that fall out of the window, so each reading costs O(1)
+    amortized and memory is window / resolution floats.
+    """
+    
+    __slots__ = ("resolution_s", "buckets", "head", "total")
+    
+    def __init__(self, window_s: float, resolution_s: float = WINDOW_RESOLUTION_S):
+        self.resolution_s = resolution_s
+        self.buckets = [0.0] * max(1, math.ceil(window_s / resolution_s))
+        self.head: Optional[int] = None  # newest bucket slot
+        self.total = 0.0
+    
+    def _advance(self, slot: int) -> None:
+        if self.head is None:
+            self.head = slot
+            return
+        gap = slot - self.head
+        if gap <= 0:
+            return
+        n = len(self.buckets)
+        if gap >= n:
+            self.buckets = [0.0] * n
+            self.total = 0.0
+        else:
+            for s in range(self.head + 1, slot + 1):
+                i = s % n
+                self.total -= self.buckets[i]
+                self.buckets[i] = 0.0
+            if self.total < 1e-9:
+                self.total = 0.0  # absorb float drift once the window is empty
+        self.head = slot
+    
+    def add(self, timestamp: float, value: float) -> bool:
+        """Add a value; returns False if it is older than the window"""
+        slot = int(timestamp // self.resolution_s)
+        self._advance(slot)
+        if slot <= self.head - len(self.buckets):
+            return False
+        self.buckets[slot % len(self.buckets)] += value
+        self.total += value
+        return True
+    
+    def value(self, now: Optional[float] = None) -> float:
+        """Window total (advanced to now if given)"""
+        if now is not None:
+            self._advance(int(now // self.resolution_s))
+        return self.total
+
+
+class TimeDecayEMA:
+    """Exponential moving average for irregularly spaced readings"""
+    
+    __slots__ = ("half_life_s", "value", "timestamp")
+    
+    def __init__(self, half_life_s: float = MOISTURE_HALF_LIFE_S):
+        self.half_life_s = half_life_s
+        self.value: Optional[float] = None
+        self.timestamp: Optional[float] = None
+    
+    def add(self, timestamp: float, value: float) -> bool:
+        """Blend in a reading; returns False for readings older than the last one"""
+        if self.value is None:
+            self.value, self.timestamp = value, timestamp
+            return True
+        if timestamp < self.timestamp:
+            return False
+        alpha = 1 - 0.5 ** ((timestamp - self.timestamp) / self.half_life_s)
+        self.value += alpha * (value - self.value)
+        self.timestamp = timestamp
+        return True
+
+
+class _Station:
+    __slots__ = ("rain", "moisture")
+    
+    def __init__(self, resolution_s: float, half_life_s: float):
+        self.rain = {name: RollingSum(window, resolution_s) for name, window in RAINFALL_WINDOWS_S.items()}
+        self.moisture = TimeDecayEMA(half_life_s)
+
+
+class SensorIngestionPipeline:
+    """
+    Rolling aggregates per station feeding an IncrementalRiskState.
+    
+    ingest() is O(1) per reading; flush() writes the changed aggregates to
+    the risk state with one apply_update per factor.
+    """
+    
+    def __init__(
+        self,
+        state: IncrementalRiskState,
+        station_villages: Optional[Dict[str, Sequence[str]]] = None,
+        resolution_s: float = WINDOW_RESOLUTION_S,
+        moisture_half_life_s: float = MOISTURE_HALF_LIFE_S
+    ):
+        """
+        Args:
+            state: Risk state to update
+            station_villages: Villages covered by each station (default: a
+                              station id is the village name)
+            resolution_s: Rainfall window bucket width
+            moisture_half_life_s: Soil moisture EMA half-life
+        """
+        self.state = state
+        self.station_villages = {station: list(villages) for station, villages in (station_villages or {}).items()}
+        self.resolution_s = resolution_s
+        self.moisture_half_life_s = moisture_half_life_s
+        self.clock: Optional[float] = None  # latest reading time seen
+        self.accepted = 0
+        self.rejected = 0  # unknown stations or sensors, readings too late for their window
+        self._known_stations = set(self.station_villages) | {str(name) for name in state.names}
+        self._stations: Dict[str, _Station] = {}
+        self._dirty_moisture: set = set()
+        self._raining: set = set()  # stations with rain in their window (totals decay with time)
+    
+    def _station(self, station: str) -> _Station:
+        state = self._stations.get(station)
+        if state is None:
+            state = self._stations[station] = _Station(self.resolution_s, self.moisture_half_life_s)
+        return state
+    
+    def ingest(self, reading: SensorReading) -> bool:
+        """
+        Fold one reading into its station's aggregates.
+        
+        Returns:
+            True if the reading was used
+        """
+        if reading.station not in self._known_stations:
+            self.rejected += 1
+            return False
+        station = self._station(reading.station)
+        if reading.sensor == "rain_gauge":
+            used = any([window.add(reading.timestamp, reading.value) for window in station.rain.values()])
+            if used:
+                self._raining.add(reading.station)
+        elif reading.sensor == "soil_moisture":
+            used = station.moisture.add(reading.timestamp, reading.value)
+            if used:
+                self._dirty_moisture.add(reading.station)
+        else:
+            used = False
+        
+        if used:
+            self.accepted += 1
+            if self.clock is None or reading.timestamp > self.clock:
+                self.clock = reading.timestamp
+        else:
+            self.rejected += 1
+        return used
+    
+    def ingest_many(self, readings: Iterable[SensorReading]) -> int:
+        """Ingest a batch; returns the number of readings used"""
+        return sum(self.ingest(reading) for reading in readings)
+    
+    def aggregates(self, station: str, now: Optional[float] = None) -> Dict[str, Optional[float]]:
+        """
+        Current aggregates of a station.
+        
+        Returns:
+            Dict with rain_24h, rain_72h (mm) and soil_moisture (% EMA, None if never reported)
+        """
+        now = self.clock if now is None else now
+        state = self._station(station)
+        values = {name: window.value(now) for name, window in state.rain.items()}
+        values["soil_moisture"] = state.moisture.value
+        return values
+    
+    def _villages_of(self, stations: Iterable[str]) -> Tuple[List[str], List[str]]:
+        villages, sources = [], []
+        for station in stations:
+            for village in self.station_villages.get(station, [station]):
+                villages.append(village)
+                sources.append(station)
+        return villages, sources
+    
+    def _push(self, factor: str, values: Dict[str, float]) -> Optional[RiskChangeSet]:
+        villages, sources = self._villages_of(values)
+        column = self.state.factors[factor]
+        changed = [
+            (village, values[station]) for village, station in zip(villages, sources)
+            if column[self.state.index_of(village)] != values[station]
+        ]
+        if not changed:
+            return None
+        names, new_values = zip(*changed)
+        return self.state.apply_update(factor, names, list(new_values))
+    
+    def flush(self, now: Optional[float] = None) -> List[RiskChangeSet]:
+        """
+        Write changed aggregates into the risk state.
+        
+        Rain totals are re-evaluated at `now` for every station with rain in
+        its window (they shrink as old rain leaves the window), moisture for
+        every station with new readings.
+        
+        Args:
+            now: Evaluation time (default: latest reading time)
+        
+        Returns:
+            RiskChangeSets from the state updates (one per factor that moved)
+        """
+        now = self.clock if now is None else now
+        if now is None:
+            return []
+        
+        rainfall = {}
+        for station in list(self._raining):
+            total = self._stations[station].rain[RAINFALL_FACTOR_WINDOW].value(now)
+            rainfall[station] = total
+            if total == 0.0:
+                self._raining.discard(station)
+        moisture = {station: self._stations[station].moisture.value for station in self._dirty_moisture}
+        self._dirty_moisture.clear()
+        
+        change_sets = [self._push("rainfall", rainfall), self._push("soil_moisture", moisture)]
+        return [change_set for change_set in change_sets if change_set is not None]
+
+
+def parse_reading_line(line: str) -> SensorReading:
+    """
+    Parse one reading from a JSON object or a "timestamp,station,sensor,value" CSV line.
+    
+    Raises:
+        ValueError: If the line is not a valid reading
+    """
+    line = line.strip()
+    try:
+        if line.startswith("{"):
+            record = json.loads(line)
+            return SensorReading(
+                station=str(record["station"]),
+                sensor=str(record["sensor"]),
+                value=float(record["value"]),
+                timestamp=float(record["timestamp"])
+            )
+        timestamp, station, sensor, value = next(csv.reader([line]))
+        return SensorReading(station=station, sensor=sensor, value=float(value), timestamp=float(timestamp))
+    except (KeyError, TypeError, ValueError, StopIteration) as e:
+        raise ValueError(f"Invalid sensor reading: {line[:80]!r}") from e
+
+
+def iter_reading_file(path: str) -> Iterator[SensorReading]:
+    """
+    Stream readings from a CSV (header: timestamp,station,sensor,value) or JSON-lines file.
+    
+    Args:
+        path: File path (.jsonl / .json for JSON lines, anything else CSV)
+    
+    Returns:
+        Iterator of SensorReading (blank lines and a CSV header are skipped)
+    """
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip() or line.startswith("timestamp,"):
+                continue
+            yield parse_reading_line(line)
+
+
+class SensorSocketServer:
+    """
+    Local TCP endpoint for gauge gateways: one reading per line (JSON or CSV).
+    
+    Readings are ingested as they arrive; the pipeline is flushed every
+    flush_interval_s and on_changes receives the resulting change sets.
+    """
+    
+    def __init__(
+        self,
+        pipeline: SensorIngestionPipeline,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        flush_interval_s: float = 1.0,
+        on_changes: Optional[Callable[[List[RiskChangeSet]], Any]] = None
+    ):
+        self.pipeline = pipeline
+        self.host = host
+        self.port = port
+        self.flush_interval_s = flush_interval_s
+        self.on_changes = on_changes
+        self.malformed = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._flusher: Optional[asyncio.Task] = None
+    
+    async def start(self) -> Tuple[str, int]:
+        """Start listening; returns the bound (host, port)"""
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self._flusher = asyncio.create_task(self._flush_periodically())
+        self.host, self.port = self._server.sockets[0].getsockname()[:2]
+        return self.host, self.port
+    
+    async def stop(self) -> None:
+        """Stop listening and flush what was received"""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        self.flush()
+    
+    async def __aenter__(self) -> "SensorSocketServer":
+        await self.start()
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
+    
+    def flush(self) -> List[RiskChangeSet]:
+        change_sets = self.pipeline.flush()
+        if change_sets and self.on_changes is not None:
+            self.on_changes(change_sets)
+        return change_sets
+    
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval_s)
+            self.flush()
+    
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            async for line in reader:
+                if not line.strip():
+                    continue
+                try:
+                    self.pipeline.ingest(parse_reading_line(line.decode("utf-8")))
+                except ValueError:
+                    self.malformed += 1
+        finally:
+            writer.close()
@@ -0,0 +1,552 @@
+"""
+NER-Aegis AI - Shelter Assignment Engine
+
+This module places evacuating households into shelters under capacity limits:
+- Urgent phases claim shelter space first (Phase 1 before Phase 2 ...)
+- Greedy nearest-feasible-shelter matching driven by a priority queue
+- Optional min-cost-flow mode minimizing total person-meters travelled
+- Households are never split across shelters
+
+Engineering Principle: Every family gets a bed, the most urgent first
+"""
+
+from typing import Dict, List, Tuple, Any, Optional, Sequence
+from dataclasses import dataclass
+import heapq
+import math
+
+import numpy as np
+
+from logic.spatial_index import haversine_m
+from logic.evacuation_planner import HouseholdArrays, PHASE_THRESHOLDS, assign_evacuation_phases
+
+
+ASSIGNMENT_METHODS = ("greedy", "flow")
+
+_CHUNK_SIZE = 16384  # households ranked against all shelters per matrix product
+
+
+@dataclass
+class Shelter:
+    """Evacuation shelter with a fixed capacity (people)"""
+    name: str
+    latitude: float
+    longitude: float
+    capacity: int
+    type: str = "Emergency Shelter"
+
+
+@dataclass
+class ShelterAssignment:
+    """Household-to-shelter placement"""
+    shelter: np.ndarray  # shelter index per household (-1 = unassigned)
+    distance_m: np.ndarray  # great-circle distance to the shelter (inf = unassigned)
+    occupants: np.ndarray  # people per household
+    phase: np.ndarray  # evacuation phase code per household
+    shelter_names: List[str]
+    capacity: np.ndarray  # people per shelter
+    occupancy: np.ndarray  # people placed per shelter
+    
+    def __len__(self) -> int:
+        return len(self.shelter)
+    
+    @property
+    def assigned(self) -> np.ndarray:
+        return self.shelter >= 0
+    
+    @property
+    def unassigned(self) -> np.ndarray:
+        """Indices of households that found no shelter with room"""
+        return np.flatnonzero(self.shelter < 0)
+    
+    @property
+    def total_person_distance_m(self) -> float:
+        """Objective value: sum of distance x occupants over placed households"""
+        placed = self.assigned
+        return float(np.sum(self.distance_m[placed] * self.occupants[placed]))
+    
+    def shelter_loads(self) -> List[Dict[str, Any]]:
+        """Per-shelter capacity, people placed and household count"""
+        households = np.bincount(self.shelter[self.assigned], minlength=len(self.capacity))
+        return [
+            {
+                "name": name,
+                "capacity": int(self.capacity[s]),
+                "assigned_people": int(self.occupancy[s]),
+                "assigned_households": int(households[s]),
+                "utilization": float(self.occupancy[s] / self.capacity[s]) if self.capacity[s] else 0.0
+            }
+            for s, name in enumerate(self.shelter_names)
+        ]
+
+
+def _household_inputs(households: Any) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """(latitude, longitude, occupants, priority) from HouseholdArrays or Household objects"""
+    if isinstance(households, HouseholdArrays):
+        return households.latitude, households.longitude, households.occupants, households.priority_score
+    return (
+        np.array([hh.location[0] for hh in households], dtype=np.float64),
+        np.array([hh.location[1] for hh in households], dtype=np.float64),
+        np.array([hh.occupants for hh in households], dtype=np.int64),
+        np.array([hh.priority_score for hh in households], dtype=np.float64)
+    )
+
+
+def _unit_vectors(latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """(n, 3) points on the unit sphere; a larger dot product means a shorter great-circle distance"""
+    lat, lon = np.radians(latitudes), np.radians(longitudes)
+    return np.stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)], axis=-1)
+
+
+def _rank_candidates(
+    points: np.ndarray,
+    latitudes: np.ndarray,
+    longitudes: np.ndarray,
+    shelter_xyz: np.ndarray,
+    shelter_lat: np.ndarray,
+    shelter_lon: np.ndarray,
+    k: int,
+    need: Optional[np.ndarray] = None,
+    room: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    k nearest shelters for unit-vector points, nearest first.
+    
+    With need/room, only shelters whose room is at least the point's need are
+    ranked; slots beyond those open shelters get distance inf.
+    """
+    # Rank by dot product (one matrix product), then measure only the k winners
+    similarity = points @ shelter_xyz
+    if need is not None:
+        similarity[room[None, :] < need[:, None]] = -np.inf
+    if k < similarity.shape[1]:
+        nearest = np.argpartition(-similarity, k - 1, axis=1)[:, :k]
+    else:
+        nearest = np.broadcast_to(np.arange(k), similarity.shape).copy()
+    rows = np.arange(len(points))[:, None]
+    nearest_d = haversine_m(latitudes[:, None], longitudes[:, None], shelter_lat[nearest], shelter_lon[nearest])
+    if need is not None:
+        nearest_d[similarity[rows, nearest] == -np.inf] = np.inf
+    by_distance = np.argsort(nearest_d, axis=1, kind="stable")
+    return nearest[rows, by_distance], nearest_d[rows, by_distance]
+
+
+def _nearest_candidates(
+    latitudes: np.ndarray,
+    longitudes: np.ndarray,
+    shelter_lat: np.ndarray,
+    shelter_lon: np.ndarray,
+    k: int,
+    chunk_size: int = _CHUNK_SIZE
+) -> Tuple[np.ndarray, np.ndarray]:
+    """k nearest shelters per point, nearest first, in bounded-memory chunks"""
+    n, k = len(latitudes), min(k, len(shelter_lat))
+    indices = np.empty((n, k), dtype=np.int64)
+    distances = np.empty((n, k), dtype=np.float64)
+    shelter_xyz = _unit_vectors(shelter_lat, shelter_lon).T
+    for start in range(0, n, chunk_size):
+        chunk = slice(start, min(start + chunk_size, n))
+        indices[chunk], distances[chunk] = _rank_candidates(
+            _unit_vectors(latitudes[chunk], longitudes[chunk]), latitudes[chunk], longitudes[chunk],
+            shelter_xyz, shelter_lat, shelter_lon, k
+        )
+    return indices, distances
+
+
+def _greedy_fill(
+    members: np.ndarray,
+    latitudes: np.ndarray,
+    longitudes: np.ndarray,
+    occupants: np.ndarray,
+    priorities: np.ndarray,
+    shelter_lat: np.ndarray,
+    shelter_lon: np.ndarray,
+    remaining: List[int],
+    shelter_out: np.ndarray,
+    distance_out: np.ndarray,
+    k: int
+) -> None:
+    """
+    Place one phase's households: repeatedly take the globally shortest
+    (household, next-candidate shelter) pair from a heap; if the shelter is
+    full, push that household's next candidate instead.
+    
+    A household whose candidates are all full waits in the heap at its last
+    candidate distance (a lower bound on any shelter it has not tried). When
+    such an entry comes up, every waiting household is re-queried at once
+    against the shelters that still have room for it, so crowded clusters
+    cost one vectorized query per wave instead of a full scan per household.
+    """
+    if not len(members):
+        return
+    lat, lon, need = latitudes[members], longitudes[members], occupants[members]
+    occ = need.tolist()
+    neg_priority = (-priorities[members]).tolist()
+    points = _unit_vectors(lat, lon)
+    shelter_xyz = _unit_vectors(shelter_lat, shelter_lon).T
+    
+    def query(positions: Any, width: int) -> Tuple[List[List[int]], List[List[float]]]:
+        """Nearest shelters with room, per household position (open ones only)"""
+        idx, dist = _rank_candidates(
+            points[positions], lat[positions], lon[positions], shelter_xyz, shelter_lat, shelter_lon,
+            min(width, len(remaining)), need=need[positions], room=np.asarray(remaining)
+        )
+        ends = np.isfinite(dist).sum(axis=1).tolist()  # open shelters come first
+        return [row[:end] for row, end in zip(idx.tolist(), ends)], [row[:end] for row, end in zip(dist.tolist(), ends)]
+    
+    cand_idx: List[List[int]] = []
+    cand_dist: List[List[float]] = []
+    for start in range(0, len(members), _CHUNK_SIZE):
+        chunk_idx, chunk_dist = query(np.arange(start, min(start + _CHUNK_SIZE, len(members))), k)
+        cand_idx += chunk_idx
+        cand_dist += chunk_dist
+    version = [0] * len(members)  # bumped when a household's candidates are re-queried
+    width = [k] * len(members)  # candidates asked for in each household's last query (doubles per re-query)
+    waiting: List[int] = []
+    
+    # (distance, -priority, household position, version, candidate rank): ties go to the more urgent household
+    heap = [(cand_dist[j][0], neg_priority[j], j, 0, 0) for j in range(len(members)) if cand_idx[j]]
+    heapq.heapify(heap)
+    
+    while heap:
+        d, neg_p, j, v, rank = heapq.heappop(heap)
+        if v != version[j]:
+            continue
+        if rank == len(cand_idx[j]):
+            # Candidates exhausted: re-query this and every other waiting household
+            batch, waiting = waiting, []
+            batch_width = min(2 * max(width[w] for w in batch), len(remaining))
+            new_idx, new_dist = query(batch, batch_width)
+            for w, row_idx, row_dist in zip(batch, new_idx, new_dist):
+                version[w] += 1
+                width[w] = batch_width
+                cand_idx[w], cand_dist[w] = row_idx, row_dist
+                if row_idx:
+                    heapq.heappush(heap, (row_dist[0], neg_priority[w], w, version[w], 0))
+            continue
+        
+        s = cand_idx[j][rank]
+        if remaining[s] >= occ[j]:
+            remaining[s] -= occ[j]
+            shelter_out[members[j]] = s
+            distance_out[members[j]] = d
+            continue
+        
+        # Shelters only fill up, so skip straight past every candidate that
+        # cannot take this household now and queue the next one that can
+        rank += 1
+        while rank < len(cand_idx[j]) and remaining[cand_idx[j][rank]] < occ[j]:
+            rank += 1
+        if rank < len(cand_idx[j]):
+            heapq.heappush(heap, (cand_dist[j][rank], neg_p, j, v, rank))
+        elif len(cand_idx[j]) == min(width[j], len(remaining)):
+            # Every candidate full, but shelters beyond them may have room
+            waiting.append(j)
+            heapq.heappush(heap, (cand_dist[j][-1], neg_p, j, v, rank))
+
+
+def _flow_fill(
+    members: np.ndarray,
+    latitudes: np.ndarray,
+    longitudes: np.ndarray,
+    occupants: np.ndarray,
+    priorities: np.ndarray,
+    shelter_lat: np.ndarray,
+    shelter_lon: np.ndarray,
+    remaining: List[int],
+    shelter_out: np.ndarray,
+    distance_out: np.ndarray,
+    k: int
+) -> np.ndarray:
+    """
+    Place one phase's households by min-cost flow (successive shortest paths).
+    
+    People flow from households to their k nearest shelters. Each household
+    (most urgent first) is routed along the cheapest residual path, which may
+    move already-placed people between shelters to free a nearer bed; placed
+    households are moved but never dropped. The residual graph is searched
+    over shelters only: moving household h from shelter a to b is an arc
+    a -> b of cost c(h, b) - c(h, a), and each (a, b) keeps a heap of the
+    cheapest household to move. Dijkstra on reduced costs stops at the first
+    shelter with spare capacity, so work stays local while shelters have room.
+    
+    Returns:
+        Households left for the greedy pass: split across shelters by the flow
+        (a basic optimal flow splits fewer households than there are shelters)
+        or with no reachable room
+    """
+    if not len(members):
+        return members
+    cand_idx, cand_dist = _nearest_candidates(latitudes[members], longitudes[members], shelter_lat, shelter_lon, k)
+    cost = [dict(zip(row_idx, row_cost)) for row_idx, row_cost in zip(
+        cand_idx.tolist(), np.rint(cand_dist).astype(np.int64).tolist()  # whole meters keep reduced costs exact
+    )]
+    occ = occupants[members].tolist()
+    n_shelters = len(shelter_lat)
+    
+    flows: List[Dict[int, int]] = [{} for _ in range(len(members))]  # household -> {shelter: people}
+    placed_in: List[Dict[int, int]] = [{} for _ in range(n_shelters)]  # shelter -> {household: people}
+    moves: List[Dict[int, List[Tuple[int, int]]]] = [{} for _ in range(n_shelters)]  # a -> {b: heap of (c(h,b) - c(h,a), h)}
+    potential = [0] * n_shelters  # keeps every residual reduced cost >= 0
+    
+    def place(h: int, s: int, people: int) -> None:
+        if s not in flows[h]:
+            for b, c in cost[h].items():
+                if b != s:
+                    heapq.heappush(moves[s].setdefault(b, []), (c - cost[h][s], h))
+        flows[h][s] = flows[h].get(s, 0) + people
+        placed_in[s][h] = flows[h][s]
+        if not flows[h][s]:
+            del flows[h][s]
+            del placed_in[s][h]
+    
+    def cheapest_move(a: int, b: int) -> Tuple[int, int]:
+        heap = moves[a][b]
+        while heap and heap[0][1] not in placed_in[a]:
+            heapq.heappop(heap)  # household has left shelter a
+        return heap[0] if heap else (0, -1)
+    
+    for h0 in np.lexsort((np.arange(len(members)), -priorities[members])).tolist():
+        supply = occ[h0]
+        while supply > 0:
+            # Household node potential chosen so its arcs have reduced cost >= 0
+            p0 = max(potential[s] - c for s, c in cost[h0].items())
+            dist: Dict[int, float] = {}
+            prev: Dict[int, Tuple[int, int]] = {}  # shelter -> (previous shelter or -1, household moved)
+            heap = []
+            for s, c in cost[h0].items():
+                d = c + p0 - potential[s]
+                if d < dist.get(s, math.inf):
+                    dist[s] = d
+                    prev[s] = (-1, h0)
+                    heap.append((d, s))
+            heapq.heapify(heap)
+            
+            settled = []
+            done = set()
+            target = -1
+            while heap:
+                d, a = heapq.heappop(heap)
+                if a in done:
+                    continue
+                done.add(a)
+                settled.append(a)
+                if remaining[a] > 0:
+                    target = a
+                    break
+                for b in list(moves[a]):
+                    delta, h = cheapest_move(a, b)
+                    if h < 0:
+                        del moves[a][b]
+                        continue
+                    nd = d + delta + potential[a] - potential[b]
+                    if nd < dist.get(b, math.inf):
+                        dist[b] = nd
+                        prev[b] = (a, h)
+                        heapq.heappush(heap, (nd, b))
+            
+            if target < 0:
+                break  # no shelter with room reachable from this household
+            
+            # Walk back: h0 -> s1 -> (move h1) -> s2 ... -> target
+            path = []
+            b = target
+            while b >= 0:
+                a, h = prev[b]
+                path.append((a, b, h))
+                b = a
+            pushed = min([supply, remaining[target]] + [placed_in[a][h] for a, _, h in path if a >= 0])
+            for a, b, h in path:
+                if a >= 0:
+                    place(h, a, -pushed)
+                place(h, b, pushed)
+            remaining[target] -= pushed
+            supply -= pushed
+            
+            limit = dist[target]
+            for a in settled:
+                potential[a] += dist[a] - limit
+        
+        if supply > 0:
+            # Could not place the whole household: release what was placed
+            for s, people in list(flows[h0].items()):
+                remaining[s] += people
+                place(h0, s, -people)
+    
+    leftover = []
+    for j, household_flows in enumerate(flows):
+        if len(household_flows) == 1:
+            (s, _), = household_flows.items()
+            shelter_out[members[j]] = s
+            distance_out[members[j]] = cand_dist[j][cand_idx[j] == s][0]
+        else:
+            for s, people in household_flows.items():
+                remaining[s] += people
+            leftover.append(j)
+    return members[np.asarray(leftover, dtype=np.int64)]
+
+
+def _relocate_fill(
+    stuck: np.ndarray,
+    members: np.ndarray,
+    latitudes: np.ndarray,
+    longitudes: np.ndarray,
+    occupants: np.ndarray,
+    shelter_lat: np.ndarray,
+    shelter_lon: np.ndarray,
+    remaining: List[int],
+    shelter_out: np.ndarray,
+    distance_out: np.ndarray,
+    k: int
+) -> None:
+    """
+    Place households the greedy pass could not by moving one placed household.
+    
+    For a stuck household h and a candidate shelter s, a household g already in
+    s (same phase) is moved to another candidate shelter with room if that frees
+    enough space for h in s; the cheapest such move (added person-meters) wins.
+    This repairs the typical loss from un-splitting a flow solution: a small
+    household sitting in the only shelter big enough for a large one.
+    """
+    if not len(stuck):
+        return
+    cand_idx, cand_dist = _nearest_candidates(latitudes[members], longitudes[members], shelter_lat, shelter_lon, k)
+    position = {int(h): j for j, h in enumerate(members.tolist())}
+    
+    def move_options() -> Dict[int, List[Tuple[int, int, float]]]:
+        """shelter -> (placed household, nearest other candidate with room for it, distance), members order"""
+        current = shelter_out[members]
+        room = (np.asarray(remaining)[cand_idx] >= occupants[members][:, None]) & (cand_idx != current[:, None])
+        room &= (current >= 0)[:, None]
+        first = room.argmax(axis=1)
+        options: Dict[int, List[Tuple[int, int, float]]] = {}
+        for j in np.flatnonzero(room[np.arange(len(members)), first]).tolist():
+            options.setdefault(int(current[j]), []).append(
+                (int(members[j]), int(cand_idx[j, first[j]]), float(cand_dist[j, first[j]]))
+            )
+        return options
+    
+    # Rebuilt only after a successful move, the only time room changes
+    movable = move_options()
+    for h in stuck.tolist():
+        if shelter_out[h] >= 0:
+            continue
+        j = position[h]
+        best = None  # (added cost, shelter for h, distance, moved household, its new shelter, its distance)
+        for s, d in zip(cand_idx[j].tolist(), cand_dist[j].tolist()):
+            for g, t, dt in movable.get(s, ()):
+                if remaining[s] + occupants[g] < occupants[h]:
+                    continue
+                added = d * occupants[h] + (dt - distance_out[g]) * occupants[g]
+                if best is None or added < best[0]:
+                    best = (added, s, d, g, t, dt)
+        if best is None:
+            continue
+        _, s, d, g, t, dt = best
+        remaining[s] += occupants[g] - occupants[h]
+        remaining[t] -= occupants[g]
+        shelter_out[g], distance_out[g] = t, dt
+        shelter_out[h], distance_out[h] = s, d
+        movable = move_options()
+
+
+def _fill_phases(
+    method: str,
+    phase: np.ndarray,
+    n_phases: int,
+    latitudes: np.ndarray,
+    longitudes: np.ndarray,
+    occupants: np.ndarray,
+    priorities: np.ndarray,
+    shelter_lat: np.ndarray,
+    shelter_lon: np.ndarray,
+    capacity: np.ndarray,
+    k: int
+) -> Tuple[np.ndarray, np.ndarray, List[int]]:
+    """(shelter, distance, remaining capacity) after placing phases 0 .. n_phases - 1 in order"""
+    shelter_out = np.full(len(phase), -1, dtype=np.int64)
+    distance_out = np.full(len(phase), np.inf)
+    remaining = capacity.tolist()
+    args = (latitudes, longitudes, occupants)
+    for p in range(n_phases):
+        members = np.flatnonzero(phase == p)
+        leftover = members
+        if method == "flow":
+            leftover = _flow_fill(members, *args, priorities, shelter_lat, shelter_lon, remaining, shelter_out, distance_out, k)
+        _greedy_fill(leftover, *args, priorities, shelter_lat, shelter_lon, remaining, shelter_out, distance_out, k)
+        if method == "flow":
+            stuck = leftover[shelter_out[leftover] < 0]
+            _relocate_fill(stuck, members, *args, shelter_lat, shelter_lon, remaining, shelter_out, distance_out, k)
+    return shelter_out, distance_out, remaining
+
+
+def _outcome(shelter_out: np.ndarray, distance_out: np.ndarray, occupants: np.ndarray, phase: np.ndarray, n_phases: int) -> Tuple:
+    """Sort key, better first: more people placed phase by phase (most urgent first), then less person-distance"""
+    placed = shelter_out >= 0
+    people = [-int(occupants[placed & (phase == p)].sum()) for p in range(n_phases)]
+    return tuple(people) + (float(np.sum(distance_out[placed] * occupants[placed])),)
+
+
+def assign_shelters(
+    households: Any,
+    shelters: Sequence[Shelter],
+    method: str = "greedy",
+    candidates: int = 8,
+    thresholds: Tuple[float, ...] = PHASE_THRESHOLDS,
+    include_monitoring: bool = False
+) -> ShelterAssignment:
+    """
+    Assign evacuating households to shelters without exceeding capacity.
+    
+    Phases are placed in order of urgency, so Phase 1 households always get
+    first claim on shelter space. Within a phase:
+    - greedy: nearest shelter with room, shortest household-shelter pairs
+      settled first (O(n log n), the default for district-wide runs)
+    - flow: min-cost flow minimizing total person-meters over each household's
+      candidate shelters; the few households the flow splits are placed greedily,
+      then by moving one placed household; if plain greedy places more people
+      (phase by phase) or the same people for less distance, its result is kept
+    
+    Monitoring-phase households are not evacuating and get no shelter space
+    unless include_monitoring is set (they are then placed last).
+    
+    Args:
+        households: HouseholdArrays or list of Household objects
+        shelters: Shelters with coordinates and capacity (people)
+        method: "greedy" or "flow"
+        candidates: Nearest shelters considered per household before
+                    falling back to the full shelter list
+        thresholds: Phase thresholds (see summarize_evacuation_phases)
+        include_monitoring: Also place Monitoring-phase households
+    
+    Returns:
+        ShelterAssignment (Monitoring households unassigned unless included)
+    """
+    if method not in ASSIGNMENT_METHODS:
+        raise ValueError(f"method must be one of {ASSIGNMENT_METHODS}, got '{method}'")
+    
+    latitudes, longitudes, occupants, priorities = _household_inputs(households)
+    occupants = np.asarray(occupants, dtype=np.int64)
+    shelter_lat = np.array([s.latitude for s in shelters], dtype=np.float64)
+    shelter_lon = np.array([s.longitude for s in shelters], dtype=np.float64)
+    capacity = np.array([s.capacity for s in shelters], dtype=np.int64)
+    
+    phase = assign_evacuation_phases(priorities, thresholds)
+    n_phases = len(thresholds) + (1 if include_monitoring else 0) if len(shelters) else 0
+    args = (phase, n_phases, latitudes, longitudes, occupants, priorities, shelter_lat, shelter_lon, capacity, candidates)
+    shelter_out, distance_out, remaining = _fill_phases(method, *args)
+    if method == "flow" and n_phases:
+        # Un-splitting the flow can lose to plain greedy on small, tight instances
+        greedy = _fill_phases("greedy", *args)
+        if _outcome(greedy[0], greedy[1], occupants, phase, n_phases) < _outcome(shelter_out, distance_out, occupants, phase, n_phases):
+            shelter_out, distance_out, remaining = greedy
+    
+    return ShelterAssignment(
+        shelter=shelter_out,
+        distance_m=distance_out,
+        occupants=occupants,
+        phase=phase,
+        shelter_names=[s.name for s in shelters],
+        capacity=capacity,
+        occupancy=capacity - np.asarray(remaining, dtype=np.int64)
+    )
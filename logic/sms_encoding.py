@@ -0,0 +1,211 @@
+"""
+NER-Aegis AI - SMS Encoding
+
+This module sizes and splits SMS text the way the network bills it:
+- GSM-7 vs UCS-2 detection (any Devanagari, emoji or other non-GSM character forces UCS-2)
+- Length in encoding units: GSM-7 septets (extension characters cost two),
+  UCS-2 code units (characters outside the BMP cost two)
+- Multipart segmentation that never splits an escape sequence or surrogate pair
+- Batch packing of recipients that receive an identical payload
+
+Engineering Principle: Count what the gateway counts, not Python characters
+"""
+
+from typing import Dict, List, Iterable, Optional, Tuple
+from dataclasses import dataclass, field
+
+
+GSM7 = "GSM-7"
+UCS2 = "UCS-2"
+
+# GSM 03.38 default alphabet (one septet each)
+GSM7_BASIC = frozenset(
+    "@£$¥èéùìòÇ\nØø\rÅåΔ_ΦΓΛΩΠΨΣΘΞÆæßÉ !\"#¤%&'()*+,-./0123456789:;<=>?"
+    "¡ABCDEFGHIJKLMNOPQRSTUVWXYZÄÖÑÜ§¿abcdefghijklmnopqrstuvwxyzäöñüà"
+)
+
+# GSM 03.38 extension table (escape + character: two septets each)
+GSM7_EXTENSION = frozenset("\f^{}\\[~]|€")
+
+_GSM7_CHARSET = GSM7_BASIC | GSM7_EXTENSION
+
+# (single-message limit, per-segment limit once a user data header is needed)
+SMS_SEGMENT_LIMITS = {
+    GSM7: (160, 153),
+    UCS2: (70, 67)
+}
+
+TRUNCATION_MARKER = "..."
+
+
+@dataclass
+class SmsInfo:
+    """Encoding and billed size of one SMS text"""
+    encoding: str  # GSM7 or UCS2
+    units: int  # septets (GSM-7) or UTF-16 code units (UCS-2)
+    segments: int  # messages the network bills
+
+
+@dataclass
+class SmsBatch:
+    """One gateway request: an identical payload for many recipients"""
+    message: str
+    encoding: str
+    segments: int
+    recipients: List[str] = field(default_factory=list)
+    
+    @property
+    def billed_segments(self) -> int:
+        return self.segments * len(self.recipients)
+
+
+def sms_encoding(text: str) -> str:
+    """GSM7 if every character is in the GSM 03.38 alphabet, else UCS2"""
+    return GSM7 if _GSM7_CHARSET.issuperset(text) else UCS2
+
+
+def _unit_widths(text: str, encoding: str) -> List[int]:
+    """Encoded width of each character"""
+    if encoding == GSM7:
+        return [2 if ch in GSM7_EXTENSION else 1 for ch in text]
+    return [2 if ord(ch) > 0xFFFF else 1 for ch in text]
+
+
+def sms_units(text: str, encoding: Optional[str] = None) -> int:
+    """
+    Encoded length of text.
+    
+    Args:
+        text: Message text
+        encoding: GSM7/UCS2 (detected if omitted)
+    
+    Returns:
+        GSM-7 septets or UCS-2 code units
+    """
+    encoding = encoding or sms_encoding(text)
+    if encoding == GSM7:
+        return len(text) + sum(1 for ch in text if ch in GSM7_EXTENSION)
+    return len(text.encode("utf-16-le")) // 2
+
+
+def sms_segment_count(units: int, encoding: str) -> int:
+    """Segments billed for a message of `units` encoded units"""
+    single, multipart = SMS_SEGMENT_LIMITS[encoding]
+    if units <= single:
+        return 1 if units else 0
+    return -(-units // multipart)
+
+
+def analyze_sms(text: str) -> SmsInfo:
+    """
+    Encoding, encoded length and billed segments of an SMS.
+    
+    Args:
+        text: Message text
+    
+    Returns:
+        SmsInfo
+    """
+    encoding = sms_encoding(text)
+    units = sms_units(text, encoding)
+    return SmsInfo(encoding=encoding, units=units, segments=sms_segment_count(units, encoding))
+
+
+def segment_sms(text: str) -> List[str]:
+    """
+    Split text into the parts sent as a concatenated SMS.
+    
+    Parts are cut at the encoding's per-segment limit without splitting a
+    GSM-7 escape sequence or a UTF-16 surrogate pair.
+    
+    Args:
+        text: Message text
+    
+    Returns:
+        List of parts (one part if the text fits a single SMS)
+    """
+    encoding = sms_encoding(text)
+    single, multipart = SMS_SEGMENT_LIMITS[encoding]
+    widths = _unit_widths(text, encoding)
+    if sum(widths) <= single:
+        return [text] if text else []
+    
+    parts, start, used = [], 0, 0
+    for i, width in enumerate(widths):
+        if used + width > multipart:
+            parts.append(text[start:i])
+            start, used = i, 0
+        used += width
+    parts.append(text[start:])
+    return parts
+
+
+def _fitting_prefix(text: str, encoding: str, max_segments: int) -> int:
+    """Length of the longest prefix that, plus the truncation marker, fits max_segments in encoding"""
+    single, multipart = SMS_SEGMENT_LIMITS[encoding]
+    budget = (single if max_segments <= 1 else multipart * max_segments) - sms_units(TRUNCATION_MARKER, encoding)
+    used = 0
+    for i, width in enumerate(_unit_widths(text, encoding)):
+        if used + width > budget:
+            return i
+        used += width
+    return len(text)
+
+
+def fit_sms(text: str, max_segments: int = 1) -> str:
+    """
+    Truncate text (with "...") so it is billed as at most max_segments segments.
+    
+    The budget follows the encoding of what is kept: when the text needs
+    UCS-2 only after a GSM-7 prefix, that prefix may use the GSM-7 budget.
+    
+    Args:
+        text: Message text
+        max_segments: Segment budget
+    
+    Returns:
+        text unchanged if it fits, else its longest fitting prefix plus "..."
+    """
+    if analyze_sms(text).segments <= max_segments:
+        return text
+    
+    encoding = sms_encoding(text)
+    cut = _fitting_prefix(text, encoding, max_segments)
+    if encoding == UCS2:
+        gsm_end = next((i for i, ch in enumerate(text) if ch not in _GSM7_CHARSET), len(text))
+        cut = max(cut, _fitting_prefix(text[:gsm_end], GSM7, max_segments))
+    return text[:cut] + TRUNCATION_MARKER
+
+
+def pack_sms_batches(messages: Iterable[Tuple[str, str]], max_recipients: int = 1000) -> List[SmsBatch]:
+    """
+    Group (recipient, message) pairs into one gateway request per identical payload.
+    
+    Each distinct message is analyzed once; groups larger than max_recipients
+    are split into several batches. Batches follow first-appearance order.
+    
+    Args:
+        messages: (recipient, message text) pairs
+        max_recipients: Gateway limit on recipients per request
+    
+    Returns:
+        List of SmsBatch
+    """
+    if max_recipients <= 0:
+        raise ValueError(f"max_recipients must be positive, got {max_recipients}")
+    
+    groups: Dict[str, List[str]] = {}
+    for recipient, message in messages:
+        groups.setdefault(message, []).append(recipient)
+    
+    batches = []
+    for message, recipients in groups.items():
+        info = analyze_sms(message)
+        for start in range(0, len(recipients), max_recipients):
+            batches.append(SmsBatch(
+                message=message,
+                encoding=info.encoding,
+                segments=info.segments,
+                recipients=recipients[start:start + max_recipients]
+            ))
+    return batches
@@ -0,0 +1,204 @@
+"""
+NER-Aegis AI - Spatial Index
+
+This module provides fast spatial lookups over household and village locations:
+- Uniform lat/lon grid hash with points sorted by cell key
+- Radius queries (households near a slope, villages near a shelter)
+- Nearest-neighbour queries with expanding ring search
+- Bounding-box queries (villages covered by a rainfall grid cell)
+
+Engineering Principle: Answer spatial questions without scanning every household
+"""
+
+from typing import Tuple, Any
+import math
+
+import numpy as np
+
+
+EARTH_RADIUS_M = 6_371_000.0
+METERS_PER_DEGREE = math.pi * EARTH_RADIUS_M / 180
+
+
+def haversine_m(lat1: Any, lon1: Any, lat2: Any, lon2: Any) -> np.ndarray:
+    """
+    Great-circle distance in meters (vectorized, broadcasts like NumPy).
+    
+    Args:
+        lat1, lon1: First point(s) in degrees
+        lat2, lon2: Second point(s) in degrees
+    
+    Returns:
+        Distance(s) in meters
+    """
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(x, dtype=np.float64)) for x in (lat1, lon1, lat2, lon2))
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+class SpatialGridIndex:
+    """
+    Grid-hash index over (lat, lon) points.
+    
+    Points are bucketed into cells of at least cell_size_m on each side and
+    sorted by cell key, so every grid row of a query window is one contiguous
+    slice found with two binary searches. Query results are indices into the
+    arrays the index was built from.
+    """
+    
+    def __init__(self, latitudes: Any, longitudes: Any, cell_size_m: float = 250.0):
+        """
+        Build the index.
+        
+        Args:
+            latitudes: Point latitudes in degrees
+            longitudes: Point longitudes in degrees
+            cell_size_m: Minimum cell edge in meters (roughly the typical query radius / 2)
+        """
+        latitudes = np.asarray(latitudes, dtype=np.float64)
+        longitudes = np.asarray(longitudes, dtype=np.float64)
+        if latitudes.shape != longitudes.shape or latitudes.ndim != 1:
+            raise ValueError("latitudes and longitudes must be 1D arrays of equal length")
+        if cell_size_m <= 0:
+            raise ValueError(f"cell_size_m must be positive, got {cell_size_m}")
+        
+        self.size = len(latitudes)
+        self.cell_size_m = float(cell_size_m)
+        
+        if self.size:
+            self.origin = (float(latitudes.min()), float(longitudes.min()))
+            max_abs_lat = float(np.abs(latitudes).max())
+        else:
+            self.origin = (0.0, 0.0)
+            max_abs_lat = 0.0
+        
+        # Longitude cells sized at the highest latitude so every cell is >= cell_size_m wide
+        self.cell_deg_lat = cell_size_m / METERS_PER_DEGREE
+        self.cell_deg_lon = cell_size_m / (METERS_PER_DEGREE * max(math.cos(math.radians(max_abs_lat)), 1e-6))
+        
+        rows = self._rows(latitudes)
+        cols = self._cols(longitudes)
+        self.n_rows = int(rows.max()) + 1 if self.size else 0
+        self.n_cols = int(cols.max()) + 1 if self.size else 0
+        
+        keys = rows * self.n_cols + cols
+        self.order = np.argsort(keys, kind="stable")
+        self.keys = keys[self.order]
+        
+        # Coordinates in cell order so each query row reads contiguous memory
+        self.latitudes = latitudes[self.order]
+        self.longitudes = longitudes[self.order]
+    
+    def __len__(self) -> int:
+        return self.size
+    
+    def _rows(self, latitudes: Any) -> np.ndarray:
+        return np.floor((np.asarray(latitudes) - self.origin[0]) / self.cell_deg_lat).astype(np.int64)
+    
+    def _cols(self, longitudes: Any) -> np.ndarray:
+        return np.floor((np.asarray(longitudes) - self.origin[1]) / self.cell_deg_lon).astype(np.int64)
+    
+    def _window(self, row_lo: int, row_hi: int, col_lo: int, col_hi: int) -> np.ndarray:
+        """Positions (in cell order) of all points in an inclusive cell window"""
+        row_lo, row_hi = max(row_lo, 0), min(row_hi, self.n_rows - 1)
+        col_lo, col_hi = max(col_lo, 0), min(col_hi, self.n_cols - 1)
+        if row_lo > row_hi or col_lo > col_hi:
+            return np.empty(0, dtype=np.int64)
+        
+        row_keys = np.arange(row_lo, row_hi + 1, dtype=np.int64) * self.n_cols
+        starts = np.searchsorted(self.keys, row_keys + col_lo, side="left")
+        ends = np.searchsorted(self.keys, row_keys + col_hi, side="right")
+        
+        if len(starts) == 1:
+            return np.arange(starts[0], ends[0])
+        return np.concatenate([np.arange(s, e) for s, e in zip(starts, ends) if e > s] or [np.empty(0, dtype=np.int64)])
+    
+    def query_radius(self, lat: float, lon: float, radius_m: float, sort: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find all points within radius_m of (lat, lon).
+        
+        Args:
+            lat, lon: Query location in degrees
+            radius_m: Search radius in meters
+            sort: Order results nearest first
+        
+        Returns:
+            Tuple of (point indices, distances in meters)
+        """
+        if not self.size:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        
+        span = int(math.ceil(radius_m / self.cell_size_m))
+        row, col = int(self._rows(lat)), int(self._cols(lon))
+        positions = self._window(row - span, row + span, col - span, col + span)
+        
+        distances = haversine_m(lat, lon, self.latitudes[positions], self.longitudes[positions])
+        inside = distances <= radius_m
+        positions, distances = positions[inside], distances[inside]
+        
+        if sort:
+            by_distance = np.argsort(distances, kind="stable")
+            positions, distances = positions[by_distance], distances[by_distance]
+        return self.order[positions], distances
+    
+    def query_nearest(self, lat: float, lon: float, k: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the k points nearest to (lat, lon).
+        
+        Args:
+            lat, lon: Query location in degrees
+            k: Number of neighbours
+        
+        Returns:
+            Tuple of (point indices, distances in meters), nearest first
+        """
+        k = min(k, self.size)
+        if k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        
+        row, col = int(self._rows(lat)), int(self._cols(lon))
+        # Ring of cells guaranteed to cover the whole grid from the query cell
+        max_span = max(row, self.n_rows - 1 - row, col, self.n_cols - 1 - col, 0)
+        
+        span = 0
+        while True:
+            positions = self._window(row - span, row + span, col - span, col + span)
+            if len(positions) >= k or span >= max_span:
+                break
+            span = min(max(1, span * 2), max_span)
+        
+        distances = haversine_m(lat, lon, self.latitudes[positions], self.longitudes[positions])
+        kth = np.partition(distances, k - 1)[k - 1]
+        
+        # Points outside the window are at least span cells away; widen until the
+        # k-th candidate is provably closer than anything not yet searched
+        needed = int(math.ceil(kth / self.cell_size_m)) + 1
+        if needed > span and span < max_span:
+            span = min(needed, max_span)
+            positions = self._window(row - span, row + span, col - span, col + span)
+            distances = haversine_m(lat, lon, self.latitudes[positions], self.longitudes[positions])
+        
+        nearest = np.argpartition(distances, k - 1)[:k] if k < len(distances) else np.arange(len(distances))
+        nearest = nearest[np.argsort(distances[nearest], kind="stable")]
+        return self.order[positions[nearest]], distances[nearest]
+    
+    def query_bbox(self, min_lat: float, min_lon: float, max_lat: float, max_lon: float) -> np.ndarray:
+        """
+        Find all points inside a lat/lon bounding box (e.g. a rainfall grid cell).
+        
+        Returns:
+            Point indices (in index order)
+        """
+        if not self.size:
+            return np.empty(0, dtype=np.int64)
+        
+        positions = self._window(
+            int(self._rows(min_lat)), int(self._rows(max_lat)),
+            int(self._cols(min_lon)), int(self._cols(max_lon))
+        )
+        lats, lons = self.latitudes[positions], self.longitudes[positions]
+        inside = (lats >= min_lat) & (lats <= max_lat) & (lons >= min_lon) & (lons <= max_lon)
+        return self.order[positions[inside]]
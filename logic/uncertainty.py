@@ -0,0 +1,196 @@
+"""
+NER-Aegis AI - Monte Carlo Risk Uncertainty
+
+This module replaces fixed ±N confidence bands with sampled uncertainty:
+- Measurement noise per factor (absolute + relative standard deviation),
+  overridable per village (e.g. a village far from its rain gauge)
+- Thousands of noisy draws per village, scored in one batched NumPy pass
+  with the same formula as compute_risk_score
+- Score percentiles and the probability of crossing each alert threshold
+- Seeded: the same inputs and seed always give the same bands
+
+Engineering Principle: Say how sure we are, not just what we think
+"""
+
+from typing import Dict, Any, Optional, Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+from statistics import NormalDist
+
+import numpy as np
+
+from logic.risk_engine import RISK_FACTORS, RISK_FACTOR_SCALES, _factor_columns, _score_columns
+from logic.alert_engine import ALERT_LEVELS, ALERT_THRESHOLDS
+
+
+# Measurement noise per factor as (absolute SD, relative SD): a reading x is
+# drawn as x + N(0, absolute + relative * x), floored at 0
+FACTOR_NOISE = {
+    "rainfall": (5.0, 0.15),  # gauge catch error and spatial interpolation
+    "slope": (1.5, 0.0),  # DEM resolution
+    "soil_moisture": (4.0, 0.05),  # sensor calibration
+    "deforestation": (2.0, 0.0),  # land-cover classification
+    "road_cuts": (1.0, 0.0)  # survey age
+}
+
+DEFAULT_DRAWS = 1000
+DEFAULT_PERCENTILES = (5, 50, 95)
+
+# Normal draws are 16-bit uniform integers mapped through a table of 65,536
+# normal quantiles: ~3x faster than Generator.standard_normal, and exact to
+# float32 resolution except beyond ±4.2 SD (where the table is clipped)
+_NORMAL_TABLE_BITS = 16
+
+
+@lru_cache(maxsize=1)
+def _normal_table() -> np.ndarray:
+    """Midpoint quantiles of N(0, 1) for every 16-bit draw"""
+    size = 1 << _NORMAL_TABLE_BITS
+    inv_cdf = NormalDist().inv_cdf
+    return np.array([inv_cdf((k + 0.5) / size) for k in range(size)], dtype=np.float32)
+
+
+def _sorted_percentiles(sorted_rows: np.ndarray, percentiles: Sequence[float]) -> np.ndarray:
+    """np.percentile (linear interpolation) along axis 1 of row-sorted data"""
+    draws = sorted_rows.shape[1]
+    positions = np.asarray(percentiles, dtype=np.float64) / 100 * (draws - 1)
+    lower = np.floor(positions).astype(np.int64)
+    upper = np.minimum(lower + 1, draws - 1)
+    fraction = positions - lower
+    low_values = sorted_rows[:, lower].astype(np.float64)
+    high_values = sorted_rows[:, upper].astype(np.float64)
+    return (low_values + (high_values - low_values) * fraction).T
+
+
+@dataclass
+class RiskUncertainty:
+    """Monte Carlo score distribution per village"""
+    scores: np.ndarray  # float64, score of the measured (noise-free) factors
+    mean: np.ndarray  # float64, mean sampled score
+    std: np.ndarray  # float64, standard deviation of sampled scores
+    percentiles: Dict[float, np.ndarray]  # percentile -> float64 score per village
+    threshold_probabilities: np.ndarray  # (n, len(ALERT_THRESHOLDS)), P(score >= threshold)
+    draws: int
+    
+    def __len__(self) -> int:
+        return len(self.scores)
+    
+    @property
+    def interval(self) -> np.ndarray:
+        """(n, 2) band between the lowest and highest computed percentiles"""
+        low, high = min(self.percentiles), max(self.percentiles)
+        return np.column_stack([self.percentiles[low], self.percentiles[high]])
+    
+    @property
+    def uncertainty(self) -> np.ndarray:
+        """Half-width of the band, in score points (the sampled "±N")"""
+        band = self.interval
+        return (band[:, 1] - band[:, 0]) / 2
+    
+    @property
+    def alert_level_probabilities(self) -> np.ndarray:
+        """(n, len(ALERT_LEVELS)) probability of each alert level; rows sum to 1"""
+        at_least = np.column_stack([np.ones(len(self)), self.threshold_probabilities, np.zeros(len(self))])
+        return at_least[:, :-1] - at_least[:, 1:]
+    
+    def probability_of(self, alert_level: str) -> np.ndarray:
+        """P(alert level at or above alert_level) per village"""
+        code = ALERT_LEVELS.index(alert_level)
+        return np.ones(len(self)) if code == 0 else self.threshold_probabilities[:, code - 1]
+
+
+def factor_noise_sd(factors: Any, noise: Optional[Dict[str, Any]] = None) -> Dict[str, np.ndarray]:
+    """
+    Noise standard deviation per factor and village.
+    
+    Args:
+        factors: DataFrame/mapping with RISK_FACTORS columns, or (n, 5) array
+        noise: Optional overrides, factor name -> absolute SD (scalar or per village)
+    
+    Returns:
+        Dict factor name -> SD array of shape (n,)
+    """
+    columns = _factor_columns(factors)
+    sds = {}
+    for name, column in zip(RISK_FACTORS, columns):
+        if noise is not None and name in noise:
+            sd = np.asarray(noise[name], dtype=np.float64)
+        else:
+            absolute, relative = FACTOR_NOISE[name]
+            sd = absolute + relative * np.abs(column)
+        sds[name] = np.broadcast_to(sd, column.shape)
+    return sds
+
+
+def simulate_risk_uncertainty(
+    factors: Any,
+    draws: int = DEFAULT_DRAWS,
+    seed: int = 0,
+    noise: Optional[Dict[str, Any]] = None,
+    percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+    chunk_size: int = 131_072
+) -> RiskUncertainty:
+    """
+    Sample factor measurement noise and score every draw.
+    
+    Draws are float32 (ample for 0-100 scores) and processed in chunks of
+    villages small enough to stay in CPU cache, so memory stays bounded and
+    1,000 villages x 1,000 draws takes a few tens of milliseconds.
+    
+    Args:
+        factors: DataFrame/mapping with RISK_FACTORS columns, or (n, 5) array
+        draws: Samples per village
+        seed: Random seed
+        noise: Optional per-factor absolute SD overrides (see factor_noise_sd)
+        percentiles: Score percentiles to report
+        chunk_size: Village x draw samples scored at once
+    
+    Returns:
+        RiskUncertainty
+    """
+    columns = _factor_columns(factors)
+    n = len(np.atleast_1d(columns[0]))
+    columns = [np.atleast_1d(column).astype(np.float32) for column in columns]
+    sds = [np.atleast_1d(sd).astype(np.float32) for sd in factor_noise_sd(factors, noise).values()]
+    table = _normal_table()
+    
+    # Each factor's points are clip((x + sd * z) * points / full_scale, 0, points);
+    # scaling x and sd up front makes that one multiply-add and one clip per draw
+    scaled = []
+    for name, column, sd in zip(RISK_FACTORS, columns, sds):
+        full_scale, points = RISK_FACTOR_SCALES[name]
+        factor = np.float32(points / full_scale)
+        scaled.append((column * factor, sd * factor, np.float32(points)))
+    
+    mean = np.empty(n)
+    std = np.empty(n)
+    quantiles = np.empty((len(percentiles), n))
+    exceed = np.empty((n, len(ALERT_THRESHOLDS)))
+    
+    rng = np.random.default_rng(seed)
+    rows = max(1, chunk_size // max(draws, 1))
+    for start in range(0, n, rows):
+        stop = min(start + rows, n)
+        sampled = np.zeros((stop - start, draws), dtype=np.float32)
+        for column, sd, points in scaled:
+            sample = table[rng.integers(0, len(table), (stop - start, draws), dtype=np.uint16)]
+            sample *= sd[start:stop, None]
+            sample += column[start:stop, None]
+            np.clip(sample, 0, points, out=sample)
+            sampled += sample  # points sum to 100, so no final cap is needed
+        sampled.sort(axis=1)
+        
+        mean[start:stop] = sampled.mean(axis=1)
+        std[start:stop] = sampled.std(axis=1)
+        quantiles[:, start:stop] = _sorted_percentiles(sampled, percentiles)
+        for j, threshold in enumerate(ALERT_THRESHOLDS):
+            exceed[start:stop, j] = np.count_nonzero(sampled >= threshold, axis=1) / draws
+    
+    return RiskUncertainty(
+        scores=_score_columns(*_factor_columns(factors)).astype(np.float64).reshape(n),
+        mean=mean,
+        std=std,
+        percentiles={p: quantiles[i] for i, p in enumerate(percentiles)},
+        threshold_probabilities=exceed,
+        draws=draws
+    )
@@ -0,0 +1,195 @@
+"""
+NER-Aegis AI - Columnar Village Store
+
+This module holds village data as parallel NumPy arrays (struct-of-arrays):
+- One vectorized risk scoring pass for every village
+- Precomputed risk category, alert level and risk ranking
+- Cheap aggregate queries for dashboard panels
+
+Engineering Principle: Compute once per data refresh, read many times per render
+"""
+
+from typing import Dict, Tuple, Any, Iterable, Optional
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from logic.risk_engine import (
+    compute_risk_scores,
+    RISK_CATEGORIES,
+    RISK_CATEGORY_COLORS
+)
+from logic.alert_engine import determine_alert_level_codes, ALERT_LEVELS
+from logic.spatial_index import SpatialGridIndex
+
+
+# Column order of village records: name, lat, lon, population, households,
+# rainfall, slope, soil_moisture, deforestation, road_cuts
+VILLAGE_RECORD_FIELDS = (
+    "name", "latitude", "longitude", "population", "households",
+    "rainfall", "slope", "soil_moisture", "deforestation", "road_cuts"
+)
+
+
+@dataclass
+class VillageTable:
+    """Array-backed village store with precomputed risk intelligence"""
+    name: np.ndarray  # object (str)
+    latitude: np.ndarray  # float64
+    longitude: np.ndarray  # float64
+    population: np.ndarray  # int64
+    households: np.ndarray  # int64
+    rainfall: np.ndarray  # mm
+    slope: np.ndarray  # degrees
+    soil_moisture: np.ndarray  # percentage
+    deforestation: np.ndarray  # percentage
+    road_cuts: np.ndarray  # percentage
+    risk_score: np.ndarray  # float64, 0-100
+    category_code: np.ndarray  # uint8, index into RISK_CATEGORIES
+    alert_code: np.ndarray  # uint8, index into ALERT_LEVELS
+    rank: np.ndarray  # village indices ordered by risk score, highest first
+    _name_index: Dict[str, int] = field(default_factory=dict, repr=False, compare=False)
+    _spatial_index: Optional[SpatialGridIndex] = field(default=None, repr=False, compare=False)
+    
+    @classmethod
+    def from_columns(
+        cls,
+        name: Iterable[str],
+        latitude: Any,
+        longitude: Any,
+        population: Any,
+        households: Any,
+        rainfall: Any,
+        slope: Any,
+        soil_moisture: Any,
+        deforestation: Any,
+        road_cuts: Any
+    ) -> "VillageTable":
+        """
+        Build a table from factor columns, scoring every village in one pass.
+        
+        Returns:
+            VillageTable with risk score, category, alert level and rank
+        """
+        factors = {
+            "rainfall": np.asarray(rainfall, dtype=np.float64),
+            "slope": np.asarray(slope, dtype=np.float64),
+            "soil_moisture": np.asarray(soil_moisture, dtype=np.float64),
+            "deforestation": np.asarray(deforestation, dtype=np.float64),
+            "road_cuts": np.asarray(road_cuts, dtype=np.float64)
+        }
+        batch = compute_risk_scores(factors, with_contributions=False)
+        
+        return cls(
+            name=np.asarray(list(name), dtype=object),
+            latitude=np.asarray(latitude, dtype=np.float64),
+            longitude=np.asarray(longitude, dtype=np.float64),
+            population=np.asarray(population, dtype=np.int64),
+            households=np.asarray(households, dtype=np.int64),
+            risk_score=batch.scores,
+            category_code=batch.category_codes,
+            alert_code=determine_alert_level_codes(batch.scores),
+            # Stable sort keeps input order for equal scores, like sorted(..., reverse=True)
+            rank=np.argsort(-batch.scores, kind="stable"),
+            **factors
+        )
+    
+    @classmethod
+    def from_records(cls, records: Iterable[Tuple]) -> "VillageTable":
+        """
+        Build a table from tuples ordered as VILLAGE_RECORD_FIELDS.
+        
+        Args:
+            records: Iterable of village tuples
+        
+        Returns:
+            VillageTable
+        """
+        columns = list(zip(*records))
+        if not columns:
+            columns = [()] * len(VILLAGE_RECORD_FIELDS)
+        return cls.from_columns(**dict(zip(VILLAGE_RECORD_FIELDS, columns)))
+    
+    def __len__(self) -> int:
+        return len(self.name)
+    
+    @property
+    def categories(self) -> np.ndarray:
+        """Risk category name per village"""
+        return np.asarray(RISK_CATEGORIES, dtype=object)[self.category_code]
+    
+    @property
+    def colors(self) -> np.ndarray:
+        """Risk category color per village"""
+        return np.asarray(RISK_CATEGORY_COLORS, dtype=object)[self.category_code]
+    
+    @property
+    def alert_levels(self) -> np.ndarray:
+        """Alert level name per village"""
+        return np.asarray(ALERT_LEVELS, dtype=object)[self.alert_code]
+    
+    def index_of(self, village_name: str) -> int:
+        """
+        Look up a village's row index by name.
+        
+        Raises:
+            KeyError: If the village is not in the table
+        """
+        if not self._name_index:
+            self._name_index.update((str(n), i) for i, n in enumerate(self.name))
+        return self._name_index[village_name]
+    
+    @property
+    def spatial_index(self) -> SpatialGridIndex:
+        """Grid index over village locations (built on first use)"""
+        if self._spatial_index is None:
+            self._spatial_index = SpatialGridIndex(self.latitude, self.longitude, cell_size_m=2000.0)
+        return self._spatial_index
+    
+    def nearest(self, lat: float, lon: float, k: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """Row indices and distances (m) of the k villages nearest to a point, e.g. a shelter"""
+        return self.spatial_index.query_nearest(lat, lon, k)
+    
+    def within_radius(self, lat: float, lon: float, radius_m: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Row indices and distances (m) of villages within radius_m of a point, nearest first"""
+        return self.spatial_index.query_radius(lat, lon, radius_m)
+    
+    def top(self, k: int) -> np.ndarray:
+        """Row indices of the k highest-risk villages, highest first"""
+        return self.rank[:k]
+    
+    def at_least(self, threshold: float) -> np.ndarray:
+        """Row indices of villages with risk score >= threshold, highest first"""
+        ranked_scores = self.risk_score[self.rank]
+        # rank is descending, so qualifying villages form a prefix
+        return self.rank[:int(np.count_nonzero(ranked_scores >= threshold))]
+    
+    def category_counts(self) -> Dict[str, int]:
+        """Number of villages per risk category (categories with no villages omitted)"""
+        counts = np.bincount(self.category_code, minlength=len(RISK_CATEGORIES))
+        return {
+            RISK_CATEGORIES[code]: int(count)
+            for code, count in enumerate(counts)
+            if count > 0
+        }
+    
+    def row(self, index: int) -> Dict[str, Any]:
+        """
+        Materialize one village as plain Python values.
+        
+        Returns:
+            Dict keyed by VILLAGE_RECORD_FIELDS plus risk_score
+        """
+        return {
+            "name": str(self.name[index]),
+            "latitude": float(self.latitude[index]),
+            "longitude": float(self.longitude[index]),
+            "population": int(self.population[index]),
+            "households": int(self.households[index]),
+            "risk_score": float(self.risk_score[index]),
+            "rainfall": float(self.rainfall[index]),
+            "slope": float(self.slope[index]),
+            "soil_moisture": float(self.soil_moisture[index]),
+            "deforestation": float(self.deforestation[index]),
+            "road_cuts": float(self.road_cuts[index])
+        }
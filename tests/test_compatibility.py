@@ -77,6 +77,211 @@ def test_risk_engine():
         print(f"  ❌ Risk engine error: {e}")
         return False
 
+def test_batch_risk_scoring():
+    """Test vectorized risk scoring matches the scalar functions"""
+    print("\nTesting batch risk scoring...")
+    try:
+        import numpy as np
+        import pandas as pd
+        from logic.risk_engine import (
+            compute_risk_score,
+            compute_risk_scores,
+            calculate_risk_contributions,
+            get_risk_category,
+            RISK_FACTORS
+        )
+        
+        rng = np.random.default_rng(42)
+        factors = rng.uniform(0, [450, 55, 100, 35, 35], size=(500, 5))
+        factors[:4] = [[300, 40, 60, 15, 10], [400, 50, 100, 30, 30], [0, 0, 0, 0, 0], [250, 40, 60, 15, 15]]
+        
+        batch = compute_risk_scores(factors)
+        for i, row in enumerate(factors.tolist()):
+            assert batch.scores[i] == compute_risk_score(*row)
+            assert batch.categories[i] == get_risk_category(batch.scores[i])[0]
+            contributions = calculate_risk_contributions(*row)
+            for name, value in contributions.items():
+                assert batch.contributions[name][i] == value
+        print(f"  ✅ compute_risk_scores: {len(batch)} locations match scalar results")
+        
+        frame = pd.DataFrame(factors, columns=list(RISK_FACTORS))
+        assert np.array_equal(compute_risk_scores(frame).scores, batch.scores)
+        print("  ✅ compute_risk_scores: DataFrame input works")
+        
+        return True
+    except Exception as e:
+        print(f"  ❌ Batch risk scoring error: {e}")
+        return False
+
+def test_risk_raster():
+    """Test tiled raster scoring against the scalar function"""
+    print("\nTesting raster risk scoring...")
+    try:
+        import tempfile
+        import numpy as np
+        from logic.risk_engine import (
+            compute_risk_raster,
+            compute_risk_score,
+            RASTER_NODATA_CATEGORY
+        )
+        
+        rng = np.random.default_rng(7)
+        shape = (23, 31)
+        rainfall = rng.uniform(0, 450, shape)
+        slope = rng.uniform(0, 55, shape)
+        moisture = rng.uniform(0, 100, shape)
+        road_cuts = rng.uniform(0, 35, shape)
+        rainfall[0, 0] = np.nan
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            rainfall_path = os.path.join(tmp, "rainfall.npy")
+            np.save(rainfall_path, rainfall)
+            
+            scores, categories = compute_risk_raster(
+                rainfall_path, slope, moisture, 12.0, road_cuts,
+                scores_out=os.path.join(tmp, "risk.npy"),
+                categories_out=os.path.join(tmp, "category.npy"),
+                tile_size=8
+            )
+            
+            for i, j in [(1, 1), (22, 30), (8, 16), (15, 7)]:
+                expected = compute_risk_score(rainfall[i, j], slope[i, j], moisture[i, j], 12.0, road_cuts[i, j])
+                assert scores[i, j] == expected
+            assert categories[0, 0] == RASTER_NODATA_CATEGORY
+            assert np.array_equal(np.load(os.path.join(tmp, "risk.npy")), np.asarray(scores), equal_nan=True)
+            del scores, categories
+        print(f"  ✅ compute_risk_raster: {shape[0]}x{shape[1]} grid scored in tiles")
+        
+        return True
+    except Exception as e:
+        print(f"  ❌ Raster scoring error: {e}")
+        return False
+
+def test_village_table():
+    """Test columnar village store precomputations"""
+    print("\nTesting village_table module...")
+    try:
+        from logic.village_table import VillageTable
+        from logic.risk_engine import compute_risk_score, get_risk_category
+        from logic.alert_engine import determine_alert_level
+        
+        records = [
+            ("Alpha", 25.1, 91.9, 800, 95, 180, 35, 42, 8, 5),
+            ("Bravo", 25.2, 91.7, 1200, 150, 320, 42, 65, 22, 18),
+            ("Charlie", 25.3, 91.6, 400, 50, 280, 45, 72, 28, 25),
+            ("Delta", 25.4, 91.5, 600, 80, 150, 28, 35, 5, 3),
+        ]
+        table = VillageTable.from_records(records)
+        
+        for i, record in enumerate(records):
+            score = compute_risk_score(*record[5:])
+            assert table.risk_score[i] == score
+            assert table.categories[i] == get_risk_category(score)[0]
+            assert table.alert_levels[i] == determine_alert_level(score)
+        print(f"  ✅ VillageTable: {len(table)} villages scored")
+        
+        expected = sorted(range(len(records)), key=lambda i: table.risk_score[i], reverse=True)
+        assert table.top(2).tolist() == expected[:2]
+        assert all(table.risk_score[i] >= 60 for i in table.at_least(60))
+        assert sum(table.category_counts().values()) == len(records)
+        print(f"  ✅ VillageTable: ranking and category counts work")
+        
+        row = table.row(table.index_of("Bravo"))
+        assert row["name"] == "Bravo" and row["households"] == 150
+        print(f"  ✅ VillageTable.row: {row['name']} materialized")
+        
+        return True
+    except Exception as e:
+        print(f"  ❌ Village table error: {e}")
+        return False
+
+def test_spatial_index():
+    """Test spatial index queries against a brute-force scan"""
+    print("\nTesting spatial_index module...")
+    try:
+        import numpy as np
+        from logic.spatial_index import SpatialGridIndex, haversine_m
+        
+        rng = np.random.default_rng(11)
+        lats = rng.uniform(25.0, 25.5, 5000)
+        lons = rng.uniform(91.5, 92.0, 5000)
+        index = SpatialGridIndex(lats, lons, cell_size_m=200)
+        
+        for lat, lon in [(25.2, 91.7), (25.49, 91.51), (24.9, 92.1)]:
+            distances = haversine_m(lat, lon, lats, lons)
+            
+            nearest, nearest_d = index.query_nearest(lat, lon, k=5)
+            assert np.allclose(nearest_d, np.sort(distances)[:5])
+            
+            within, _ = index.query_radius(lat, lon, 750)
+            assert set(within.tolist()) == set(np.flatnonzero(distances <= 750).tolist())
+        print(f"  ✅ SpatialGridIndex: nearest and radius queries match brute force")
+        
+        boxed = index.query_bbox(25.1, 91.6, 25.15, 91.65)
+        expected = (lats >= 25.1) & (lats <= 25.15) & (lons >= 91.6) & (lons <= 91.65)
+        assert set(boxed.tolist()) == set(np.flatnonzero(expected).tolist())
+        print(f"  ✅ SpatialGridIndex: bbox query returned {len(boxed)} points")
+        
+        return True
+    except Exception as e:
+        print(f"  ❌ Spatial index error: {e}")
+        return False
+
+def test_incremental_risk_state():
+    """Test incremental updates match full recomputation"""
+    print("\nTesting risk_state module...")
+    try:
+        from logic.risk_state import IncrementalRiskState
+        from logic.risk_engine import compute_risk_score, calculate_confidence_level
+        from logic.evacuation_planner import Household, calculate_household_priority
+        
+        names = ["Alpha", "Bravo", "Charlie"]
+        factors = [[180, 35, 42, 8, 5], [240, 41, 55, 16, 12], [150, 28, 35, 5, 3]]
+        state = IncrementalRiskState(names, factors)
+        
+        households = [
+            Household("B-001", (25.3, 91.7), 30, "Poor", "Limited", 4, 0),
+            Household("B-002", (25.3, 91.7), 250, "Fair", "Moderate", 3, 0),
+        ]
+        state.attach_households("Bravo", households)
+        
+        changes = state.apply_update("rainfall", ["Bravo"], 380)
+        bravo = state.snapshot("Bravo")
+        expected = compute_risk_score(380, 41, 55, 16, 12)
+        assert bravo["risk_score"] == expected
+        assert bravo["confidence"] == calculate_confidence_level(380, 41, 55, 12, 16)[0]
+        assert state.snapshot("Alpha")["risk_score"] == compute_risk_score(*factors[0])
+        print(f"  ✅ apply_update: Bravo re-scored to {expected:.1f}")
+        
+        assert len(changes) == 1 and changes.changes[0].triggers_activated == ["rainfall"]
+        assert changes.alert_changes and changes.alert_changes[0].new_alert_level == "Evacuate"
+        print(f"  ✅ RiskChangeSet: {changes.changes[0].old_alert_level} → {changes.changes[0].new_alert_level}")
+        
+        priorities = state.household_priorities[state.index_of("Bravo")]
+        for hh, priority in zip(households, priorities):
+            assert priority == calculate_household_priority(hh.distance_to_slope, hh.drainage_quality, hh.road_access, expected)
+        print(f"  ✅ Household priorities follow village risk")
+        
+        assert not state.apply_update("slope", ["Charlie"], 1, mode="add")
+        print(f"  ✅ Sub-threshold update produces empty change-set")
+        
+        state.apply_update("rainfall", "Alpha", 200)
+        state.apply_update("rainfall", 2, 160)
+        assert state.snapshot("Alpha")["rainfall"] == 200 and state.snapshot("Charlie")["rainfall"] == 160
+        for bad in ([3], [-1]):
+            try:
+                state.apply_update("rainfall", bad, 100)
+                assert False, f"index {bad} accepted"
+            except IndexError:
+                pass
+        assert state.snapshot("Charlie")["rainfall"] == 160
+        print(f"  ✅ Single village name/index accepted; out-of-range indices rejected")
+        
+        return True
+    except Exception as e:
+        print(f"  ❌ Incremental risk state error: {e}")
+        return False
+
 def test_evacuation_planner():
     """Test evacuation planner functions"""
     print("\nTesting evacuation_planner module...")
@@ -120,6 +325,256 @@ def test_evacuation_planner():
         print(f"  ❌ Evacuation planner error: {e}")
         return False
 
+def test_batch_household_priority():
+    """Test vectorized household priority matches the scalar function"""
+    print("\nTesting batch household priority...")
+    try:
+        import numpy as np
+        from logic.evacuation_planner import (
+            calculate_household_priority,
+            calculate_household_priorities,
+            encode_drainage_quality,
+            encode_road_access
+        )
+        
+        distances = [5, 50, 100, 250, 499, 30]
+        drainage = ["Poor", "Fair", "Good", "Poor", "Unknown", "Poor"]
+        access = ["Limited", "Moderate", "Good", "Good", "Limited", "Limited"]
+        
+        by_name = calculate_household_priorities(distances, drainage, access, 70)
+        by_code = calculate_household_priorities(distances, encode_drainage_quality(drainage), encode_road_access(access), 70)
+        assert np.array_equal(by_name, by_code)
+        
+        for i in range(len(distances)):
+            assert by_name[i] == calculate_household_priority(distances[i], drainage[i], access[i], 70)
+        assert by_name.max() <= 100
+        print(f"  ✅ calculate_household_priorities: {len(distances)} households match scalar (cap at 100)")
+        
+        assert encode_drainage_quality([-1, 0, 2, 3, 255, 256, -253]).tolist() == [3, 0, 2, 3, 3, 3, 3]
+        assert encode_road_access(np.array([1, 7], dtype=np.uint8)).tolist() == [1, 3]
+        print(f"  ✅ Negative and out-of-range codes map to the unknown category")
+        
+        by_int = calculate_household_priorities([50, 50, 50], [0, 2, 3], [0, 0, 0], 60)
+        by_float = calculate_household_priorities([50, 50, 50], np.array([0.0, 2.0, np.nan]), [0, 0, 0], 60)
+        assert np.array_equal(by_float, by_int) and by_int[0] != by_int[1]
+        assert encode_drainage_quality(np.array(["Poor", None, "Good"], dtype=object)).tolist() == [0, 3, 2]
+        assert encode_drainage_quality(np.array([0, 2.0], dtype=object)).tolist() == [0, 2]
+        for bad in (np.array([0.5]), np.array([True, False]), np.array(["Poor", 1], dtype=object)):
+            try:
+                encode_drainage_quality(bad)
+                assert False, f"{bad!r} accepted"
+            except ValueError:
+                pass
+        print(f"  ✅ Float codes (NaN = unknown) match integer codes; fractional or mixed input raises")
+        
+        return True
+    except Exception as e:
+        print(f"  ❌ Batch household priority error: {e}")
+        return False
+
+def test_phase_summary():
+    """Test single-pass phase bucketing against per-phase filters"""
+    print("\nTesting phase summary...")
+    try:
+        import numpy as np
+        from logic.evacuation_planner import summarize_evacuation_phases, calculate_evacuation_statistics
+        from logic.household_generator import generate_household_arrays
+        
+        households = generate_household_arrays("Mawsynram", 25.2975, 91.5826, 72.0, 400, seed=3)
+        summary = summarize_evacuation_phases(households.priority_score, households.occupants)
+        bands = [(75, np.inf), (60, 75), (45, 60), (-np.inf, 45)]
+        for phase, (low, high) in enumerate(bands):
+            in_band = np.flatnonzero((households.priority_score >= low) & (households.priority_score < high))
+            assert np.array_equal(summary.members(phase), in_band)
+            assert summary.people[phase] == households.occupants[in_band].sum()
+        assert summary.total_households == len(households)
+        print(f"  ✅ summarize_evacuation_phases: counts {summary.households.tolist()} match per-phase filters")
+        
+        stats = calculate_evacuation_statistics(households)
+        assert stats == calculate_evacuation_statistics(households.to_households())
+        print(f"  ✅ calculate_evacuation_statistics: arrays and Household lists agree")
+        
+        timeline = summarize_evacuation_phases([80, 70, 60, 50], [1, 2, 3, 4], thresholds=(75, 65, 55))
+        assert timeline.households.tolist() == [1, 1, 1, 1] and timeline.people.tolist() == [1, 2, 3, 4]
+        print(f"  ✅ Custom thresholds")
+        
+        return True
+    except Exception as e:
+        print(f"  ❌ Phase summary error: {e}")
+        return False
+
+def test_top_k_selection():
+    """Test top-k household selection matches a full stable sort"""
+    print("\nTesting top-k selection...")
+    try:
+        import numpy as np
+        from logic.evacuation_planner import top_priority_indices, iter_priority_indices, select_priority_households
+        from logic.household_generator import generate_household_arrays
+        
+        priorities = [50, 80, 80, 20, 95, 80, 50]
+        expected = sorted(range(len(priorities)), key=lambda i: priorities[i], reverse=True)
+        top = top_priority_indices(priorities, 3)
+        assert top.tolist() == expected[:3] == [4, 1, 2]
+        assert top.tolist() + list(iter_priority_indices(priorities, exclude=top)) == expected
+        print(f"  ✅ top_priority_indices + iter_priority_indices: ties kept in input order")
+        
+        households = generate_household_arrays("Haflong", 25.1694, 93.0169, 68.0, 300, seed=5).to_households()
+        top_households, rest = select_priority_households(households, 10)
+        full_sort = sorted(households, key=lambda h: h.priority_score, reverse=True)
+        assert [h.id for h in top_households] == [h.id for h in full_sort[:10]]
+        assert [h.id for h in rest] == [h.id for h in full_sort[10:]]
+        print(f"  ✅ select_priority_households: top 10 + remainder match full sort")
+        
+        return True
+    except Exception as e:
+        print(f"  ❌ Phase summary error: {e}")
+        return False
+
+def test_household_generator():
+    """Test seeded household generation"""
+    print("\nTesting household_generator module...")
+    try:
+        import numpy as np
+        from logic.household_generator import generate_household_arrays, iter_household_chunks
+        from logic.evacuation_planner import calculate_household_priority
+        
+        args = ("Cherrapunji", 25.2631, 91.7320, 70.9, 500)
+        first = generate_household_arrays(*args, seed=7)
+        second = generate_household_arrays(*args, seed=7)
+        assert np.array_equal(first.priority_score, second.priority_score)
+        assert not np.array_equal(first.priority_score, generate_household_arrays(*args, seed=8).priority_score)
+        assert first.id[0] == "CHE-001" and 2 <= first.occupants.min() and first.occupants.max() <= 8
+        print(f"  ✅ generate_household_arrays: {len(first)} households, deterministic per seed")
+        
+        chunks = list(iter_household_chunks(*args, chunk_size=128, seed=7))
+        assert np.array_equal(np.concatenate([c.distance_to_slope for c in chunks]), first.distance_to_slope)
+        assert np.array_equal(np.concatenate([c.id for c in chunks]), first.id)
+        print(f"  ✅ iter_household_chunks: {len(chunks)} chunks match single pass")
+        
+        for hh in first.to_households(range(50)):
+            expected = calculate_household_priority(hh.distance_to_slope, hh.drainage_quality, hh.road_access, 70.9)
+            assert hh.priority_score == expected
+        print(f"  ✅ Priorities match calculate_household_priority")
+        
+        return True
+    except Exception as e:
+        print(f"  ❌ Household generator error: {e}")
+        return False
+
+def test_routing():
+    """Test road-network routing"""
+    print("\nTesting routing module...")
+    try:
+        import math
+        from logic.routing import RoadGraph
+        from logic.evacuation_planner import generate_evacuation_routes
+        
+        roads = {"type": "FeatureCollection", "features": [
+            {"type": "Feature", "properties": {"name": "Village Road"},
+             "geometry": {"type": "LineString", "coordinates": [[91.70, 25.25], [91.72, 25.25]]}},
+            {"type": "Feature", "properties": {"name": "NH-106", "road_cuts": 85},
+             "geometry": {"type": "LineString", "coordinates": [[91.72, 25.25], [91.75, 25.25]]}},
+            {"type": "Feature", "properties": {"name": "State Highway", "slope": 30},
+             "geometry": {"type": "LineString", "coordinates": [[91.72, 25.25], [91.72, 25.27], [91.75, 25.25]]}},
+            {"type": "Feature", "properties": {"name": "Forest Path"},
+             "geometry": {"type": "LineString", "coordinates": [[91.70, 25.25], [91.70, 25.22]]}},
+            {"type": "Feature", "properties": {"name": "Relief Camp A"},
+             "geometry": {"type": "Point", "coordinates": [91.75, 25.25]}},
+            {"type": "Feature", "properties": {"name": "Relief Camp B"},
+             "geometry": {"type": "Point", "coordinates": [91.70, 25.22]}}
+        ]}
+        graph = RoadGraph.from_geojson(roads)
+        village = graph.nearest_node(25.2501, 91.7001)
+        
+        route = graph.shortest_path(village, "Relief Camp A")
+        assert route.roads == ["Village Road", "State Highway"], "cut NH-106 must be avoided"
+        print(f"  ✅ shortest_path: {route.describe()}")
+        
+        for bad in (len(graph), -1):
+            try:
+                graph.shortest_path(bad, "Relief Camp A")
+                assert False, f"node index {bad} accepted"
+            except IndexError:
+                pass
+        print(f"  ✅ Out-of-range node indices rejected")
+        
+        shelters = ["Relief Camp A", "Relief Camp B"]
+        tree = graph.shelter_tree(shelters)
+        for node in range(len(graph)):
+            best = min(graph.shortest_path(node, shelter).cost for shelter in shelters)
+            assert math.isclose(tree.cost[node], best)
+        assert tree.route(village).shelter == "Relief Camp B"
+        households = tree.route_households([25.2502, 25.2698], [91.7003, 91.7201])
+        assert households.reachable.all()
+        print(f"  ✅ shelter_tree: matches per-pair A* for all {len(graph)} nodes")
+        
+        routes = generate_evacuation_routes("Test", 25, graph, (25.25, 91.70), shelters)
+        assert routes["primary"].startswith("Forest Path → Relief Camp B") and routes["status"] == "good"
+        print(f"  ✅ generate_evacuation_routes with road graph: {routes['primary']}")
+        
+        return True
+    except Exception as e:
+        print(f"  ❌ Routing error: {e}")
+        return False
+
+def test_shelter_assignment():
+    """Test capacity-constrained shelter assignment"""
+    print("\nTesting shelter_assignment module...")
+    try:
+        import numpy as np
+        from logic.shelter_assignment import Shelter, assign_shelters
+        from logic.household_generator import generate_household_arrays
+        
+        households = generate_household_arrays("Tura", 25.5138, 90.2036, 74.0, 600, seed=11)
+        shelters = [
+            Shelter("Community Hall", 25.5150, 90.2050, 1000),
+            Shelter("School Building", 25.5050, 90.1950, 1200),
+            Shelter("District Relief Camp", 25.5300, 90.2200, 800)
+        ]
+        
+        for method in ("greedy", "flow"):
+            result = assign_shelters(households, shelters, method=method)
+            placed = result.assigned
+            assert (result.occupancy <= result.capacity).all()
+            assert result.occupancy.sum() == households.occupants[placed].sum()
+            free = result.capacity - result.occupancy
+            assert all((free < households.occupants[i]).all() for i in result.unassigned if result.phase[i] < 3)
+            # Urgent phases claim space first; Monitoring households are not evacuating
+            assert placed[result.phase == 0].all()
+            assert not placed[result.phase == 3].any()
+            print(f"  ✅ {method}: {placed.sum()}/{len(result)} households placed, "
+                  f"{result.total_person_distance_m / 1000:.0f} person-km")
+            if method == "greedy":
+                greedy_cost = result.total_person_distance_m
+        
+        assert result.total_person_distance_m <= greedy_cost * 1.001
+        print(f"  ✅ Flow mode no worse than greedy")
+        
+        # Flow splits the 3-person household across both shelters; it must still be placed whole
+        tight = generate_household_arrays("Tura", 25.04, 91.07, 74.0, 2, seed=1)
+        tight.latitude[:], tight.longitude[:] = [25.042, 25.0473], [91.08, 91.0643]
+        tight.occupants[:], tight.priority_score[:] = [1, 3], [80, 80]
+        tight_shelters = [Shelter("Hall", 25.0197, 91.0104, 3), Shelter("School", 25.0394, 91.0137, 1)]
+        for method in ("greedy", "flow"):
+            assert assign_shelters(tight, tight_shelters, method=method).shelter.tolist() == [1, 0]
+        monitoring = assign_shelters(households, shelters, include_monitoring=True)
+        assert monitoring.assigned.sum() > result.assigned.sum()
+        print(f"  ✅ Split flow households re-placed whole; Monitoring households placed only on request")
+        
+        # One village, many small shelters: most households overflow their candidates
+        rng = np.random.default_rng(5)
+        many = [Shelter(f"Site {i}", 25.5 + rng.uniform(-0.05, 0.05), 90.2 + rng.uniform(-0.05, 0.05), int(rng.integers(5, 40)))
+                for i in range(60)]
+        overflow = assign_shelters(households, many, candidates=1)
+        exhaustive = assign_shelters(households, many, candidates=len(many))
+        assert np.array_equal(overflow.shelter, exhaustive.shelter)
+        print(f"  ✅ Overflow re-queries match a search over all shelters ({overflow.assigned.sum()} placed)")
+        
+        return True
+    except Exception as e:
+        print(f"  ❌ Shelter assignment error: {e}")
+        return False
+
 def test_alert_engine():
     """Test alert engine functions"""
     print("\nTesting alert_engine module...")
@@ -163,6 +618,712 @@ def test_alert_engine():
         print(f"  ❌ Alert engine error: {e}")
         return False
 
+def test_batch_alert_rendering():
+    """Test compiled templates and batch alert rendering"""
+    print("\nTesting batch alert rendering...")
+    try:
+        from logic.alert_engine import generate_alert_message, render_alert_messages, determine_alert_level
+        
+        names = ["Cherrapunji", "Haflong", "Cherrapunji", "Tura"]
+        scores = [82.0, 65.0, 79.0, 20.0]
+        for lang in ["English", "Hindi", "Khasi"]:
+            batch = render_alert_messages(names, scores, language=lang)
+            expected = [generate_alert_message(n, s, determine_alert_level(s), lang) for n, s in zip(names, scores)]
+            assert batch == expected
+            assert names[0] in batch[0] and batch[3] == ""
+        print(f"  ✅ render_alert_messages matches generate_alert_message ({len(names)} villages x 3 languages)")
+        
+        assert generate_alert_message("Tura", 50, "Advisory", "French") == generate_alert_message("Tura", 50, "Advisory")
+        assert generate_alert_message("Tura", 50, "No Alert") == ""
+        print(f"  ✅ English fallback and No Alert handling")
+        
+        return True
+    except Exception as e:
+        print(f"  ❌ Batch alert rendering error: {e}")
+        return False
+
+def test_alert_dispatcher():
+    """Test asynchronous multi-channel delivery against stub gateways"""
+    print("\nTesting alert dispatcher...")
+    try:
+        import asyncio
+        from logic.alert_dispatcher import (
+            AlertDispatcher, StubGateway, ChannelConfig, DeliveryError,
+            build_alert_requests, deliver_alert, summarize_receipts, DELIVERY_CHANNELS
+        )
+        
+        numbers = [f"+91900000{i:04d}" for i in range(2000)]
+        requests = build_alert_requests("Tura", 80, numbers)
+        assert len(requests) == 2 * len(numbers) + 2  # SMS + Voice per number, Radio + Sirens once
+        print(f"  ✅ build_alert_requests: {len(requests)} requests over 4 channels")
+        
+        gateways = {channel: StubGateway(latency_s=0.001, failure_rate=0.2, seed=7, name=channel) for channel in DELIVERY_CHANNELS}
+        configs = {channel: ChannelConfig(concurrency=50, max_attempts=6, backoff_base_s=0.001) for channel in DELIVERY_CHANNELS}
+        receipts = asyncio.run(AlertDispatcher(gateways, configs).dispatch(requests))
+        assert len(receipts) == len(requests)
+        assert len({r.request_id for r in receipts}) == len(requests)
+        summary = summarize_receipts(receipts)
+        assert sum(r.attempts for r in receipts) > len(receipts)  # transient failures were retried
+        assert sum(len(gw.sent) for gw in gateways.values()) == sum(c["delivered"] for c in summary.values())
+        print(f"  ✅ Every request has a receipt; retries recovered {sum(c['delivered'] for c in summary.values())}/{len(receipts)}")
+        
+        class Rejecting(StubGateway):
+            async def send(self, request):
+                self.calls += 1
+                raise DeliveryError("invalid number", retryable=False)
+        
+        rejecting = Rejecting()
+        receipts = asyncio.run(AlertDispatcher({"SMS": rejecting}).dispatch(build_alert_requests("Tura", 80, numbers[:5], channels=["SMS"])))
+        assert rejecting.calls == 5 and all(r.status == "failed" and r.attempts == 1 for r in receipts)
+        print(f"  ✅ Permanent errors are not retried")
+        
+        class Resetting(StubGateway):
+            async def send(self, request):
+                self.calls += 1
+                raise ConnectionResetError("gateway closed the connection")
+        
+        resetting = Resetting()
+        configs = {"SMS": ChannelConfig(concurrency=1, max_attempts=2, backoff_base_s=0.001)}
+        receipts = asyncio.run(asyncio.wait_for(
+            AlertDispatcher({"SMS": resetting}, configs).dispatch(build_alert_requests("Tura", 80, numbers[:3], channels=["SMS"])),
+            timeout=5
+        ))
+        assert len(receipts) == 3 and resetting.calls == 6
+        assert all(r.status == "failed" and "ConnectionResetError" in r.error for r in receipts)
+        print(f"  ✅ Unexpected backend exceptions are retried and receipted, workers survive")
+        
+        result = deliver_alert("Tura", 80, numbers[:10], {channel: StubGateway() for channel in DELIVERY_CHANNELS})
+        assert result["status"] == "delivered" and result["mobile_numbers_reached"] == 10
+        assert deliver_alert("Tura", 10, numbers, {})["status"] == "no_alert_needed"
+        
+        async def from_running_loop():
+            return deliver_alert("Tura", 80, numbers[:3], {"SMS": StubGateway()})
+        
+        assert asyncio.run(from_running_loop())["mobile_numbers_reached"] == 3
+        print(f"  ✅ deliver_alert reports receipt-based reach (also when called inside an event loop)")
+        
+        return True
+    except Exception as e:
+        print(f"  ❌ Alert dispatcher error: {e}")
+        return False
+
+def test_sms_encoding():
+    """Test GSM-7/UCS-2 sizing, segmentation and batch packing"""
+    print("\nTesting SMS encoding...")
+    try:
+        from logic.sms_encoding import GSM7, UCS2, analyze_sms, segment_sms, fit_sms, pack_sms_batches, sms_units
+        from logic.alert_engine import ALERT_LANGUAGES, format_sms_alert, generate_alert_message
+        from logic.alert_dispatcher import StubGateway, build_alert_requests, deliver_alert
+        
+        assert analyze_sms("a" * 160).segments == 1
+        assert analyze_sms("a" * 161).segments == 2 and analyze_sms("[" * 80).units == 160
+        assert analyze_sms("क" * 70).encoding == UCS2 and analyze_sms("क" * 71).segments == 2
+        assert sms_units("🚨") == 2 and analyze_sms("Ñoño à €").encoding == GSM7
+        print(f"  ✅ GSM-7 septets (extension = 2) and UCS-2 code units (emoji = 2)")
+        
+        for text in ["x" * 152 + "€" * 20, "🚨" * 50, "निकासी " * 40]:
+            parts = segment_sms(text)
+            assert "".join(parts) == text
+            assert all(sms_units(part, analyze_sms(text).encoding) <= (153 if analyze_sms(text).encoding == GSM7 else 67) for part in parts)
+            assert len(parts) == analyze_sms(text).segments
+        print(f"  ✅ segment_sms never splits escapes or surrogate pairs")
+        
+        assert analyze_sms(fit_sms("निकासी " * 40, 1)).segments == 1
+        assert fit_sms("निकासी " * 40, 1).endswith("...")
+        hindi = format_sms_alert("Haflong", 80, "Hindi", max_segments=1)
+        assert analyze_sms(hindi).units <= 70 and hindi.endswith("...")
+        assert len(format_sms_alert("Haflong", 80, max_length=60)) == 60
+        khasi = format_sms_alert("Mawsynram-Lower-Pynursla", 80, "Khasi", max_segments=1)
+        assert analyze_sms(khasi).encoding == GSM7 and len(khasi) > 70  # GSM-7 prefix keeps the 160 budget
+        print(f"  ✅ format_sms_alert respects the segment budget when one is given (max_length still caps)")
+        
+        for language in ALERT_LANGUAGES:
+            for score, level in [(80, "Evacuate"), (65, "Warning")]:
+                for village in ["Haflong", "Mawsynram-Lower-Pynursla-Block-East-Khasi-Hills"]:
+                    sms = format_sms_alert(village, score, language)
+                    assert sms == generate_alert_message(village, score, level, language), (language, level)
+        print(f"  ✅ Evacuate and Warning alerts keep their full instruction in every language (multipart)")
+        
+        pairs = [(f"+91{i}", "Evacuate now" if i % 3 else "सावधान") for i in range(2500)]
+        batches = pack_sms_batches(pairs, max_recipients=1000)
+        assert sum(len(b.recipients) for b in batches) == 2500 and len(batches) == 3
+        assert {b.encoding for b in batches} == {GSM7, UCS2}
+        print(f"  ✅ pack_sms_batches: 2500 numbers -> {len(batches)} gateway requests")
+        
+        numbers = [f"+91900000{i:04d}" for i in range(1200)]
+        requests = build_alert_requests("Tura", 80, numbers, "Hindi", channels=["SMS"], sms_batch_size=500)
+        assert len(requests) == 3
+        gateway = StubGateway()
+        result = deliver_alert("Tura", 80, numbers, {"SMS": gateway}, "Hindi", sms_batch_size=500)
+        assert gateway.calls == 3 and result["mobile_numbers_reached"] == 1200
+        assert gateway.segments_billed == 1200 * result["sms_segments"]
+        print(f"  ✅ Batched SMS: 3 gateway requests, {gateway.segments_billed} segments billed")
+        
+        return True
+    except Exception as e:
+        print(f"  ❌ SMS encoding error: {e}")
+        return False
+
+def test_alert_scheduler():
+    """Test frequency-governed re-alerting and duplicate suppression"""
+    print("\nTesting alert scheduler...")
+    try:
+        import numpy as np
+        from logic.alert_engine import get_alert_interval, get_alert_frequency
+        from logic.alert_scheduler import AlertScheduler
+        from logic.risk_state import IncrementalRiskState
+        
+        assert get_alert_interval(80) == 15 * 60 and get_alert_frequency(80) == "every 15 minutes"
+        assert get_alert_interval(65) == 2 * 3600 and get_alert_interval(10) == 24 * 3600
+        print(f"  ✅ get_alert_interval matches get_alert_frequency")
+        
+        scheduler = AlertScheduler()
+        scheduler.update("Tura", 50, now=0)
+        assert [a.reason for a in scheduler.pop_due(0)] == ["initial"]
+        scheduler.update("Tura", 55, now=10)  # same level: duplicate
+        assert scheduler.pop_due(10) == [] and scheduler.next_due_for("Tura") == 6 * 3600
+        scheduler.update("Tura", 80, now=20)
+        alerts = scheduler.pop_due(20)
+        assert len(alerts) == 1 and alerts[0].reason == "escalation" and alerts[0].alert_level == "Evacuate"
+        print(f"  ✅ Escalation fires immediately, same-level updates are deduplicated")
+        
+        scheduler.update("Tura", 65, now=30)
+        scheduler.update("Tura", 80, now=40)  # flapping back inside the Evacuate interval
+        assert scheduler.pop_due(40) == [] and scheduler.suppressed == 1
+        assert scheduler.next_due() == 20 + 15 * 60
+        alerts = scheduler.pop_due(20 + 15 * 60)
+        assert len(alerts) == 1 and alerts[0].reason == "re-alert"
+        scheduler.update("Tura", 10, now=1000)
+        assert scheduler.pop_due(10 ** 6) == [] and len(scheduler) == 0
+        print(f"  ✅ Flapping suppressed, re-alerts follow the level interval")
+        
+        names = [f"V{i}" for i in range(1000)]
+        state = IncrementalRiskState(names, np.full((1000, 5), [100.0, 10.0, 10.0, 10.0, 10.0]))
+        scheduler = AlertScheduler()
+        scheduler.update_many(names, state.scores, now=0)
+        scheduler.pop_due(0)
+        changes = state.apply_update("rainfall", names[:10], 500)
+        scheduler.apply_changes(changes, now=60)
+        due = scheduler.pop_due(60)
+        assert 0 < len(due) == len(changes.alert_changes) and all(a.reason in ("initial", "escalation") for a in due)
+        print(f"  ✅ apply_changes: {len(due)} villages re-alerted from one sensor update")
+        
+        from logic.alert_history import AlertHistoryStore, AlertRecord
+        with AlertHistoryStore(":memory:") as history:
+            history.extend([AlertRecord("Tura", "Evacuate", 82, timestamp=1000), AlertRecord("Jowai", "Warning", 65, timestamp=500)])
+            restarted = AlertScheduler()
+            restarted.restore_sent(history.recent(hours=1, now=1200))
+        restarted.update_many(["Tura", "Jowai", "Dawki"], [82, 65, 82], now=1200)
+        assert [a.village for a in restarted.pop_due(1200)] == ["Dawki"]
+        assert restarted.next_due_for("Tura") == 1000 + 15 * 60 and restarted.next_due_for("Jowai") == 500 + 2 * 3600
+        print(f"  ✅ restore_sent: alerts logged before a restart are not re-sent")
+        
+        import threading
+        shared, popped = AlertScheduler(), []
+        names = [f"V{i}" for i in range(2000)]
+        
+        def session(start):
+            for tick in range(start, 40, 4):  # each tick one Evacuate interval apart
+                now = tick * 15 * 60
+                shared.update_many(names, [80.0] * len(names), now=now)
+                popped.extend((a.village, a.due_at) for a in shared.pop_due(now))
+        
+        sessions = [threading.Thread(target=session, args=(i,)) for i in range(4)]
+        for thread in sessions:
+            thread.start()
+        for thread in sessions:
+            thread.join()
+        assert len(popped) == len(set(popped)) and len(shared) == len(names)
+        print(f"  ✅ 4 sessions sharing one scheduler: {len(popped)} alerts, none sent twice")
+        
+        return True
+    except Exception as e:
+        print(f"  ❌ Alert scheduler error: {e}")
+        return False
+
+def test_alert_history():
+    """Test the SQLite alert log: batched writes and indexed queries"""
+    print("\nTesting alert history...")
+    try:
+        import os
+        import tempfile
+        from logic.alert_engine import generate_alert_metadata
+        from logic.alert_history import AlertHistoryStore, AlertRecord
+        
+        now = 1_800_000_000.0
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "alerts.db")
+            with AlertHistoryStore(path, batch_size=1000) as store:
+                levels = ["Advisory", "Warning", "Evacuate"]
+                store.extend([
+                    AlertRecord(
+                        village=f"V{i % 40}", alert_level=levels[i % 3], risk_score=50.0 + i % 3 * 15,
+                        timestamp=now - i * 60, district="East Khasi Hills" if i % 2 else "West Khasi Hills"
+                    )
+                    for i in range(5000)
+                ])
+                assert len(store) == 5000
+                print(f"  ✅ 5000 records written in batches (WAL: {store._conn.execute('PRAGMA journal_mode').fetchone()[0]})")
+                
+                recent = store.recent_by_district("East Khasi Hills", hours=2, now=now)
+                assert len(recent) == 60 and all(r.district == "East Khasi Hills" for r in recent)
+                assert [r.timestamp for r in recent] == sorted((r.timestamp for r in recent), reverse=True)
+                severe = store.recent_by_district("East Khasi Hills", hours=2, now=now, min_level="Warning")
+                assert 0 < len(severe) < len(recent) and all(r.alert_level != "Advisory" for r in severe)
+                assert len(store.recent_by_village("V1", hours=24, now=now, limit=5)) == 5
+                counts = store.counts_by_district(hours=2, now=now)
+                assert sum(counts["East Khasi Hills"].values()) == 60
+                print(f"  ✅ Last-N-hours queries by district, level and village")
+                
+                metadata = generate_alert_metadata("Cherrapunji", 82.0, 150, 1200)
+                record = AlertRecord.from_metadata(metadata, district="East Khasi Hills", message="Evacuate now")
+                store.append(record)  # buffered, visible to the next query
+                latest = store.recent_by_village("Cherrapunji", hours=1, now=record.timestamp + 1)
+                assert len(latest) == 1 and latest[0].channels == metadata["channels"]
+                print(f"  ✅ generate_alert_metadata records round-trip")
+            
+            with AlertHistoryStore(path) as reopened:
+                assert len(reopened) == 5001
+            print(f"  ✅ History persists across reopen")
+        
+        return True
+    except Exception as e:
+        print(f"  ❌ Alert history error: {e}")
+        return False
+
+def test_timeseries_store():
+    """Test partitioned time-series storage, rollups and deterministic backfill"""
+    print("\nTesting time-series store...")
+    try:
+        import tempfile
+        import numpy as np
+        from logic.risk_engine import compute_risk_score
+        from logic.timeseries_store import RiskTimeSeriesStore, backfill_history
+        
+        factors = {"rainfall": 320, "slope": 42, "soil_moisture": 65, "deforestation": 22, "road_cuts": 18}
+        now = 1_800_000_000.0
+        with tempfile.TemporaryDirectory() as tmp_a, tempfile.TemporaryDirectory() as tmp_b:
+            store = RiskTimeSeriesStore(tmp_a)
+            written = backfill_history(store, "Shillong Peak", factors, now, days=30, interval_s=900)
+            assert written == 30 * 96 and len(store.days("Shillong Peak")) in (30, 31)
+            store.append("Shillong Peak", now, [list(factors.values())])
+            latest = store.latest("Shillong Peak")
+            assert latest["ts"] == now and latest["risk_score"] == compute_risk_score(320, 42, 65, 22, 18)
+            print(f"  ✅ {written} readings in day partitions; scores match compute_risk_score")
+            
+            week = store.read("Shillong Peak", now - 7 * 86400, now + 1)
+            assert len(week) == 7 * 96 + 1 and np.all(np.diff(week["ts"]) > 0)
+            hourly = store.rollup("Shillong Peak", now - 7 * 86400, now + 1, "hour")
+            daily = store.rollup("Shillong Peak", now - 7 * 86400, now + 1, "day")
+            assert hourly["count"].sum() == daily["count"].sum() == len(week)
+            assert np.allclose((daily["risk_score"] * daily["count"]).sum(), week["risk_score"].sum())
+            assert np.all(hourly["risk_score_max"] >= hourly["risk_score"])
+            print(f"  ✅ Hourly ({len(hourly['time'])}) and daily ({len(daily['time'])}) rollups agree with raw readings")
+            
+            other = RiskTimeSeriesStore(tmp_b)
+            backfill_history(other, "Shillong Peak", factors, now - 10 * 86400, days=20, interval_s=900)
+            backfill_history(other, "Shillong Peak", factors, now, days=30, interval_s=900)  # gap-fill later
+            assert np.array_equal(other.read("Shillong Peak", now - 20 * 86400, now), store.read("Shillong Peak", now - 20 * 86400, now))
+            assert backfill_history(other, "Shillong Peak", factors, now, days=30, interval_s=900) == 0
+            print(f"  ✅ Backfill is deterministic and idempotent")
+        
+        return True
+    except Exception as e:
+        print(f"  ❌ Time-series store error: {e}")
+        return False
+
+def test_sensor_ingestion():
+    """Test rolling-window sensor aggregation feeding incremental risk state"""
+    print("\nTesting sensor ingestion...")
+    try:
+        import asyncio
+        import os
+        import tempfile
+        import numpy as np
+        from logic.risk_state import IncrementalRiskState
+        from logic.sensor_ingestion import (
+            SensorIngestionPipeline, SensorReading, SensorSocketServer, RollingSum, iter_reading_file
+        )
+        
+        window = RollingSum(3600, 60)
+        for minute in range(120):
+            window.add(minute * 60, 1.0)
+        assert window.value() == 60.0 and window.value(now=119 * 60 + 1800) == 30.0
+        print(f"  ✅ RollingSum keeps exactly the last window")
+        
+        names = ["Cherrapunji", "Mawsynram", "Dawki"]
+        state = IncrementalRiskState(names, np.array([[0, 42, 40, 22, 18], [0, 38, 40, 18, 15], [0, 30, 40, 12, 10]], dtype=float))
+        pipeline = SensorIngestionPipeline(state, {"SOHRA-1": ["Cherrapunji", "Mawsynram"], "Dawki": ["Dawki"]})
+        start = 1_800_000_000.0
+        readings = [SensorReading("SOHRA-1", "rain_gauge", 2.0, start + i * 600) for i in range(6 * 96)]  # 4 days
+        readings += [SensorReading("SOHRA-1", "soil_moisture", 85.0, start + i * 3600) for i in range(96)]
+        readings.sort(key=lambda r: r.timestamp)
+        assert pipeline.ingest_many(readings) == len(readings)
+        change_sets = pipeline.flush()
+        aggregates = pipeline.aggregates("SOHRA-1")
+        assert abs(aggregates["rain_72h"] - 2.0 * 6 * 72) < 1e-6 and abs(aggregates["rain_24h"] - 2.0 * 6 * 24) < 1e-6
+        assert state.factors["rainfall"][0] == state.factors["rainfall"][1] == aggregates["rain_72h"]
+        assert state.factors["rainfall"][2] == 0 and 80 < state.factors["soil_moisture"][0] <= 85
+        assert any("rainfall" in change.triggers_activated for cs in change_sets for change in cs.changes)
+        print(f"  ✅ 72h rainfall {aggregates['rain_72h']:.0f} mm and moisture EMA pushed to 2 villages (Dawki untouched)")
+        
+        assert pipeline.flush(now=start + 10 * 86400)[0].factor == "rainfall"
+        assert state.factors["rainfall"][0] == 0
+        assert not pipeline.ingest(SensorReading("UNKNOWN", "rain_gauge", 1.0, start))
+        print(f"  ✅ Rain leaves the window over time; unknown stations are rejected")
+        
+        later = start + 5 * 86400
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "gauges.csv")
+            with open(path, "w") as f:
+                f.write("timestamp,station,sensor,value\n")
+                f.write(f"{later},Dawki,rain_gauge,120\n{later + 60},Dawki,rain_gauge,150\n")
+            pipeline.ingest_many(iter_reading_file(path))
+            pipeline.flush()
+            assert state.factors["rainfall"][2] == 270
+        
+        async def socket_round_trip():
+            received = []
+            async with SensorSocketServer(pipeline, flush_interval_s=0.05, on_changes=received.extend) as server:
+                reader, writer = await asyncio.open_connection(server.host, server.port)
+                writer.write(f'{{"station": "Dawki", "sensor": "rain_gauge", "value": 30, "timestamp": {later + 180}}}\n'.encode())
+                writer.write(b"not a reading\n")
+                await writer.drain()
+                writer.close()
+                await asyncio.sleep(0.2)
+            return received, server.malformed
+        
+        received, malformed = asyncio.run(socket_round_trip())
+        assert state.factors["rainfall"][2] == 300 and malformed == 1 and received
+        print(f"  ✅ CSV file and TCP socket sources")
+        
+        return True
+    except Exception as e:
+        print(f"  ❌ Sensor ingestion error: {e}")
+        return False
+
+def test_api_server():
+    """Test headless JSON API server"""
+    print("\nTesting API server...")
+    
+    try:
+        import asyncio
+        import http.client
+        import json
+        import numpy as np
+        from api_server import ApiServer, MicroBatcher
+        
+        async def coalesce():
+            batcher = MicroBatcher(lambda rows: {"total": rows.sum(axis=1)}, max_delay_s=0.01)
+            results = await asyncio.gather(*[batcher.submit(np.full((2, 3), i, dtype=float)) for i in range(50)])
+            return batcher.batches, results
+        
+        batches, results = asyncio.run(coalesce())
+        assert batches == 1 and all((r["total"] == 3.0 * i).all() for i, r in enumerate(results))
+        print(f"  ✅ 50 concurrent submits coalesced into 1 vectorized call")
+        
+        village = {"name": "Mawsynram", "rainfall": 250, "slope": 45, "soil_moisture": 92, "deforestation": 35, "road_cuts": 8}
+        
+        def client(host, port):
+            conn = http.client.HTTPConnection(host, port, timeout=5)
+            responses = []
+            for path, payload in [
+                ("/v1/risk/score", {"villages": [village]}),
+                ("/v1/risk/score", {"villages": [village]}),
+                ("/v1/households/priorities", {"village_risk_score": 80, "top_k": 1, "households": [
+                    {"id": "h1", "distance_to_slope": 20, "drainage_quality": "Poor", "road_access": "Limited", "occupants": 4},
+                    {"id": "h2", "distance_to_slope": 300, "drainage_quality": "Good", "road_access": "Good", "occupants": 2}
+                ]}),
+                ("/v1/alerts/render", {"villages": ["Mawsynram"], "risk_scores": [82], "language": "Hindi"}),
+                ("/v1/risk/score", {"villages": [{"name": "Dawki"}]}),
+                ("/missing", {})
+            ]:
+                conn.request("POST", path, json.dumps(payload), {"Content-Type": "application/json"})
+                response = conn.getresponse()
+                responses.append((response.status, response.getheader("X-Cache"), json.loads(response.read())))
+            conn.close()
+            return responses
+        
+        async def round_trip():
+            async with ApiServer(port=0) as server:
+                responses = await asyncio.to_thread(client, server.host, server.port)
+                return responses, server.stats()
+        
+        responses, stats = asyncio.run(round_trip())
+        (s1, c1, scored), (s2, c2, cached), (s3, _, households), (s4, _, alerts), (s5, _, bad), (s6, _, _) = responses
+        assert s1 == s2 == s3 == s4 == 200 and c1 == "miss" and c2 == "hit" and scored == cached
+        assert scored["results"][0]["category"] == "Critical" and scored["results"][0]["alert_level"] == "Evacuate"
+        print(f"  ✅ Risk score {scored['results'][0]['risk_score']:.1f} (second request served from cache)")
+        
+        assert households["top"][0]["id"] == "h1" and households["phases"][0].startswith("Phase 1")
+        assert alerts["alerts"][0]["sms"]["encoding"] == "UCS-2"
+        assert s5 == 400 and "rainfall" in bad["error"] and s6 == 404
+        assert stats["requests"] == 6
+        print(f"  ✅ 6 requests on one kept-alive connection (priorities, alerts, 400, 404)")
+        
+        import socket
+        household = {"distance_to_slope": 20}
+        malformed = [
+            ("/v1/risk/score", {"factors": [[1, 2, "x", 4, 5]]}),
+            ("/v1/risk/score", {"villages": [dict(village, rainfall="heavy")]}),
+            ("/v1/risk/score", {"villages": ["Mawsynram"]}),
+            ("/v1/risk/score", {"villages": 5}),
+            ("/v1/risk/score", {"factors": [[1, 2, 3, 4, 5], [1, 2, 3, 4, 5]], "names": ["a"]}),
+            ("/v1/households/priorities", {"village_risk_score": 80, "top_k": "3", "households": [household]}),
+            ("/v1/households/priorities", {"village_risk_score": 80, "top_k": -1, "households": [household]})
+        ]
+        
+        def bad_clients(host, port):
+            statuses = []
+            for path, payload in malformed:
+                conn = http.client.HTTPConnection(host, port, timeout=5)
+                conn.request("POST", path, json.dumps(payload), {"Content-Type": "application/json"})
+                statuses.append(conn.getresponse().status)
+                conn.close()
+            with socket.create_connection((host, port), timeout=5) as sock:
+                sock.sendall(b"POST /v1/risk/score HTTP/1.1\r\nContent-Length: -1\r\n\r\n")
+                statuses.append(int(sock.recv(1024).split(b" ")[1]))
+            return statuses
+        
+        async def bad_round_trip():
+            async with ApiServer(port=0) as server:
+                return await asyncio.to_thread(bad_clients, server.host, server.port)
+        
+        statuses = asyncio.run(bad_round_trip())
+        assert statuses == [400] * (len(malformed) + 1), statuses
+        print(f"  ✅ {len(statuses)} malformed requests rejected with 400 (bad factors, names, top_k, Content-Length)")
+        
+        return True
+    except Exception as e:
+        print(f"  ❌ API server error: {e}")
+        return False
+
+
+def test_benchmark_suite():
+    """Test benchmark runner and baseline comparison"""
+    print("\nTesting benchmark suite...")
+    
+    try:
+        import importlib.util
+        import os
+        
+        path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "bench_logic.py")
+        spec = importlib.util.spec_from_file_location("bench_logic", path)
+        bench = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(bench)
+        
+        run = bench.run_suite(sizes=(10, 1000), only="risk", verbose=False)
+        assert set(run["results"]) == {
+            "risk.compute_risk_score@10", "risk.compute_risk_score@1000",
+            "risk.compute_risk_scores@10", "risk.compute_risk_scores@1000"
+        }
+        assert all(result["best_s"] > 0 and result["repeats"] >= 3 for result in run["results"].values())
+        print(f"  ✅ {len(run['results'])} timings recorded with latency and throughput")
+        
+        current = {"results": {"a@1000": {"best_s": 0.030}, "b@1000": {"best_s": 0.011}, "c@10": {"best_s": 0.00009}}}
+        baseline = {"results": {"a@1000": {"best_s": 0.010}, "b@1000": {"best_s": 0.010}, "c@10": {"best_s": 0.00001}}}
+        flagged = [key for key, _, regressed in bench.compare_results(current, baseline, tolerance=0.5) if regressed]
+        assert flagged == ["a@1000"]
+        print(f"  ✅ 3x slowdown flagged; 10% drift and sub-noise-floor timings ignored")
+        
+        return True
+    except Exception as e:
+        print(f"  ❌ Benchmark suite error: {e}")
+        return False
+
+
+def test_uncertainty():
+    """Test Monte Carlo risk uncertainty"""
+    print("\nTesting Monte Carlo uncertainty...")
+    
+    try:
+        import time
+        import numpy as np
+        from logic.risk_engine import RISK_FACTORS, compute_risk_scores
+        from logic.uncertainty import simulate_risk_uncertainty
+        
+        rng = np.random.default_rng(7)
+        factors = np.column_stack([
+            rng.uniform(0, 400, 1000), rng.uniform(0, 55, 1000), rng.uniform(0, 100, 1000),
+            rng.uniform(0, 35, 1000), rng.uniform(0, 35, 1000)
+        ])
+        
+        exact = simulate_risk_uncertainty(factors[:50], draws=100, noise={name: 0 for name in RISK_FACTORS})
+        assert np.allclose(exact.percentiles[50], compute_risk_scores(factors[:50]).scores, atol=1e-4)
+        assert np.allclose(exact.uncertainty, 0)
+        print(f"  ✅ Zero noise reproduces compute_risk_scores")
+        
+        start = time.perf_counter()
+        result = simulate_risk_uncertainty(factors, draws=1000, seed=42)
+        elapsed_ms = (time.perf_counter() - start) * 1e3
+        again = simulate_risk_uncertainty(factors, draws=1000, seed=42)
+        assert np.array_equal(result.percentiles[95], again.percentiles[95])
+        assert (result.percentiles[5] <= result.percentiles[50]).all() and (result.percentiles[50] <= result.percentiles[95]).all()
+        assert np.allclose(result.alert_level_probabilities.sum(axis=1), 1)
+        print(f"  ✅ 1,000 villages x 1,000 draws in {elapsed_ms:.0f} ms (seeded, reproducible)")
+        
+        # Linear regime: the sampled SD matches the analytic one (rainfall 100 mm: SD 5 + 15 mm)
+        single = simulate_risk_uncertainty(np.array([[100, 20, 50, 10, 10]]), draws=100000)
+        expected = np.sqrt((20 * 35 / 400) ** 2 + (1.5 * 0.6) ** 2 + (6.5 * 0.2) ** 2 + (2 / 3) ** 2 + (1 / 6) ** 2)
+        assert abs(single.std[0] - expected) < 0.05
+        
+        edge = simulate_risk_uncertainty(np.array([[380, 50, 100, 30, 30], [200, 30, 60, 10, 10]]), draws=2000)
+        assert edge.probability_of("Evacuate")[0] > 0.9 and 0 < edge.probability_of("Warning")[1] < 1
+        print(f"  ✅ Sampled SD {single.std[0]:.2f} (analytic {expected:.2f}); P(Warning) near threshold {edge.probability_of('Warning')[1]:.0%}")
+        
+        return True
+    except Exception as e:
+        print(f"  ❌ Uncertainty error: {e}")
+        return False
+
+
+def test_scenarios():
+    """Test scenario sweep engine"""
+    print("\nTesting scenario engine...")
+    
+    try:
+        import numpy as np
+        from logic.scenarios import ScenarioEngine, Scenario, scenario_grid, combine_scenarios
+        from logic.household_generator import generate_household_arrays
+        from logic.evacuation_planner import calculate_household_priorities, summarize_evacuation_phases
+        from logic.risk_engine import compute_risk_scores
+        
+        names = ["Cherrapunji", "Mawsynram", "Dawki", "Nongstoin"]
+        factors = np.array([[320, 42, 65, 22, 18], [290, 38, 58, 18, 15], [210, 30, 48, 12, 10], [220, 34, 50, 14, 11]], dtype=float)
+        regions = ["East Khasi Hills", "East Khasi Hills", "West Jaintia Hills", "West Khasi Hills"]
+        households = [generate_household_arrays(name, 25.3, 91.7, 60, 150, seed=3) for name in names]
+        engine = ScenarioEngine(factors, names, regions, households)
+        
+        scenarios = [Scenario("Current")] + combine_scenarios(
+            scenario_grid("rainfall", [150, 250, 350], region="East Khasi Hills"),
+            scenario_grid("soil_moisture", [1.0, 1.3], op="scale")
+        )
+        cube = engine.run(scenarios)
+        assert cube.shape == (7, 4) and cube.scenarios[1] == "rainfall=150 (East Khasi Hills), soil_moisturex1"
+        assert np.allclose(cube.scores[0], compute_risk_scores(factors).scores, atol=1e-4)
+        assert (cube.factors[1:, 2, 0] == 210).all() and (cube.factors[5:, 0, 0] == 350).all()
+        print(f"  ✅ {cube.shape[0]} scenarios x {cube.shape[1]} villages (regional rainfall x moisture scaling)")
+        
+        perturbed = engine.apply(scenarios)
+        for i in range(len(scenarios)):
+            scores = compute_risk_scores(perturbed[i]).scores
+            for v, hh in enumerate(households):
+                priorities = calculate_household_priorities(hh.distance_to_slope, hh.drainage_code, hh.access_code, scores[v])
+                summary = summarize_evacuation_phases(priorities, hh.occupants)
+                assert np.array_equal(cube.phase_households[i, v], summary.households[:3])
+                assert np.array_equal(cube.phase_people[i, v], summary.people[:3])
+        print(f"  ✅ Phase counts identical to per-scenario summarize_evacuation_phases")
+        
+        # Integer distances and risk scores in 0.1 steps put many households exactly on a threshold
+        for hh in households:
+            hh.distance_to_slope[:] = np.arange(len(hh)) * 7 % 501
+        grid_engine = ScenarioEngine(factors, names, regions, households)
+        grid = np.repeat(np.arange(0, 100.05, 0.1)[:, None], len(names), axis=1)
+        grid_households, grid_people = grid_engine._phase_counts(grid)
+        for i in range(len(grid)):
+            for v, hh in enumerate(households):
+                priorities = calculate_household_priorities(hh.distance_to_slope, hh.drainage_code, hh.access_code, grid[i, v])
+                summary = summarize_evacuation_phases(priorities, hh.occupants)
+                assert np.array_equal(grid_households[i, v], summary.households[:3])
+                assert np.array_equal(grid_people[i, v], summary.people[:3])
+        print(f"  ✅ Threshold boundaries match over a {grid.size}-cell risk grid")
+        
+        totals = cube.summary()
+        assert totals["households_to_evacuate"][6] >= totals["households_to_evacuate"][1]
+        assert totals["villages_Evacuate"][6] >= totals["villages_Evacuate"][0]
+        print(f"  ✅ Worst case: {totals['villages_Evacuate'][6]} villages at Evacuate, {totals['people_to_evacuate'][6]} people to move")
+        
+        return True
+    except Exception as e:
+        print(f"  ❌ Scenario engine error: {e}")
+        return False
+
+
+def test_district_runner():
+    """Test multi-district batch runner"""
+    print("\nTesting district runner...")
+    
+    try:
+        import numpy as np
+        from logic.district_runner import run_districts
+        from logic.risk_engine import compute_risk_scores
+        from logic.evacuation_planner import calculate_household_priorities, summarize_evacuation_phases
+        
+        rng = np.random.default_rng(11)
+        districts = ["East Khasi Hills", "West Garo Hills", "Ri Bhoi", "West Jaintia Hills"]
+        village_districts = [districts[i] for i in rng.integers(0, len(districts), 40)]
+        factors = np.column_stack([rng.uniform(0, 300, 40), rng.uniform(0, 60, 40), rng.uniform(0, 100, 40),
+                                   rng.uniform(0, 50, 40), rng.uniform(0, 12, 40)])
+        household_village = rng.integers(0, 40, 5_000)  # not grouped by district
+        columns = (rng.uniform(0, 500, 5_000), rng.integers(0, 3, 5_000).astype(np.uint8),
+                   rng.integers(0, 3, 5_000).astype(np.uint8), rng.integers(1, 9, 5_000))
+        
+        scores = compute_risk_scores(factors).scores
+        priorities = calculate_household_priorities(*columns[:3], scores[household_village])
+        expected = summarize_evacuation_phases(priorities, columns[3])
+        
+        serial = run_districts(village_districts, factors, household_village, *columns, workers=1)
+        pooled = run_districts(village_districts, factors, household_village, *columns, workers=2, chunk_size=1_000)
+        for result in (serial, pooled):
+            assert np.allclose(result.village_scores, scores)
+            assert np.allclose(result.household_priorities, priorities)
+            assert np.array_equal(result.household_phases, expected.phase)
+            assert np.array_equal(result.total.phase_households, expected.households)
+            assert np.array_equal(result.total.phase_people, expected.people)
+        print(f"  ✅ 2 workers, {pooled.tasks} tasks: identical to a single-process pass")
+        
+        summary = pooled.districts["Ri Bhoi"]
+        assert summary.villages == village_districts.count("Ri Bhoi")
+        assert summary.households == int(np.isin(household_village, np.flatnonzero(np.array(village_districts) == "Ri Bhoi")).sum())
+        assert sum(s.villages for s in pooled.districts.values()) == 40
+        print(f"  ✅ Ri Bhoi: {summary.villages} villages, {summary.households} households, max risk {summary.max_risk_score:.1f}")
+        
+        return True
+    except Exception as e:
+        print(f"  ❌ District runner error: {e}")
+        return False
+
+
+def test_map_layers():
+    """Test cached map layers"""
+    print("\nTesting map layers...")
+    
+    try:
+        import json
+        import numpy as np
+        from logic.map_layers import MapLayerCache
+        from logic.village_table import VillageTable
+        
+        columns = dict(
+            name=["Cherrapunji", "Mawsynram", "Dawki", "Nongstoin"],
+            latitude=[25.27, 25.30, 25.18, 25.52], longitude=[91.73, 91.58, 92.02, 91.27],
+            population=[1200, 900, 700, 1500], households=[240, 180, 140, 300],
+            rainfall=[320, 290, 210, 220], slope=[42, 38, 30, 34], soil_moisture=[65, 58, 48, 50],
+            deforestation=[22, 18, 12, 14], road_cuts=[18, 15, 10, 11]
+        )
+        cache = MapLayerCache()
+        layer = json.loads(cache.layer("v1", VillageTable.from_columns(**columns)))
+        assert [f["id"] for f in layer["features"]] == columns["name"]
+        feature = layer["features"][0]
+        assert feature["geometry"]["coordinates"] == [91.73, 25.27] and feature["properties"]["color"]
+        assert cache.layer("v1", None) is cache.layer("v1", None)  # served from cache
+        print(f"  ✅ {len(layer['features'])} features cached for v1")
+        
+        columns.update(rainfall=[380, 290, 210, 220])
+        updated = json.loads(cache.layer("v2", VillageTable.from_columns(**columns)))
+        assert updated["features"][0]["properties"]["risk_score"] > feature["properties"]["risk_score"]
+        assert "v1" in cache and "v2" in cache
+        for version in range(3, 6):
+            cache.layer(f"v{version}", VillageTable.from_columns(**columns))
+        assert "v1" not in cache and "v2" in cache  # least recently used version evicted
+        print(f"  ✅ One layer per data version, oldest evicted beyond max_versions")
+        
+        return True
+    except Exception as e:
+        print(f"  ❌ Map layers error: {e}")
+        return False
+
+
 def test_integration():
     """Test that modules work together"""
     print("\nTesting module integration...")
@@ -250,8 +1411,32 @@ def main():
     results.append(("File Structure", test_file_structure()))
     results.append(("Imports", test_imports()))
     results.append(("Risk Engine", test_risk_engine()))
+    results.append(("Batch Risk Scoring", test_batch_risk_scoring()))
+    results.append(("Risk Raster", test_risk_raster()))
+    results.append(("Village Table", test_village_table()))
+    results.append(("Spatial Index", test_spatial_index()))
+    results.append(("Incremental Risk State", test_incremental_risk_state()))
     results.append(("Evacuation Planner", test_evacuation_planner()))
+    results.append(("Batch Household Priority", test_batch_household_priority()))
+    results.append(("Phase Summary", test_phase_summary()))
+    results.append(("Top-K Selection", test_top_k_selection()))
+    results.append(("Household Generator", test_household_generator()))
+    results.append(("Routing", test_routing()))
+    results.append(("Shelter Assignment", test_shelter_assignment()))
     results.append(("Alert Engine", test_alert_engine()))
+    results.append(("Batch Alert Rendering", test_batch_alert_rendering()))
+    results.append(("Alert Dispatcher", test_alert_dispatcher()))
+    results.append(("SMS Encoding", test_sms_encoding()))
+    results.append(("Alert Scheduler", test_alert_scheduler()))
+    results.append(("Alert History", test_alert_history()))
+    results.append(("Time-Series Store", test_timeseries_store()))
+    results.append(("Sensor Ingestion", test_sensor_ingestion()))
+    results.append(("API Server", test_api_server()))
+    results.append(("Benchmark Suite", test_benchmark_suite()))
+    results.append(("Uncertainty", test_uncertainty()))
+    results.append(("Scenarios", test_scenarios()))
+    results.append(("District Runner", test_district_runner()))
+    results.append(("Map Layers", test_map_layers()))
     results.append(("Integration", test_integration()))
     
     # Summary